@@ -0,0 +1,53 @@
+# Copyright The PyTorch Lightning team.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import timeit
+from collections import namedtuple
+
+import pytest
+import torch
+
+from pytorch_lightning.utilities.apply_func import _apply_to_collection, apply_to_collection
+
+Example = namedtuple("Example", ["input_ids", "attention_mask", "labels", "meta"])
+
+
+def deep_dict_batch(depth: int = 4, width: int = 3):
+    if depth == 0:
+        return {"x": torch.zeros(1), "y": [torch.zeros(1), "id"], "n": 3}
+    return {f"level_{depth}_{i}": deep_dict_batch(depth - 1, width) for i in range(width)}
+
+
+def namedtuple_batch(size: int = 32):
+    return [Example(torch.zeros(1), torch.zeros(1), torch.zeros(1), {"source": "a", "length": 3}) for _ in range(size)]
+
+
+def measure(fn, batch, number: int = 200, repeat: int = 5) -> float:
+    # the first call caches the node kinds of the types
+    fn(batch, torch.Tensor, torch.Tensor.detach)
+    times = timeit.repeat(lambda: fn(batch, torch.Tensor, torch.Tensor.detach), number=number, repeat=repeat)
+    return min(times) / number
+
+
+@pytest.mark.parametrize("make_batch", [deep_dict_batch, namedtuple_batch])
+def test_apply_to_collection_overhead(make_batch, max_diff: float = 0.1):
+    """Compare the per-step time of the recursive traversal with the flattening of a repeated batch structure."""
+    batch = make_batch()
+    recursive = measure(_apply_to_collection, batch)
+    flattened = measure(apply_to_collection, batch)
+    print(
+        f"\n{make_batch.__name__}: {recursive * 1e6:.0f}us recursive, {flattened * 1e6:.0f}us flattened"
+        f" ({recursive / flattened:.1f}x)"
+    )
+    # the best of the repeats, with a margin for the noise of shared machines
+    assert flattened < recursive * (1 + max_diff), f"Flattening ({flattened}s) was slower than recursion ({recursive}s)"
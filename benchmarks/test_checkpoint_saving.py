@@ -0,0 +1,73 @@
+# Copyright The PyTorch Lightning team.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import io
+import multiprocessing
+import os
+import resource
+import time
+
+import fsspec
+import pytest
+import torch
+
+from pytorch_lightning.utilities.cloud_io import atomic_save
+
+_CHECKPOINT_SIZE_MB = 512
+
+
+def _buffered_atomic_save(checkpoint, filepath: str):
+    """The previous implementation of ``atomic_save``, serializing the whole checkpoint in memory first."""
+    bytesbuffer = io.BytesIO()
+    torch.save(checkpoint, bytesbuffer)
+    with fsspec.open(filepath, "wb") as f:
+        f.write(bytesbuffer.getvalue())
+
+
+def _measure_save(save_fn, filepath: str, queue) -> None:
+    numel = _CHECKPOINT_SIZE_MB * 2**20 // 4
+    checkpoint = {"state_dict": {f"layer_{i}.weight": torch.rand(numel // 8) for i in range(8)}}
+    baseline_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    start = time.perf_counter()
+    save_fn(checkpoint, filepath)
+    duration = time.perf_counter() - start
+
+    # `ru_maxrss` is reported in KiB on Linux
+    peak_rss_mb = (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - baseline_rss) / 1024
+    queue.put((duration, peak_rss_mb))
+
+
+def measure_save(save_fn, filepath: str):
+    # run in a fresh process so the peak resident set size is not shared between implementations
+    ctx = multiprocessing.get_context("spawn")
+    queue = ctx.Queue()
+    process = ctx.Process(target=_measure_save, args=(save_fn, filepath, queue))
+    process.start()
+    result = queue.get()
+    process.join()
+    return result
+
+
+@pytest.mark.skipif(os.name == "nt", reason="`resource` is not available on Windows")
+def test_atomic_save_peak_memory(tmpdir):
+    """Verify that streaming the checkpoint to disk does not allocate a second copy of it in host memory."""
+    buffered_time, buffered_rss = measure_save(_buffered_atomic_save, os.path.join(tmpdir, "buffered.ckpt"))
+    streaming_time, streaming_rss = measure_save(atomic_save, os.path.join(tmpdir, "streaming.ckpt"))
+
+    print(
+        f"\nbuffered:  {buffered_time:.2f}s, +{buffered_rss:.0f}MB peak RSS"
+        f"\nstreaming: {streaming_time:.2f}s, +{streaming_rss:.0f}MB peak RSS"
+    )
+    assert buffered_rss > 0.9 * _CHECKPOINT_SIZE_MB
+    assert streaming_rss < 0.25 * _CHECKPOINT_SIZE_MB
@@ -0,0 +1,118 @@
+# Copyright The PyTorch Lightning team.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import contextlib
+import json
+import os
+
+import pytest
+import torch
+
+from pytorch_lightning import Callback, Trainer
+from pytorch_lightning.plugins import DDPSpawnPlugin
+from pytorch_lightning.utilities import _TORCH_GREATER_EQUAL_1_8
+from tests.helpers import BoringModel
+from tests.helpers.runif import RunIf
+
+if torch.distributed.is_available() and _TORCH_GREATER_EQUAL_1_8:
+    from torch.distributed.algorithms.ddp_comm_hooks import default_hooks
+
+_ACCUMULATE_GRAD_BATCHES = 4
+_OPTIMIZER_STEPS = 3
+
+
+def _counting_hook(counter, bucket):
+    counter.all_reduces += 1
+    return default_hooks.allreduce_hook(None, bucket)
+
+
+class AllReduceCounter(Callback):
+    """Counts the gradient all-reduces of DDP and writes them to ``path`` from rank 0."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.all_reduces = 0
+
+    def on_train_start(self, trainer, pl_module):
+        trainer.model.register_comm_hook(self, _counting_hook)
+
+    def on_train_end(self, trainer, pl_module):
+        if trainer.is_global_zero:
+            with open(self.path, "w") as f:
+                json.dump({"all_reduces": self.all_reduces, "optimizer_steps": trainer.global_step}, f)
+
+
+class ManualAccumulationModel(BoringModel):
+
+    def __init__(self):
+        super().__init__()
+        self.automatic_optimization = False
+
+    def training_step(self, batch, batch_idx):
+        opt = self.optimizers()
+        loss = self.step(batch)
+        if (batch_idx + 1) % _ACCUMULATE_GRAD_BATCHES != 0:
+            with self.block_backward_sync():
+                self.manual_backward(loss)
+        else:
+            self.manual_backward(loss)
+            opt.step()
+            opt.zero_grad()
+
+    def training_epoch_end(self, outputs):
+        pass
+
+
+class NoBlockDDPSpawnPlugin(DDPSpawnPlugin):
+    """Synchronizes the gradients of every backward pass, as the plugins without ``block_backward_sync`` did."""
+
+    @contextlib.contextmanager
+    def block_backward_sync(self):
+        yield None
+
+
+def count_all_reduces(tmpdir, block_sync: bool, automatic_optimization: bool) -> float:
+    path = os.path.join(tmpdir, "counts.json")
+    model = BoringModel() if automatic_optimization else ManualAccumulationModel()
+    trainer = Trainer(
+        default_root_dir=tmpdir,
+        accelerator="ddp_cpu",
+        num_processes=2,
+        plugins=DDPSpawnPlugin() if block_sync else NoBlockDDPSpawnPlugin(),
+        callbacks=AllReduceCounter(path),
+        accumulate_grad_batches=_ACCUMULATE_GRAD_BATCHES if automatic_optimization else 1,
+        limit_train_batches=_ACCUMULATE_GRAD_BATCHES * _OPTIMIZER_STEPS,
+        limit_val_batches=0,
+        max_epochs=1,
+        logger=False,
+        checkpoint_callback=False,
+    )
+    trainer.fit(model)
+    with open(path) as f:
+        counts = json.load(f)
+    # the global step of manual optimization does not count the optimizer steps
+    optimizer_steps = counts["optimizer_steps"] if automatic_optimization else _OPTIMIZER_STEPS
+    return counts["all_reduces"] / optimizer_steps
+
+
+@RunIf(skip_windows=True, min_torch="1.9.0")
+@pytest.mark.parametrize("automatic_optimization", [True, False])
+def test_all_reduces_per_optimizer_step(tmpdir, automatic_optimization):
+    """Compare the number of gradient all-reduces per optimizer step with and without blocking the sync of the
+    accumulated batches."""
+    unblocked = count_all_reduces(tmpdir, block_sync=False, automatic_optimization=automatic_optimization)
+    blocked = count_all_reduces(tmpdir, block_sync=True, automatic_optimization=automatic_optimization)
+    print(f"\nall-reduces per optimizer step: {unblocked:.1f} without blocking the sync, {blocked:.1f} with it")
+    # the model fits in a single bucket
+    assert unblocked == _ACCUMULATE_GRAD_BATCHES
+    assert blocked == 1
@@ -0,0 +1,71 @@
+# Copyright The PyTorch Lightning team.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import time
+from unittest import mock
+
+import torch
+
+from pytorch_lightning import Trainer
+from pytorch_lightning.trainer.connectors.logger_connector.result import ResultCollection
+from tests.helpers import BoringModel
+
+_NUM_KEYS = 10
+_NUM_ITERATIONS = 1000
+_REPEATS = 5
+
+
+class LogThroughputModel(BoringModel):
+
+    def __init__(self):
+        super().__init__()
+        self.repeated_seconds = []
+        self.first_seconds = []
+
+    def training_step(self, batch, batch_idx):
+        values = [torch.tensor(float(i)) for i in range(_NUM_KEYS)]
+        for repeat in range(_REPEATS):
+            # the calls which register a new key
+            start = time.perf_counter()
+            for i, value in enumerate(values):
+                self.log(f"new_{repeat}_{i}", value)
+            self.first_seconds.append((time.perf_counter() - start) / _NUM_KEYS)
+
+            # the repeated calls of the same keys, which take the fast path
+            start = time.perf_counter()
+            for _ in range(_NUM_ITERATIONS):
+                for i, value in enumerate(values):
+                    self.log(f"metric_{i}", value, on_step=True, on_epoch=True, prog_bar=i == 0)
+            self.repeated_seconds.append((time.perf_counter() - start) / (_NUM_KEYS * _NUM_ITERATIONS))
+        return super().training_step(batch, batch_idx)
+
+
+def test_log_repeated_keys_throughput(tmpdir, max_diff: float = 0.1):
+    """Compare the time of the repeated ``self.log`` calls of a key with the time of its first call."""
+    model = LogThroughputModel()
+    trainer = Trainer(default_root_dir=tmpdir, fast_dev_run=1, logger=False, checkpoint_callback=False)
+    register_key = ResultCollection.register_key
+    with mock.patch.object(ResultCollection, "register_key", autospec=True, side_effect=register_key) as r:
+        trainer.fit(model)
+
+    # the keys are only registered on their first call
+    assert r.call_count == _NUM_KEYS * (1 + _REPEATS)
+    for i in range(_NUM_KEYS):
+        assert trainer.callback_metrics[f"metric_{i}_step"] == i
+        assert trainer.callback_metrics[f"metric_{i}_epoch"] == i
+    assert trainer.progress_bar_metrics["metric_0_step"] == 0
+
+    repeated, first = min(model.repeated_seconds), min(model.first_seconds)
+    print(f"\nself.log: {1 / repeated:.0f} repeated calls per second, {1 / first:.0f} first calls per second")
+    # the best of the repeats, with a margin for the noise of shared machines
+    assert repeated < first * (1 + max_diff), f"The repeated calls ({repeated}s) were slower than the first ({first}s)"
@@ -55,14 +55,18 @@ class Accelerator:
         self,
         precision_plugin: PrecisionPlugin,
         training_type_plugin: TrainingTypePlugin,
+        coalesce_batch_transfer: bool = False,
     ) -> None:
         """
         Args:
             precision_plugin: the plugin to handle precision-specific parts
             training_type_plugin: the plugin to handle different training routines
+            coalesce_batch_transfer: Whether :meth:`batch_to_device` copies the tensors of a batch with one copy per
+                dtype, see :func:`~pytorch_lightning.utilities.apply_func.move_data_to_device`.
         """
         self.precision_plugin = precision_plugin
         self.training_type_plugin = training_type_plugin
+        self.coalesce_batch_transfer = coalesce_batch_transfer
 
         self.optimizers: List = []
         self.lr_schedulers: List = []
@@ -168,6 +172,10 @@ class Accelerator:
         """Moves the batch to the correct device.
         The returned batch is of the same type as the input batch, just having all tensors on the correct device.
 
+        With ``coalesce_batch_transfer``, the tensors of the batch are packed into one buffer per dtype which is
+        copied at once, unless the :class:`~pytorch_lightning.core.lightning.LightningModule` overrides
+        :meth:`~pytorch_lightning.core.hooks.DataHooks.transfer_batch_to_device`.
+
         Args:
             batch: The batch of samples to move to the correct device
             device: The target device
@@ -176,7 +184,9 @@ class Accelerator:
         model = self.lightning_module
         if model is not None and not isinstance(self.training_type_plugin, DataParallelPlugin):
             # no need to transfer batch to device in DP mode
-            return model._apply_batch_transfer_handler(batch, device, dataloader_idx)
+            return model._apply_batch_transfer_handler(
+                batch, device, dataloader_idx, coalesce=self.coalesce_batch_transfer
+            )
 
         return move_data_to_device(batch, device)
 
@@ -495,14 +505,24 @@ class Accelerator:
         )
         self.setup_precision_plugin()
 
-    def save_checkpoint(self, checkpoint: Dict[str, Any], filepath: str) -> None:
+    def save_checkpoint(
+        self,
+        checkpoint: Dict[str, Any],
+        filepath: str,
+        writer: Optional[Callable[[Dict[str, Any], str], None]] = None,
+    ) -> None:
         """Save model/training states as a checkpoint file through state-dump and file-write.
 
         Args:
             checkpoint: dict containing model and trainer state
             filepath: write-target file's path
+            writer: writes the checkpoint to the file, instead of the training type plugin
         """
-        self.training_type_plugin.save_checkpoint(checkpoint, filepath)
+        if writer is None:
+            # the plugins which implement their own saving do not take a writer
+            self.training_type_plugin.save_checkpoint(checkpoint, filepath)
+        else:
+            self.training_type_plugin.save_checkpoint(checkpoint, filepath, writer=writer)
 
     @property
     def call_configure_sharded_model_hook(self) -> bool:
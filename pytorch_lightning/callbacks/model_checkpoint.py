@@ -35,8 +35,10 @@ import yaml
 import pytorch_lightning as pl
 from pytorch_lightning.callbacks.base import Callback
 from pytorch_lightning.utilities import rank_zero_deprecation, rank_zero_info, rank_zero_warn
-from pytorch_lightning.utilities.cloud_io import get_filesystem
+from pytorch_lightning.utilities.cloud_io import AsyncCheckpointWriter, atomic_save, get_filesystem
 from pytorch_lightning.utilities.exceptions import MisconfigurationException
+from pytorch_lightning.utilities.incremental_checkpoint import IncrementalCheckpointer
+from pytorch_lightning.utilities.model_helpers import is_overridden
 from pytorch_lightning.utilities.types import _METRIC, STEP_OUTPUT
 from pytorch_lightning.utilities.warnings import WarningCache
 
@@ -124,6 +126,15 @@ class ModelCheckpoint(Callback):
                This argument has been deprecated in v1.3 and will be removed in v1.5.
 
             Use ``every_n_val_epochs`` instead.
+        save_async: When ``True``, the checkpoint is copied to CPU memory on the training thread and
+            serialized and written to disk by a background thread, so training resumes without waiting for I/O.
+            Pending saves are awaited before a pending file gets removed, at the end of training and on teardown.
+            Use :meth:`wait_for_pending_saves` to wait for them explicitly. Default: ``False``.
+        save_incremental: When ``True``, the first checkpoint of a run is additionally saved in full as a hidden
+            base checkpoint in the same directory, and every checkpoint stores only the tensors which changed since
+            the base. This cuts the size of checkpoints considerably when most of the parameters are frozen, as in
+            fine-tuning. The checkpoints are loaded as usual, as long as the base stays next to them.
+            Default: ``False``.
 
     Note:
         For extra customization, ModelCheckpoint includes the following attributes:
@@ -203,6 +214,8 @@ class ModelCheckpoint(Callback):
         train_time_interval: Optional[timedelta] = None,
         every_n_val_epochs: Optional[int] = None,
         period: Optional[int] = None,
+        save_async: bool = False,
+        save_incremental: bool = False,
     ):
         super().__init__()
         self.monitor = monitor
@@ -210,6 +223,8 @@ class ModelCheckpoint(Callback):
         self.save_last = save_last
         self.save_top_k = save_top_k
         self.save_weights_only = save_weights_only
+        self.save_async = save_async
+        self.save_incremental = save_incremental
         self.auto_insert_metric_name = auto_insert_metric_name
         self._last_global_step_saved = -1
         self._last_time_checked: Optional[float] = None
@@ -225,6 +240,8 @@ class ModelCheckpoint(Callback):
         self.__init_triggers(every_n_train_steps, every_n_val_epochs, train_time_interval, period)
         self.__validate_init_configuration()
         self._save_function = None
+        self._checkpoint_writer: Optional[AsyncCheckpointWriter] = None
+        self._incremental_checkpointer: Optional[IncrementalCheckpointer] = None
 
     def on_pretrain_routine_start(self, trainer: 'pl.Trainer', pl_module: 'pl.LightningModule') -> None:
         """
@@ -232,10 +249,25 @@ class ModelCheckpoint(Callback):
         """
         self.__resolve_ckpt_dir(trainer)
         self._save_function = trainer.save_checkpoint
+        if self.save_async:
+            self.__init_checkpoint_writer(trainer)
+        if self.save_incremental:
+            self.__check_plugin_supports("save_incremental", trainer)
+            # every run saves a new base
+            self._incremental_checkpointer = IncrementalCheckpointer()
 
     def on_train_start(self, trainer: 'pl.Trainer', pl_module: 'pl.LightningModule') -> None:
         self._last_time_checked = time.monotonic()
 
+    def on_train_end(self, trainer: 'pl.Trainer', pl_module: 'pl.LightningModule') -> None:
+        """ Make sure all checkpoints are on disk before the loggers and the training type plugin access them. """
+        self.wait_for_pending_saves()
+
+    def teardown(self, trainer: 'pl.Trainer', pl_module: 'pl.LightningModule', stage: Optional[str] = None) -> None:
+        if self._checkpoint_writer is not None:
+            writer, self._checkpoint_writer = self._checkpoint_writer, None
+            writer.close()
+
     def on_train_batch_end(
         self,
         trainer: 'pl.Trainer',
@@ -335,6 +367,11 @@ class ModelCheckpoint(Callback):
         if trainer.is_global_zero and trainer.logger:
             trainer.logger.after_save_checkpoint(proxy(self))
 
+    def wait_for_pending_saves(self) -> None:
+        """ Blocks until all checkpoints scheduled with ``save_async=True`` are written to disk. """
+        if self._checkpoint_writer is not None:
+            self._checkpoint_writer.wait()
+
     def _should_skip_saving_checkpoint(self, trainer: 'pl.Trainer') -> bool:
         from pytorch_lightning.trainer.states import TrainerFn
         return (
@@ -404,6 +441,22 @@ class ModelCheckpoint(Callback):
         self.dirpath = dirpath
         self.filename = filename
 
+    def __check_plugin_supports(self, argument: str, trainer: 'pl.Trainer') -> None:
+        plugin = trainer.training_type_plugin
+        # `DDPPlugin` overrides the saving only to write sharded checkpoints
+        parent = pl.plugins.DDPPlugin if isinstance(plugin, pl.plugins.DDPPlugin) else pl.plugins.TrainingTypePlugin
+        if getattr(plugin, "sharded_checkpoint", False) or is_overridden("save_checkpoint", plugin, parent=parent):
+            raise MisconfigurationException(
+                f"`ModelCheckpoint({argument}=True)` is not supported with `{type(plugin).__name__}`"
+                " as it implements its own checkpoint saving."
+            )
+
+    def __init_checkpoint_writer(self, trainer: 'pl.Trainer') -> None:
+        # the writer owns a thread, so it is created at runtime to keep the callback picklable
+        self.__check_plugin_supports("save_async", trainer)
+        if self._checkpoint_writer is None:
+            self._checkpoint_writer = AsyncCheckpointWriter()
+
     def __init_monitor_mode(self, mode: str) -> None:
         torch_inf = torch.tensor(np.Inf)
         mode_dict = {
@@ -478,8 +531,12 @@ class ModelCheckpoint(Callback):
         self._save_function = value
 
     def _del_model(self, trainer: 'pl.Trainer', filepath: str) -> None:
+        if self._checkpoint_writer is not None and filepath in self._checkpoint_writer.pending:
+            # the file would be written after its removal otherwise
+            self.wait_for_pending_saves()
         if trainer.should_rank_save_checkpoint and self._fs.exists(filepath):
-            self._fs.rm(filepath)
+            # sharded checkpoints are directories
+            self._fs.rm(filepath, recursive=True)
             log.debug(f"Removed checkpoint: {filepath}")
 
     def _save_model(self, trainer: 'pl.Trainer', filepath: str) -> None:
@@ -490,8 +547,37 @@ class ModelCheckpoint(Callback):
         if trainer.should_rank_save_checkpoint:
             self._fs.makedirs(os.path.dirname(filepath), exist_ok=True)
 
-        # delegate the saving to the trainer
-        trainer.save_checkpoint(filepath, self.save_weights_only)
+        save_function = self._save_function
+        if save_function is not None and save_function != trainer.save_checkpoint:
+            if self.save_async or self.save_incremental:
+                rank_zero_warn(
+                    "`ModelCheckpoint(save_async=True)` and `ModelCheckpoint(save_incremental=True)` do not apply to"
+                    " a custom `save_function`, the checkpoint is saved with it as is."
+                )
+            save_function(filepath, self.save_weights_only)
+        elif self._checkpoint_writer is None and self._incremental_checkpointer is None:
+            # delegate the saving to the trainer
+            trainer.save_checkpoint(filepath, self.save_weights_only)
+        else:
+            # the training type plugin post-processes the checkpoint and writes it with the callback
+            trainer.checkpoint_connector.save_checkpoint(
+                filepath, self.save_weights_only, writer=self.__write_checkpoint
+            )
+
+    def __write_checkpoint(self, checkpoint: Dict[str, Any], filepath: str) -> None:
+        if self._incremental_checkpointer is not None:
+            if self._incremental_checkpointer.base_path is None:
+                base_path = self._incremental_checkpointer.set_base(checkpoint, os.path.dirname(filepath))
+                self.__write_file(checkpoint, base_path)
+            checkpoint = self._incremental_checkpointer.to_incremental(checkpoint, filepath)
+        self.__write_file(checkpoint, filepath)
+
+    def __write_file(self, checkpoint: Dict[str, Any], filepath: str) -> None:
+        if self._checkpoint_writer is not None:
+            # the serialization and file-write happen in the background
+            self._checkpoint_writer.save(checkpoint, filepath)
+        else:
+            atomic_save(checkpoint, filepath)
 
     def check_monitor_top_k(self, trainer: 'pl.Trainer', current: Optional[torch.Tensor] = None) -> bool:
         if current is None:
@@ -786,4 +872,6 @@ class ModelCheckpoint(Callback):
         the internal state to diverge between ranks.
         """
         exists = self._fs.exists(filepath)
+        if self._checkpoint_writer is not None:
+            exists = exists or str(filepath) in self._checkpoint_writer.pending
         return trainer.training_type_plugin.broadcast(exists)
@@ -21,6 +21,7 @@ from typing import Any, Optional, Sequence
 
 import pytorch_lightning as pl
 from pytorch_lightning.callbacks.base import Callback
+from pytorch_lightning.overrides.distributed import BatchIndices
 from pytorch_lightning.utilities import LightningEnum
 from pytorch_lightning.utilities.exceptions import MisconfigurationException
 
@@ -43,11 +44,20 @@ class BasePredictionWriter(Callback):
     """
     Base class to implement how the predictions should be stored.
 
+    In distributed prediction, the indices of the samples of a batch are passed to ``write_on_batch_end`` and, for
+    ``write_on_epoch_end``, the indices of each dataloader are a
+    :class:`~pytorch_lightning.overrides.distributed.BatchIndices`: a sequence of the indices of its batches, stored as
+    a ``range`` when they are strided or in a single ``int64`` array otherwise. Each of its elements is returned as a
+    new list of integers, as before, so it compares equal to a list, can be dumped with ``json`` and can be modified.
+    Its :meth:`~pytorch_lightning.overrides.distributed.BatchIndices.flatten` returns all the indices of the
+    dataloader without copying them, as a ``range`` or as a read-only ``int64`` array.
+
     Args:
         write_interval: When to write.
 
     Example::
 
+        import numpy as np
         import torch
         from pytorch_lightning.callbacks import BasePredictionWriter
 
@@ -64,9 +74,13 @@ class BasePredictionWriter(Callback):
                 torch.save(prediction, os.path.join(self.output_dir, dataloader_idx, f"{batch_idx}.pt"))
 
             def write_on_epoch_end(
-                self, trainer, pl_module: 'LightningModule', predictions: List[Any], batch_indices: List[Any]
+                self, trainer, pl_module: 'LightningModule', predictions: List[Any], batch_indices: List[BatchIndices]
             ):
                 torch.save(predictions, os.path.join(self.output_dir, "predictions.pt"))
+                if batch_indices is not None:
+                    for dataloader_idx, dl_indices in enumerate(batch_indices):
+                        filename = f"indices_{dataloader_idx}_{trainer.global_rank}.npy"
+                        np.save(os.path.join(self.output_dir, filename), np.asarray(dl_indices.flatten()))
     """
 
     def __init__(self, write_interval: str = "batch") -> None:
@@ -92,7 +106,7 @@ class BasePredictionWriter(Callback):
         trainer: 'pl.Trainer',
         pl_module: 'pl.LightningModule',
         predictions: Sequence[Any],
-        batch_indices: Optional[Sequence[Any]],
+        batch_indices: Optional[Sequence[BatchIndices]],
     ) -> None:
         """Override with the logic to write all batches."""
         raise NotImplementedError()
@@ -14,14 +14,18 @@
 """LightningDataModule for loading DataLoaders with ease."""
 
 import functools
+import os
 from argparse import ArgumentParser, Namespace
-from typing import Any, List, Mapping, Optional, Sequence, Tuple, Union
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple, Union
 
+import torch
 from torch.utils.data import DataLoader, Dataset, IterableDataset
 
 from pytorch_lightning.core.hooks import CheckpointHooks, DataHooks
 from pytorch_lightning.utilities import rank_zero_deprecation
 from pytorch_lightning.utilities.argparse import add_argparse_args, from_argparse_args, get_init_arguments_and_types
+from pytorch_lightning.utilities.data_cache import CachedDataset
+from pytorch_lightning.utilities.shared_memory import load_shared
 
 
 class LightningDataModule(CheckpointHooks, DataHooks):
@@ -96,6 +100,10 @@ class LightningDataModule(CheckpointHooks, DataHooks):
         self._has_teardown_test = False
         self._has_teardown_predict = False
 
+        # the data shared between the processes of the node, by name, with the stage of the `setup` which loaded it
+        self._shared_memory: Dict[str, Tuple[Optional[str], Any]] = {}
+        self._setup_stage: Optional[str] = None
+
     @property
     def train_transforms(self):
         """
@@ -284,6 +292,43 @@ class LightningDataModule(CheckpointHooks, DataHooks):
         )
         return self._has_teardown_predict
 
+    def shared_memory(self, name: str, fn: Callable[[], Any]) -> Any:
+        """Loads data once per node and shares its tensors and NumPy arrays between the processes of the node,
+        instead of holding a copy in each process. To be called in :meth:`setup`.
+
+        In distributed training, the process of local rank 0 calls ``fn`` and the other processes of the node map the
+        tensors and arrays it writes to ``/dev/shm``, without a copy. With ``ddp_spawn``, the data is loaded in the
+        main process and moved to shared memory, so that the spawned processes receive it without a copy.
+        See :func:`~pytorch_lightning.utilities.shared_memory.load_shared`.
+
+        The data is kept until :meth:`teardown` is called for the stage whose :meth:`setup` loaded it, a later
+        :meth:`setup` loading the same ``name`` reuses it.
+
+        Example::
+
+            def setup(self, stage):
+                data = self.shared_memory("train", lambda: torch.load("train.pt"))
+                self.train_set = TensorDataset(data["x"], data["y"])
+
+        Args:
+            name: the name of the data, unique in the datamodule
+            fn: returns the data, a collection of tensors, NumPy arrays and other objects
+        """
+        if name in self._shared_memory:
+            return self._shared_memory[name][1]
+        if self.trainer is not None:
+            local_rank, barrier = self.trainer.local_rank, self.trainer.training_type_plugin.barrier
+        else:
+            local_rank, barrier = int(os.environ.get("LOCAL_RANK", 0)), torch.distributed.barrier
+        data = load_shared(fn, name, local_rank, barrier)
+        self._shared_memory[name] = (self._setup_stage, data)
+        return data
+
+    def _release_shared_memory(self, stage: Optional[str]) -> None:
+        for name, (setup_stage, _) in list(self._shared_memory.items()):
+            if stage is None or setup_stage == stage:
+                del self._shared_memory[name]
+
     @classmethod
     def add_argparse_args(cls, parent_parser: ArgumentParser, **kwargs) -> ArgumentParser:
         """Extends existing argparse by default `LightningDataModule` attributes."""
@@ -325,6 +370,9 @@ class LightningDataModule(CheckpointHooks, DataHooks):
         test_dataset: Optional[Union[Dataset, Sequence[Dataset]]] = None,
         batch_size: int = 1,
         num_workers: int = 0,
+        cache_dir: Optional[str] = None,
+        cache_max_bytes: Optional[int] = None,
+        cache_fingerprint: Optional[str] = None,
     ):
         r"""
         Create an instance from torch.utils.data.Dataset.
@@ -336,11 +384,27 @@ class LightningDataModule(CheckpointHooks, DataHooks):
             batch_size: Batch size to use for each dataloader. Default is 1.
             num_workers: Number of subprocesses to use for data loading. 0 means that the
                 data will be loaded in the main process. Number of CPUs available.
+            cache_dir: (optional) Directory in which the samples of the map-style datasets are cached after their
+                first access, see :class:`~pytorch_lightning.utilities.data_cache.CachedDataset`.
+            cache_max_bytes: (optional) Size budget of ``cache_dir``, the least recently used samples are evicted.
+            cache_fingerprint: (optional) Identifies the content of the datasets, such as a hash of their files or a
+                version of the data. Each dataset is cached separately, keyed by its split and position too.
 
         """
 
-        def dataloader(ds: Dataset, shuffle: bool = False) -> DataLoader:
+        def dataloader(
+            ds: Dataset, split: str, key: Optional[Union[int, str]] = None, shuffle: bool = False
+        ) -> DataLoader:
             shuffle &= not isinstance(ds, IterableDataset)
+            if cache_dir is not None and not isinstance(ds, IterableDataset):
+                # the datasets of the same type and length get their own caches
+                ds = CachedDataset(
+                    ds,
+                    cache_dir,
+                    config={"split": split, "key": key},
+                    fingerprint=cache_fingerprint,
+                    max_bytes=cache_max_bytes,
+                )
             return DataLoader(
                 ds,
                 batch_size=batch_size,
@@ -351,20 +415,20 @@ class LightningDataModule(CheckpointHooks, DataHooks):
 
         def train_dataloader():
             if isinstance(train_dataset, Mapping):
-                return {key: dataloader(ds, shuffle=True) for key, ds in train_dataset.items()}
+                return {key: dataloader(ds, "train", key, shuffle=True) for key, ds in train_dataset.items()}
             if isinstance(train_dataset, Sequence):
-                return [dataloader(ds, shuffle=True) for ds in train_dataset]
-            return dataloader(train_dataset, shuffle=True)
+                return [dataloader(ds, "train", i, shuffle=True) for i, ds in enumerate(train_dataset)]
+            return dataloader(train_dataset, "train", shuffle=True)
 
         def val_dataloader():
             if isinstance(val_dataset, Sequence):
-                return [dataloader(ds) for ds in val_dataset]
-            return dataloader(val_dataset)
+                return [dataloader(ds, "val", i) for i, ds in enumerate(val_dataset)]
+            return dataloader(val_dataset, "val")
 
         def test_dataloader():
             if isinstance(test_dataset, Sequence):
-                return [dataloader(ds) for ds in test_dataset]
-            return dataloader(test_dataset)
+                return [dataloader(ds, "test", i) for i, ds in enumerate(test_dataset)]
+            return dataloader(test_dataset, "test")
 
         datamodule = cls()
         if train_dataset is not None:
@@ -435,8 +499,17 @@ class LightningDataModule(CheckpointHooks, DataHooks):
                     f"DataModule.{name} has already been called, so it will not be called again. "
                     f"In v1.6 this behavior will change to always call DataModule.{name}."
                 )
+            elif name == "setup":
+                obj._setup_stage = stage
+                try:
+                    fn(*args, **kwargs)
+                finally:
+                    obj._setup_stage = None
             else:
                 fn(*args, **kwargs)
+                if name == "teardown":
+                    # the shared data loaded by the `setup` of the stage is released with it
+                    obj._release_shared_memory(stage)
 
         return wrapped_fn
 
@@ -678,6 +678,11 @@ class DataHooks:
             This hook only runs on single GPU training and DDP (no data-parallel).
             Data-Parallel support will come in near future.
 
+        Note:
+            When the accelerator is created with ``coalesce_batch_transfer=True`` and this hook is not overridden,
+            the tensors are moved with ``move_data_to_device(batch, device, coalesce=True)`` instead, which copies
+            all tensors of the same dtype at once.
+
         Args:
             batch: A batch of data that needs to be transferred to a new device.
             device: The target device as defined in PyTorch.
@@ -24,8 +24,9 @@ import types
 import uuid
 from abc import ABC
 from argparse import Namespace
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple, Union
+from typing import Any, Callable, Dict, Generator, List, Mapping, Optional, Sequence, Tuple, Union
 
 import numpy as np
 import torch
@@ -41,11 +42,12 @@ from pytorch_lightning.core.optimizer import LightningOptimizer
 from pytorch_lightning.core.saving import ALLOWED_CONFIG_TYPES, ModelIO, PRIMITIVE_TYPES
 from pytorch_lightning.trainer.connectors.logger_connector.fx_validator import FxValidator
 from pytorch_lightning.utilities import rank_zero_deprecation, rank_zero_warn
-from pytorch_lightning.utilities.apply_func import apply_to_collection, convert_to_tensors
+from pytorch_lightning.utilities.apply_func import apply_to_collection, convert_to_tensors, move_data_to_device
 from pytorch_lightning.utilities.cloud_io import get_filesystem
 from pytorch_lightning.utilities.device_dtype_mixin import DeviceDtypeModuleMixin
 from pytorch_lightning.utilities.distributed import distributed_available, sync_ddp
 from pytorch_lightning.utilities.exceptions import MisconfigurationException
+from pytorch_lightning.utilities.model_helpers import is_overridden
 from pytorch_lightning.utilities.parsing import AttributeDict, collect_init_args, save_hyperparameters
 from pytorch_lightning.utilities.signature_utils import is_param_in_hook_signature
 from pytorch_lightning.utilities.types import _METRIC_COLLECTION, EPOCH_OUTPUT, STEP_OUTPUT
@@ -268,12 +270,18 @@ class LightningModule(
         return self.trainer.logger if self.trainer else None
 
     def _apply_batch_transfer_handler(
-        self, batch: Any, device: Optional[torch.device] = None, dataloader_idx: Optional[int] = None
+        self,
+        batch: Any,
+        device: Optional[torch.device] = None,
+        dataloader_idx: Optional[int] = None,
+        coalesce: bool = False,
     ) -> Any:
         device = device or self.device
         batch = self.on_before_batch_transfer(batch, dataloader_idx)
 
-        if is_param_in_hook_signature(self.transfer_batch_to_device, 'dataloader_idx'):
+        if coalesce and not is_overridden('transfer_batch_to_device', self):
+            batch = move_data_to_device(batch, device, coalesce=True)
+        elif is_param_in_hook_signature(self.transfer_batch_to_device, 'dataloader_idx'):
             batch = self.transfer_batch_to_device(batch, device, dataloader_idx)
         else:
             warning_cache.deprecation(
@@ -390,11 +398,12 @@ class LightningModule(
         elif reduce_fx == 'default':
             reduce_fx = 'mean'
 
-        # check for invalid values
-        apply_to_collection(value, dict, self.__check_not_nested, name)
-        apply_to_collection(
-            value, object, self.__check_allowed, name, value, wrong_dtype=(numbers.Number, Metric, Tensor, dict)
-        )
+        # check for invalid values. performance: a single tensor is always valid
+        if not isinstance(value, Tensor):
+            apply_to_collection(value, dict, self.__check_not_nested, name)
+            apply_to_collection(
+                value, object, self.__check_allowed, name, value, wrong_dtype=(numbers.Number, Metric, Tensor, dict)
+            )
 
         # set the default depending on the fx_name
         on_step = self.__auto_choose_log_on_step(on_step)
@@ -412,7 +421,8 @@ class LightningModule(
                 " but it should not contain information about `dataloader_idx`"
             )
 
-        value = apply_to_collection(value, numbers.Number, self.__to_tensor)
+        if not isinstance(value, Tensor):
+            value = apply_to_collection(value, numbers.Number, self.__to_tensor)
 
         if self.trainer.logger_connector.should_reset_tensors(self._current_fx_name):
             # if we started a new epoch (running it's first batch) the hook name has changed
@@ -1446,6 +1456,32 @@ class LightningModule(
         # backward
         self.trainer.fit_loop.epoch_loop.batch_loop.backward(loss, optimizer=None, opt_idx=None, *args, **kwargs)
 
+    @contextmanager
+    def block_backward_sync(self) -> Generator[None, None, None]:
+        """
+        Blocks the synchronization of the gradients across processes in the :meth:`manual_backward` calls of this
+        context. The gradients are accumulated locally and synchronized by the first backward pass outside of it,
+        which saves the communication of the accumulated batches with manual optimization.
+
+        See :ref:`manual optimization<common/optimizers:Gradient accumulation>` for more examples.
+
+        Example::
+
+            def training_step(self, batch, batch_idx):
+                opt = self.optimizers()
+                loss = ...
+                if (batch_idx + 1) % n != 0:
+                    # accumulate the gradients of `n` batches without synchronizing them
+                    with self.block_backward_sync():
+                        self.manual_backward(loss)
+                else:
+                    self.manual_backward(loss)
+                    opt.step()
+                    opt.zero_grad()
+        """
+        with self.trainer.training_type_plugin.block_backward_sync():
+            yield
+
     def backward(self, loss: Tensor, optimizer: Optimizer, optimizer_idx: int, *args, **kwargs) -> None:
         """
         Called to perform backward on the loss returned in :meth:`training_step`.
@@ -60,6 +60,7 @@ class ModelIO(object):
         map_location: Optional[Union[Dict[str, str], str, torch.device, int, Callable]] = None,
         hparams_file: Optional[str] = None,
         strict: bool = True,
+        mmap: bool = False,
         **kwargs,
     ):
         r"""
@@ -93,6 +94,10 @@ class ModelIO(object):
                 `hparams` as :class:`~dict`.
             strict: Whether to strictly enforce that the keys in :attr:`checkpoint_path` match the keys
                 returned by this module's state dict. Default: `True`.
+            mmap: Whether to memory-map the tensors of a local checkpoint file instead of reading the whole file.
+                Only the tensors that are accessed, usually the ones under ``state_dict``, are then read from disk,
+                which skips the optimizer states. This has no effect when ``map_location`` moves the
+                tensors off the CPU. Default: `False`.
             kwargs: Any extra keyword args needed to init the model. Can also be used to override saved
                 hyperparameter values.
 
@@ -111,6 +116,9 @@ class ModelIO(object):
                 map_location=map_location
             )
 
+            # or only read the model weights from disk
+            MyLightningModule.load_from_checkpoint('path/to/checkpoint.ckpt', mmap=True)
+
             # or load weights and hyperparameters from separate files.
             MyLightningModule.load_from_checkpoint(
                 'path/to/checkpoint.ckpt',
@@ -130,9 +138,9 @@ class ModelIO(object):
             y_hat = pretrained_model(x)
         """
         if map_location is not None:
-            checkpoint = pl_load(checkpoint_path, map_location=map_location)
+            checkpoint = pl_load(checkpoint_path, map_location=map_location, mmap=mmap)
         else:
-            checkpoint = pl_load(checkpoint_path, map_location=lambda storage, loc: storage)
+            checkpoint = pl_load(checkpoint_path, map_location=lambda storage, loc: storage, mmap=mmap)
 
         if hparams_file is not None:
             extension = hparams_file.split('.')[-1]
@@ -13,15 +13,19 @@
 # limitations under the License.
 from os import environ
 
+from pytorch_lightning.loggers.async_logger import AsyncLogger
 from pytorch_lightning.loggers.base import LightningLoggerBase, LoggerCollection
+from pytorch_lightning.loggers.columnar_logs import ColumnarLogger
 from pytorch_lightning.loggers.csv_logs import CSVLogger
 from pytorch_lightning.loggers.tensorboard import TensorBoardLogger
 
 __all__ = [
+    'AsyncLogger',
     'LightningLoggerBase',
     'LoggerCollection',
     'TensorBoardLogger',
     'CSVLogger',
+    'ColumnarLogger',
 ]
 
 from pytorch_lightning.loggers.comet import _COMET_AVAILABLE, CometLogger  # noqa: F401
@@ -0,0 +1,186 @@
+# Copyright The PyTorch Lightning team.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Async logger
+------------
+
+Wrapper which dispatches the calls to a logger from a background thread
+
+"""
+import queue
+import threading
+from argparse import Namespace
+from typing import Any, Callable, Dict, Mapping, Optional, Sequence, Union
+from weakref import ReferenceType
+
+import numpy as np
+
+import pytorch_lightning as pl
+from pytorch_lightning.loggers.base import LightningLoggerBase
+from pytorch_lightning.utilities.metrics import metrics_to_scalars
+
+
+class AsyncLogger(LightningLoggerBase):
+    r"""
+    Wraps a logger so that the metrics, hyperparameters and saves reach it from a background thread,
+    and slow backends do not add to the step time.
+
+    Tensors are converted to Python scalars before they are queued, in one device-to-host transfer per call.
+    A single worker thread forwards the queued calls to the wrapped logger in order. When ``max_queue_size``
+    calls are pending, logging blocks until the worker catches up. Accessing :attr:`experiment` and calling
+    :meth:`finalize` wait for the pending calls, and errors of the worker are re-raised by the next call.
+
+    Example:
+        >>> from pytorch_lightning import Trainer
+        >>> from pytorch_lightning.loggers import AsyncLogger, TensorBoardLogger
+        >>> logger = AsyncLogger(TensorBoardLogger("logs"))
+        >>> trainer = Trainer(logger=logger)
+
+    Args:
+        logger: The logger to wrap, which may be a :class:`~pytorch_lightning.loggers.base.LoggerCollection`.
+        max_queue_size: The maximum number of calls waiting for the worker.
+    """
+
+    def __init__(self, logger: LightningLoggerBase, max_queue_size: int = 1000):
+        super().__init__()
+        if max_queue_size < 1:
+            raise ValueError(f"`max_queue_size` must be a positive integer, got {max_queue_size}.")
+        self._logger = logger
+        self._max_queue_size = max_queue_size
+        self._init_worker_state()
+
+    def _init_worker_state(self) -> None:
+        self._queue: queue.Queue = queue.Queue(maxsize=self._max_queue_size)
+        self._error: Optional[BaseException] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def logger(self) -> LightningLoggerBase:
+        """The wrapped logger"""
+        return self._logger
+
+    @property
+    def experiment(self) -> Any:
+        # the calls of the user to the experiment come after the pending ones
+        self.flush()
+        return self._logger.experiment
+
+    def update_agg_funcs(
+        self,
+        agg_key_funcs: Optional[Mapping[str, Callable[[Sequence[float]], float]]] = None,
+        agg_default_func: Callable[[Sequence[float]], float] = np.mean
+    ):
+        self._logger.update_agg_funcs(agg_key_funcs, agg_default_func)
+
+    def agg_and_log_metrics(self, metrics: Dict[str, float], step: Optional[int] = None):
+        self._submit(self._logger.agg_and_log_metrics, metrics_to_scalars(metrics), step)
+
+    def log_metrics(self, metrics: Dict[str, float], step: Optional[int] = None) -> None:
+        self._submit(self._logger.log_metrics, metrics_to_scalars(metrics), step)
+
+    def log_hyperparams(self, params: Union[Dict[str, Any], Namespace], *args, **kwargs) -> None:
+        self._submit(self._logger.log_hyperparams, params, *args, **kwargs)
+
+    def log_graph(self, model: 'pl.LightningModule', input_array=None) -> None:
+        # tracing runs the model, which must not happen concurrently with training
+        self.flush()
+        self._logger.log_graph(model, input_array)
+
+    def after_save_checkpoint(self, checkpoint_callback: 'ReferenceType[pl.callbacks.ModelCheckpoint]') -> None:
+        # the state of the callback is read while it is current
+        self.flush()
+        self._logger.after_save_checkpoint(checkpoint_callback)
+
+    def save(self) -> None:
+        self._submit(self._logger.save)
+
+    def finalize(self, status: str) -> None:
+        self._submit(self._logger.finalize, status)
+        self.flush()
+
+    def close(self) -> None:
+        self.flush()
+        self._stop_worker()
+        self._logger.close()
+
+    def flush(self) -> None:
+        """Blocks until all pending calls reached the wrapped logger and re-raises the first error of the worker"""
+        if self._thread is not None:
+            self._queue.join()
+        self._raise_if_failed()
+
+    @property
+    def save_dir(self) -> Optional[str]:
+        return self._logger.save_dir
+
+    @property
+    def name(self) -> str:
+        return self._logger.name
+
+    @property
+    def version(self) -> Union[int, str]:
+        return self._logger.version
+
+    def __getitem__(self, index: int) -> LightningLoggerBase:
+        return self._logger[index]
+
+    def __getattr__(self, name: str) -> Any:
+        # gives access to attributes specific to the wrapped logger, such as ``log_dir``
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self._logger, name)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        self.flush()
+        state = self.__dict__.copy()
+        for key in ("_queue", "_error", "_thread"):
+            del state[key]
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._init_worker_state()
+
+    def _submit(self, fn: Callable, *args: Any, **kwargs: Any) -> None:
+        self._raise_if_failed()
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="AsyncLogger", daemon=True)
+            self._thread.start()
+        self._queue.put((fn, args, kwargs))
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                fn, args, kwargs = item
+                if self._error is None:
+                    fn(*args, **kwargs)
+            except BaseException as error:
+                # the following calls are dropped, the error is raised on the training thread
+                self._error = error
+            finally:
+                self._queue.task_done()
+
+    def _stop_worker(self) -> None:
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+
+    def _raise_if_failed(self) -> None:
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise RuntimeError("The background logger failed.") from error
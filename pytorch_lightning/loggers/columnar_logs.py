@@ -0,0 +1,304 @@
+# Copyright The PyTorch Lightning team.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Columnar logger
+---------------
+
+Logger for high-frequency metrics, which are stored in an append-only binary columnar format on the local file system
+
+"""
+import glob
+import json
+import numbers
+import os
+import shutil
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+import torch
+
+from pytorch_lightning.loggers.base import rank_zero_experiment
+from pytorch_lightning.loggers.csv_logs import CSVLogger, ExperimentWriter
+from pytorch_lightning.utilities import _module_available
+from pytorch_lightning.utilities.distributed import rank_zero_only
+from pytorch_lightning.utilities.exceptions import MisconfigurationException
+
+_PYARROW_AVAILABLE = _module_available("pyarrow")
+if _PYARROW_AVAILABLE:
+    import pyarrow as pa
+else:  # pragma: no cover
+    pa = None
+
+
+class ColumnarExperimentWriter(ExperimentWriter):
+    r"""
+    Experiment writer for :class:`ColumnarLogger`.
+
+    The metrics are buffered as rows and written as one chunk of columns whenever ``chunk_size`` rows are
+    buffered or :meth:`save` is called. Each column is a ``float64`` array in which the steps that did not log
+    the metric hold ``NaN``. Two storage formats are supported:
+
+    - ``"arrow"``: chunks are compressed record batches appended to Arrow IPC stream files. A new file is started
+      whenever new metric keys appear. Requires `pyarrow <https://arrow.apache.org>`_.
+    - ``"numpy"``: every column is a raw ``float64`` file which chunks are appended to, so the reader can
+      memory-map it. The metric keys are listed in a JSON file next to the columns.
+
+    Args:
+        log_dir: Directory for the experiment logs
+        chunk_size: The maximum number of rows held in memory before they are written.
+        storage: Either ``"arrow"`` or ``"numpy"``. Defaults to ``"arrow"`` if ``pyarrow`` is installed.
+        compression: The codec that compresses the ``"arrow"`` record batches, ``"zstd"`` or ``"lz4"``.
+    """
+
+    NAME_METRICS_DIR = 'metrics'
+    NAME_COLUMNS_FILE = 'columns.json'
+
+    def __init__(
+        self,
+        log_dir: str,
+        chunk_size: int = 10000,
+        storage: Optional[str] = None,
+        compression: Optional[str] = "zstd",
+    ) -> None:
+        super().__init__(log_dir)
+        storage = storage or ("arrow" if _PYARROW_AVAILABLE else "numpy")
+        if storage not in ("arrow", "numpy"):
+            raise MisconfigurationException(f"`storage` must be one of 'arrow' or 'numpy', got {storage!r}.")
+        if storage == "arrow" and not _PYARROW_AVAILABLE:
+            raise MisconfigurationException(
+                "The 'arrow' storage requires `pyarrow` to be installed. Install it by running `pip install pyarrow`."
+            )
+        self.chunk_size = chunk_size
+        self.storage = storage
+        self.compression = compression
+        self.metrics_dir = os.path.join(self.log_dir, self.NAME_METRICS_DIR)
+        self._num_rows_written = 0
+        self._segment = -1
+        self._stream = None
+        self._sink = None
+
+    def log_metrics(self, metrics_dict: Dict[str, float], step: Optional[int] = None) -> None:
+        """Record metrics"""
+        metrics_dict = {k: self._to_float(k, v) for k, v in metrics_dict.items()}
+        super().log_metrics(metrics_dict, step)
+        if len(self.metrics) >= self.chunk_size:
+            self._write_chunk()
+
+    @staticmethod
+    def _to_float(key: str, value) -> float:
+        if isinstance(value, torch.Tensor) and value.numel() == 1 or isinstance(value, np.generic):
+            value = value.item()
+        if not isinstance(value, numbers.Real):
+            raise ValueError(
+                f"The columnar logger only stores numbers, you tried to log {value!r} for {key!r}."
+                " Log a scalar or a tensor with a single element."
+            )
+        return float(value)
+
+    def save(self) -> None:
+        """Save recorded hparams and the metrics recorded since the last save into files"""
+        self._write_chunk()
+        super().save()
+
+    def close(self) -> None:
+        """Writes the remaining metrics and closes the open Arrow stream"""
+        self.save()
+        self._close_stream()
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        # the open stream cannot be pickled, the next chunk starts a new file
+        state["_stream"] = state["_sink"] = None
+        return state
+
+    def _write_chunk(self) -> None:
+        if not self.metrics:
+            return
+        new_keys = {}
+        for m in self.metrics:
+            new_keys.update((k, None) for k in m if k not in self.metrics_keys)
+        self.metrics_keys.extend(new_keys)
+
+        columns = {k: np.full(len(self.metrics), np.nan) for k in self.metrics_keys}
+        for i, m in enumerate(self.metrics):
+            for k, v in m.items():
+                columns[k][i] = v
+
+        if self._num_rows_written == 0:
+            # the first chunk replaces the metrics of a previous run
+            shutil.rmtree(self.metrics_dir, ignore_errors=True)
+        os.makedirs(self.metrics_dir, exist_ok=True)
+        if self.storage == "arrow":
+            self._write_arrow_chunk(columns, new_keys_appeared=bool(new_keys))
+        else:
+            self._write_numpy_chunk(columns, new_keys=list(new_keys))
+        self._num_rows_written += len(self.metrics)
+        self.metrics = []
+
+    def _write_arrow_chunk(self, columns: Dict[str, np.ndarray], new_keys_appeared: bool) -> None:
+        if self._stream is None or new_keys_appeared:
+            # the schema of a stream is fixed, the following chunks go into a new file
+            self._close_stream()
+            self._segment += 1
+            path = os.path.join(self.metrics_dir, f"segment-{self._segment:05d}.arrow")
+            schema = pa.schema([(k, pa.float64()) for k in self.metrics_keys])
+            options = pa.ipc.IpcWriteOptions(compression=self.compression)
+            self._sink = pa.OSFile(path, "wb")
+            self._stream = pa.ipc.new_stream(self._sink, schema, options=options)
+        batch = pa.record_batch([pa.array(c) for c in columns.values()], names=list(columns))
+        self._stream.write_batch(batch)
+        self._sink.flush()
+
+    def _close_stream(self) -> None:
+        if self._stream is not None:
+            self._stream.close()
+            self._sink.close()
+            self._stream = self._sink = None
+
+    def _write_numpy_chunk(self, columns: Dict[str, np.ndarray], new_keys: List[str]) -> None:
+        if new_keys:
+            # the rows written before the key appeared are missing the metric
+            for k in new_keys:
+                np.full(self._num_rows_written, np.nan).tofile(self._column_path(k))
+            tmp_path = os.path.join(self.metrics_dir, self.NAME_COLUMNS_FILE + '.tmp')
+            with open(tmp_path, 'w') as f:
+                json.dump(self.metrics_keys, f)
+            os.replace(tmp_path, os.path.join(self.metrics_dir, self.NAME_COLUMNS_FILE))
+        for k, column in columns.items():
+            with open(self._column_path(k), 'ab') as f:
+                column.tofile(f)
+
+    def _column_path(self, key: str) -> str:
+        # metric keys may contain characters which are not allowed in file names
+        return os.path.join(self.metrics_dir, f"{self.metrics_keys.index(key):05d}.f64")
+
+
+def read_metrics(log_dir: str) -> Dict[str, np.ndarray]:
+    """Reads the metrics written by :class:`ColumnarLogger`.
+
+    Args:
+        log_dir: The log directory of the run, :attr:`ColumnarLogger.log_dir`.
+
+    Returns:
+        A ``float64`` array per metric key, all of them with one entry per logged row. Steps that did not log a
+        metric hold ``NaN``. The arrays of the ``"numpy"`` storage are read-only memory maps of the column files,
+        so only the parts which are accessed get read from disk.
+
+    Example::
+
+        metrics = read_metrics(logger.log_dir)
+        steps, loss = metrics["step"], metrics["train_loss"]
+        mask = ~np.isnan(loss)
+        plt.plot(steps[mask], loss[mask])
+    """
+    metrics_dir = os.path.join(log_dir, ColumnarExperimentWriter.NAME_METRICS_DIR)
+    columns_file = os.path.join(metrics_dir, ColumnarExperimentWriter.NAME_COLUMNS_FILE)
+    if os.path.isfile(columns_file):
+        with open(columns_file) as f:
+            keys = json.load(f)
+        paths = [os.path.join(metrics_dir, f"{i:05d}.f64") for i in range(len(keys))]
+        # a column may be ahead of the others when it is read while a chunk is being written
+        num_rows = min(os.path.getsize(p) for p in paths) // 8
+        if num_rows == 0:
+            return {k: np.empty(0) for k in keys}
+        return {k: np.memmap(p, dtype=np.float64, mode="r", shape=(num_rows, )) for k, p in zip(keys, paths)}
+
+    segments = sorted(glob.glob(os.path.join(metrics_dir, "segment-*.arrow")))
+    if segments and not _PYARROW_AVAILABLE:
+        raise MisconfigurationException(
+            "Reading the 'arrow' storage requires `pyarrow` to be installed."
+            " Install it by running `pip install pyarrow`."
+        )
+    tables = []
+    for path in segments:
+        with pa.OSFile(path, "rb") as source:
+            tables.append(pa.ipc.open_stream(source).read_all())
+    keys = {}
+    for table in tables:
+        keys.update((k, None) for k in table.column_names)
+    metrics = {}
+    for k in keys:
+        parts = [
+            table.column(k).to_numpy() if k in table.column_names else np.full(table.num_rows, np.nan)
+            for table in tables
+        ]
+        metrics[k] = np.concatenate(parts)
+    return metrics
+
+
+class ColumnarLogger(CSVLogger):
+    r"""
+    Log to local file system in a binary columnar format, which keeps up with metrics logged at every step.
+
+    Logs are saved to ``os.path.join(save_dir, name, version)``, the hyperparameters in yaml format and the metrics
+    into the ``metrics`` directory. Use :func:`read_metrics` to load them.
+
+    Example:
+        >>> from pytorch_lightning import Trainer
+        >>> from pytorch_lightning.loggers import ColumnarLogger
+        >>> logger = ColumnarLogger("logs", name="my_exp_name")
+        >>> trainer = Trainer(logger=logger)
+
+    Args:
+        save_dir: Save directory
+        name: Experiment name. Defaults to ``'default'``.
+        version: Experiment version. If version is not specified the logger inspects the save
+            directory for existing versions, then automatically assigns the next available version.
+        prefix: A string to put at the beginning of metric keys.
+        chunk_size: The maximum number of rows held in memory before they are written.
+        storage: Either ``"arrow"`` or ``"numpy"``. Defaults to ``"arrow"`` if ``pyarrow`` is installed,
+            see :class:`ColumnarExperimentWriter`.
+        compression: The codec that compresses the ``"arrow"`` storage.
+    """
+
+    def __init__(
+        self,
+        save_dir: str,
+        name: Optional[str] = "default",
+        version: Optional[Union[int, str]] = None,
+        prefix: str = '',
+        chunk_size: int = 10000,
+        storage: Optional[str] = None,
+        compression: Optional[str] = "zstd",
+    ):
+        super().__init__(save_dir, name=name, version=version, prefix=prefix)
+        self._chunk_size = chunk_size
+        self._storage = storage
+        self._compression = compression
+
+    @property
+    @rank_zero_experiment
+    def experiment(self) -> ColumnarExperimentWriter:
+        r"""
+
+        Actual ColumnarExperimentWriter object. To use ColumnarExperimentWriter features in your
+        :class:`~pytorch_lightning.core.lightning.LightningModule` do the following.
+
+        Example::
+
+            self.logger.experiment.some_experiment_writer_function()
+
+        """
+        if self._experiment:
+            return self._experiment
+
+        os.makedirs(self.root_dir, exist_ok=True)
+        self._experiment = ColumnarExperimentWriter(
+            log_dir=self.log_dir, chunk_size=self._chunk_size, storage=self._storage, compression=self._compression
+        )
+        return self._experiment
+
+    @rank_zero_only
+    def finalize(self, status: str) -> None:
+        self.experiment.close()
@@ -42,6 +42,10 @@ class ExperimentWriter(object):
     Currently supports to log hyperparameters and metrics in YAML and CSV
     format, respectively.
 
+    The metrics are kept in memory until :meth:`save` appends them to the CSV file, so the memory and the cost
+    of a save do not grow with the length of the run. The file is only rewritten when new metric keys appear,
+    to extend its header.
+
     Args:
         log_dir: Directory for the experiment logs
     """
@@ -52,6 +56,9 @@ class ExperimentWriter(object):
     def __init__(self, log_dir: str) -> None:
         self.hparams = {}
         self.metrics = []
+        self.metrics_keys = []
+        self._num_rows = 0
+        self._file_created = False
 
         self.log_dir = log_dir
         if os.path.exists(self.log_dir) and os.listdir(self.log_dir):
@@ -76,29 +83,46 @@ class ExperimentWriter(object):
             return value
 
         if step is None:
-            step = len(self.metrics)
+            step = self._num_rows
 
         metrics = {k: _handle_value(v) for k, v in metrics_dict.items()}
         metrics['step'] = step
         self.metrics.append(metrics)
+        self._num_rows += 1
 
     def save(self) -> None:
-        """Save recorded hparams and metrics into files"""
+        """Save recorded hparams and the metrics recorded since the last save into files"""
         hparams_file = os.path.join(self.log_dir, self.NAME_HPARAMS_FILE)
         save_hparams_to_yaml(hparams_file, self.hparams)
 
         if not self.metrics:
             return
 
-        last_m = {}
+        new_keys = {}
         for m in self.metrics:
-            last_m.update(m)
-        metrics_keys = list(last_m.keys())
+            new_keys.update((k, None) for k in m if k not in self.metrics_keys)
+        if new_keys:
+            self.metrics_keys.extend(new_keys)
+            if self._file_created:
+                self._rewrite_header()
+
+        # the first save replaces the file of a previous run
+        with io.open(self.metrics_file_path, 'a' if self._file_created else 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=self.metrics_keys)
+            if not self._file_created:
+                writer.writeheader()
+            writer.writerows(self.metrics)
+        self._file_created = True
+        self.metrics = []
 
-        with io.open(self.metrics_file_path, 'w', newline='') as f:
-            self.writer = csv.DictWriter(f, fieldnames=metrics_keys)
-            self.writer.writeheader()
-            self.writer.writerows(self.metrics)
+    def _rewrite_header(self) -> None:
+        """Copies the rows written so far into a file with the current header, one row at a time."""
+        tmp_path = self.metrics_file_path + '.tmp'
+        with io.open(self.metrics_file_path, 'r', newline='') as src, io.open(tmp_path, 'w', newline='') as dst:
+            writer = csv.DictWriter(dst, fieldnames=self.metrics_keys)
+            writer.writeheader()
+            writer.writerows(csv.DictReader(src))
+        os.replace(tmp_path, self.metrics_file_path)
 
 
 class CSVLogger(LightningLoggerBase):
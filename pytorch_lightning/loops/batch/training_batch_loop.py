@@ -26,7 +26,6 @@ from torch.optim import Optimizer
 import pytorch_lightning as pl
 from pytorch_lightning.core.optimizer import LightningOptimizer
 from pytorch_lightning.loops.base import Loop
-from pytorch_lightning.plugins import ParallelPlugin
 from pytorch_lightning.trainer.connectors.logger_connector.result import ResultCollection
 from pytorch_lightning.trainer.progress import BatchProgress, OptimizationProgress
 from pytorch_lightning.trainer.supporters import TensorRunningAccum
@@ -515,7 +514,7 @@ class TrainingBatchLoop(Loop):
     def block_ddp_sync_behaviour(self, should_block_sync: bool = False) -> Generator[None, None, None]:
         """
         automatic_optimization = True
-        Blocks ddp sync gradients behaviour on backwards pass.
+        Blocks the gradient sync of the training type plugin on backwards pass.
         This is useful for skipping sync when accumulating gradients, reducing communication overhead
 
         automatic_optimization = False
@@ -525,10 +524,7 @@ class TrainingBatchLoop(Loop):
         Returns:
             context manager with sync behaviour off
         """
-        if (
-            isinstance(self.trainer.training_type_plugin, ParallelPlugin)
-            and (self.trainer.lightning_module.automatic_optimization or should_block_sync)
-        ):
+        if self.trainer.lightning_module.automatic_optimization or should_block_sync:
             with self.trainer.training_type_plugin.block_backward_sync():
                 yield None
         else:
@@ -6,6 +6,7 @@ from torch.utils.data import DataLoader
 import pytorch_lightning as pl
 from pytorch_lightning.loops.dataloader.dataloader_loop import DataLoaderLoop
 from pytorch_lightning.loops.epoch.prediction_epoch_loop import PredictionEpochLoop
+from pytorch_lightning.overrides.distributed import BatchIndices
 from pytorch_lightning.plugins import DDPSpawnPlugin
 from pytorch_lightning.trainer.progress import EpochLoopProgress
 from pytorch_lightning.utilities.exceptions import MisconfigurationException
@@ -18,7 +19,7 @@ class PredictionLoop(DataLoaderLoop):
     def __init__(self):
         super().__init__()
         self.predictions: Optional[List[List[Any]]] = None
-        self.epoch_batch_indices: Optional[List[List[int]]] = None
+        self.epoch_batch_indices: Optional[List[BatchIndices]] = None
         self.progress = EpochLoopProgress()
 
         self.epoch_loop = PredictionEpochLoop()
@@ -111,8 +111,10 @@ class EvaluationEpochLoop(Loop):
         if batch is None:
             raise StopIteration
 
-        with self.trainer.profiler.profile("evaluation_batch_to_device"):
-            batch = self.trainer.accelerator.batch_to_device(batch, dataloader_idx=dataloader_idx)
+        if not self.trainer.data_connector.prefetch_batches:
+            # otherwise, the batch was transferred ahead of time
+            with self.trainer.profiler.profile("evaluation_batch_to_device"):
+                batch = self.trainer.accelerator.batch_to_device(batch, dataloader_idx=dataloader_idx)
 
         # hook
         self.on_evaluation_batch_start(batch, batch_idx, dataloader_idx)
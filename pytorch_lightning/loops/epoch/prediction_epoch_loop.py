@@ -5,7 +5,7 @@ from deprecate import void
 
 import pytorch_lightning as pl
 from pytorch_lightning.loops.base import Loop
-from pytorch_lightning.overrides.distributed import IndexBatchSamplerWrapper
+from pytorch_lightning.overrides.distributed import BatchIndices, IndexBatchSamplerWrapper
 from pytorch_lightning.trainer.progress import EpochProgress
 from pytorch_lightning.utilities.warnings import WarningCache
 
@@ -23,7 +23,7 @@ class PredictionEpochLoop(Loop):
         self._dl_max_batches: Optional[int] = None
         self._num_dataloaders: Optional[int] = None
         self._warning_cache = WarningCache()
-        self._all_batch_indices: List[int] = []
+        self._all_batch_indices = BatchIndices()
 
     def connect(
         self, trainer: "pl.Trainer", *args: Any, progress: Optional[EpochProgress] = None, **kwargs: Any
@@ -47,7 +47,7 @@ class PredictionEpochLoop(Loop):
     def reset(self) -> None:
         """Resets the loops internal state"""
         self.iteration_count = 0
-        self._all_batch_indices: List[int] = []
+        self._all_batch_indices = BatchIndices()
         self.predictions: List[Any] = []
 
     def on_run_start(
@@ -101,13 +101,13 @@ class PredictionEpochLoop(Loop):
         with self.trainer.profiler.profile("predict_step"):
             self._predict_step(batch, batch_idx, dataloader_idx)
 
-    def on_run_end(self) -> Tuple[Any, Any]:
+    def on_run_end(self) -> Tuple[List[Any], BatchIndices]:
         """Returns the predictions and the corresponding batch indices"""
         predictions = self.predictions
         all_batch_indices = self._all_batch_indices
         # free memory
         self.predictions = []
-        self._all_batch_indices = []
+        self._all_batch_indices = BatchIndices()
         return predictions, all_batch_indices
 
     def _predict_step(self, batch: Any, batch_idx: int, dataloader_idx: int) -> None:
@@ -21,6 +21,7 @@ from pytorch_lightning import loops  # import as loops to avoid circular imports
 from pytorch_lightning.loops.batch import TrainingBatchLoop
 from pytorch_lightning.trainer.connectors.logger_connector.result import ResultCollection
 from pytorch_lightning.trainer.progress import TrainingEpochProgress
+from pytorch_lightning.trainer.supporters import CombinedLoader
 from pytorch_lightning.utilities.exceptions import MisconfigurationException
 from pytorch_lightning.utilities.model_helpers import is_overridden
 from pytorch_lightning.utilities.signature_utils import is_param_in_hook_signature
@@ -54,6 +55,8 @@ class TrainingEpochLoop(loops.Loop):
         self._dataloader_idx: Optional[int] = None
         self._warning_cache: WarningCache = WarningCache()
         self._epoch_output: Optional[List[List[STEP_OUTPUT]]] = None
+        # the state of the train dataloader to continue the epoch from, when restarting from a mid-epoch checkpoint
+        self._dataloader_state_dict: Dict[str, Any] = {}
 
     @property
     def batch_idx(self) -> int:
@@ -89,6 +92,22 @@ class TrainingEpochLoop(loops.Loop):
         self.batches_seen = 0
         self.is_last_batch = False
         self._dataloader_idx = 0
+        self.progress.reset_on_epoch()
+
+        # track epoch output
+        self._epoch_output = [[] for _ in range(self.batch_loop.num_active_optimizers(self.total_batch_idx))]
+
+    def restore(self) -> None:
+        """Continues the epoch of a mid-epoch checkpoint after its last processed batch"""
+        self.iteration_count = self.progress.batch.current.processed
+        self.total_batch_idx = self.progress.batch.total.processed
+        self.batches_seen = 0
+        self.is_last_batch = False
+        self._dataloader_idx = 0
+
+        # the skipped batches are not loaded, the samplers start after them
+        self.trainer.train_dataloader.load_state_dict(self._dataloader_state_dict)
+        self._dataloader_state_dict = {}
 
         # track epoch output
         self._epoch_output = [[] for _ in range(self.batch_loop.num_active_optimizers(self.total_batch_idx))]
@@ -110,17 +129,24 @@ class TrainingEpochLoop(loops.Loop):
         """
         _, (batch, is_last) = next(dataloader_iter)
         self.is_last_batch = is_last
+        self.progress.batch.increment_ready()
 
         # ------------------------------------
         # TRAINING_STEP + TRAINING_STEP_END
         # ------------------------------------
-        with self.trainer.profiler.profile("training_batch_to_device"):
-            batch = self.trainer.accelerator.batch_to_device(batch, dataloader_idx=self._dataloader_idx)
+        if not self.trainer.data_connector.prefetch_batches:
+            # otherwise, the batch was transferred ahead of time
+            with self.trainer.profiler.profile("training_batch_to_device"):
+                batch = self.trainer.accelerator.batch_to_device(batch, dataloader_idx=self._dataloader_idx)
+
+        self.progress.batch.increment_started()
 
         with self.trainer.profiler.profile("run_training_batch"):
             batch_output = self.batch_loop.run(batch, self.iteration_count, self._dataloader_idx)
             self.batches_seen += 1
 
+        self.progress.batch.increment_processed()
+
         # when returning -1 from train_step, we end epoch early
         if batch_output.signal == -1:
             raise StopIteration
@@ -149,6 +175,8 @@ class TrainingEpochLoop(loops.Loop):
         # -----------------------------------------
         self.trainer.logger_connector.update_train_step_metrics()
 
+        self.progress.batch.increment_completed()
+
     def on_advance_end(self):
         """Runs validation and Checkpointing if necessary.
 
@@ -433,8 +461,31 @@ class TrainingEpochLoop(loops.Loop):
             self.trainer.logger.save()
 
     def state_dict(self) -> Dict:
-        return {"batch_loop": self.batch_loop.state_dict(), "val_loop": self.val_loop.state_dict()}
+        return {
+            "batch_loop": self.batch_loop.state_dict(),
+            "val_loop": self.val_loop.state_dict(),
+            "dataloader_state_dict": self._get_dataloader_state_dict(),
+        }
 
     def load_state_dict(self, state_dict: Dict) -> None:
         self.batch_loop.load_state_dict(state_dict["batch_loop"])
         self.val_loop.load_state_dict(state_dict["val_loop"])
+        self._dataloader_state_dict = state_dict.get("dataloader_state_dict", {})
+        # a mid-epoch checkpoint continues its epoch
+        self.restarting = bool(self._dataloader_state_dict)
+
+    def _get_dataloader_state_dict(self) -> Dict[str, Any]:
+        """
+        Returns the state of the train dataloader after the processed batches of an unfinished epoch, or an empty dict
+        if the epoch is finished or the dataloader cannot continue it.
+        """
+        num_batches = self.progress.batch.current.processed
+        if (
+            self.trainer is None or not isinstance(self.trainer.train_dataloader, CombinedLoader) or num_batches == 0
+            or self.is_last_batch or num_batches >= self.trainer.num_training_batches or self.trainer.should_stop
+        ):
+            return {}
+        state_dict = self.trainer.train_dataloader.state_dict(num_batches)
+        if not state_dict or any(state is None for state in state_dict["samplers"]):
+            return {}
+        return {"epoch": self.trainer.current_epoch, **state_dict}
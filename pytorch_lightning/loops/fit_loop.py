@@ -21,7 +21,7 @@ from pytorch_lightning.loops import Loop
 from pytorch_lightning.loops.epoch import TrainingEpochLoop
 from pytorch_lightning.trainer.connectors.logger_connector.result import ResultCollection
 from pytorch_lightning.trainer.progress import FitLoopProgress
-from pytorch_lightning.trainer.supporters import TensorRunningAccum
+from pytorch_lightning.trainer.supporters import _leaf_loaders, CombinedLoader, CycleIterator, TensorRunningAccum
 from pytorch_lightning.utilities import rank_zero_info
 
 log = logging.getLogger(__name__)
@@ -198,6 +198,13 @@ class FitLoop(Loop):
         with suppress(Exception):
             # set seed for distributed sampler (enables shuffling for each epoch)
             self.trainer.train_dataloader.sampler.set_epoch(self.current_epoch)
+        # and for the batch samplers which shuffle, such as the `BucketBatchSampler`
+        if isinstance(self.trainer.train_dataloader, CombinedLoader):
+            for loader in _leaf_loaders(self.trainer.train_dataloader.loaders):
+                loader = loader.loader if isinstance(loader, CycleIterator) else loader
+                batch_sampler = getattr(loader, "batch_sampler", None)
+                if callable(getattr(batch_sampler, "set_epoch", None)):
+                    batch_sampler.set_epoch(self.current_epoch)
 
         # changing gradient according accumulation_scheduler
         self.trainer.accumulation_scheduler.on_train_epoch_start(self.trainer, self.trainer.lightning_module)
@@ -290,9 +297,11 @@ class FitLoop(Loop):
                 cb.on_validation_end(self.trainer, model)
 
     def state_dict(self) -> Dict:
-        return {"epoch_loop": self.epoch_loop.state_dict()}
+        return {"epoch_loop": self.epoch_loop.state_dict(), "progress": self.progress.state_dict()}
 
     def load_state_dict(self, state_dict: Dict) -> None:
+        if "progress" in state_dict:
+            self.progress.load_state_dict(state_dict["progress"])
         self.epoch_loop.load_state_dict(state_dict["epoch_loop"])
 
     def teardown(self) -> None:
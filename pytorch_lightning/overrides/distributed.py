@@ -12,8 +12,10 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import itertools
-from typing import Any, Iterator, List, Optional
+import math
+from typing import Any, Iterable, Iterator, List, Optional, Sequence, Tuple
 
+import numpy as np
 import torch
 from torch.nn.parallel import DistributedDataParallel
 from torch.utils.data import BatchSampler, DistributedSampler, Sampler
@@ -105,22 +107,251 @@ class UnrepeatedDistributedSampler(DistributedSampler):
         # have at least one batch, or the DistributedDataParallel could lock up.
         assert self.num_samples >= 1 or self.total_size == 0
 
-    def __iter__(self) -> Iterator[List[int]]:
-        if self.shuffle:
-            # deterministically shuffle based on epoch
-            g = torch.Generator()
-            g.manual_seed(self.epoch)
-            indices = torch.randperm(len(self.dataset), generator=g).tolist()
-        else:
-            indices = list(range(len(self.dataset)))
+    def __iter__(self) -> Iterator[int]:
+        if not self.shuffle:
+            # the indices of the rank are strided, no need to hold them in memory
+            return iter(range(self.rank, self.total_size, self.num_replicas))
 
+        # deterministically shuffle based on epoch
+        g = torch.Generator()
+        g.manual_seed(self.epoch)
+        indices = torch.randperm(len(self.dataset), generator=g).numpy()
         assert len(indices) == self.total_size
 
-        # subsample
+        # subsample, as a view of the permutation rather than a list of python integers
         indices = indices[self.rank:self.total_size:self.num_replicas]
         assert len(indices) == self.num_samples
 
-        return iter(indices)
+        return map(int, indices)
+
+
+class BucketBatchSampler(Sampler):
+    """
+    A batch sampler which batches together the samples of similar lengths, to reduce the padding of variable-length
+    sequences, and splits the batches between the processes like the pytorch DistributedSampler.
+
+    At each epoch, the indices are shuffled and split into buckets of ``batch_size * batches_per_bucket`` samples.
+    The samples of each bucket are sorted by length and batched, then the batches are shuffled across the buckets.
+    The processes take the batches by groups of ``num_replicas`` consecutive batches, so that they run batches of
+    similar lengths at each step. The order of the batches only depends on ``seed`` and on the epoch set with
+    :meth:`set_epoch`, so it is the same in every process.
+
+    With ``max_tokens``, the batches are packed up to a budget of tokens instead: a batch holds as many samples as
+    fit in ``max_tokens`` once padded to the longest of them, so batches of short samples are larger. The buckets hold
+    ``batches_per_bucket`` batches of the average length, and all the processes still run the same number of batches.
+
+    Args:
+        lengths: the length of each sample of the dataset
+        batch_size: the number of samples of a batch, or the maximum number of samples of a batch with
+            ``max_tokens``
+        batches_per_bucket: the number of batches of a bucket. Larger buckets reduce the padding further, at the cost
+            of less random batches.
+        shuffle: whether to shuffle the samples and the batches
+        drop_last: whether to drop the last incomplete batch and the batches left after splitting them evenly
+            between the processes. Otherwise, the first batches are repeated so that all processes run the same
+            number of batches. With ``max_tokens``, only the batches left after the split are dropped.
+        num_replicas: the number of processes, by default the world size of the process group
+        rank: the rank of the current process, by default its rank in the process group
+        seed: the seed of the shuffling
+        max_tokens: the maximum number of tokens of a padded batch, ``number of samples * longest length``. A sample
+            longer than it makes a batch on its own.
+
+    Example::
+
+        lengths = [len(sample["input_ids"]) for sample in dataset]
+        DataLoader(dataset, batch_sampler=BucketBatchSampler(lengths, batch_size=32), collate_fn=pad_collate)
+        DataLoader(dataset, batch_sampler=BucketBatchSampler(lengths, max_tokens=8192), collate_fn=pad_collate)
+    """
+
+    def __init__(
+        self,
+        lengths: Sequence[int],
+        batch_size: Optional[int] = None,
+        batches_per_bucket: int = 100,
+        shuffle: bool = True,
+        drop_last: bool = False,
+        num_replicas: Optional[int] = None,
+        rank: Optional[int] = None,
+        seed: int = 0,
+        max_tokens: Optional[int] = None,
+    ) -> None:
+        initialized = torch.distributed.is_available() and torch.distributed.is_initialized()
+        if num_replicas is None:
+            num_replicas = torch.distributed.get_world_size() if initialized else 1
+        if rank is None:
+            rank = torch.distributed.get_rank() if initialized else 0
+        if not 0 <= rank < num_replicas:
+            raise ValueError(f"Invalid rank {rank}, rank should be in the interval [0, {num_replicas - 1}]")
+        if batch_size is None and max_tokens is None:
+            raise ValueError("Either `batch_size` or `max_tokens` should be set")
+        if (batch_size is not None and batch_size < 1) or batches_per_bucket < 1:
+            raise ValueError(
+                f"`batch_size` and `batches_per_bucket` should be >= 1, got {batch_size} and {batches_per_bucket}"
+            )
+        if max_tokens is not None and max_tokens < 1:
+            raise ValueError(f"`max_tokens` should be >= 1, got {max_tokens}")
+        self.lengths = list(lengths)
+        self.batch_size = batch_size
+        self.batches_per_bucket = batches_per_bucket
+        self.shuffle = shuffle
+        self.drop_last = drop_last
+        self.num_replicas = num_replicas
+        self.rank = rank
+        self.seed = seed
+        self.max_tokens = max_tokens
+        self.epoch = 0
+        # the batches of the last epoch drawn, which `__len__` needs with `max_tokens`
+        self._epoch_steps: Optional[Tuple[int, List[List[List[int]]]]] = None
+
+    def set_epoch(self, epoch: int) -> None:
+        self.epoch = epoch
+
+    def __len__(self) -> int:
+        if self.max_tokens is not None:
+            return len(self._steps())
+        num_batches = len(self.lengths) / self.batch_size
+        if self.drop_last:
+            return int(num_batches) // self.num_replicas
+        return math.ceil(math.ceil(num_batches) / self.num_replicas)
+
+    def __iter__(self) -> Iterator[List[int]]:
+        return iter([step[self.rank] for step in self._steps()])
+
+    def _bucket_size(self) -> int:
+        if self.max_tokens is None:
+            return self.batch_size * self.batches_per_bucket
+        mean_length = sum(self.lengths) / max(len(self.lengths), 1)
+        samples_per_batch = max(int(self.max_tokens / max(mean_length, 1)), 1)
+        if self.batch_size is not None:
+            samples_per_batch = min(samples_per_batch, self.batch_size)
+        return samples_per_batch * self.batches_per_bucket
+
+    def _steps(self) -> List[List[List[int]]]:
+        """Returns the batches of the epoch, grouped by step with one batch per process."""
+        if self._epoch_steps is not None and self._epoch_steps[0] == self.epoch:
+            return self._epoch_steps[1]
+
+        # deterministically shuffle based on epoch and seed
+        generator = torch.Generator()
+        generator.manual_seed(self.seed + self.epoch)
+        num_samples = len(self.lengths)
+        indices = torch.randperm(num_samples, generator=generator) if self.shuffle else torch.arange(num_samples)
+
+        batches = []
+        for bucket in indices.split(self._bucket_size()):
+            # the sort is stable, the samples of the same length stay shuffled
+            bucket = sorted(bucket.tolist(), key=self.lengths.__getitem__)
+            if self.max_tokens is None:
+                batches.extend(bucket[i:i + self.batch_size] for i in range(0, len(bucket), self.batch_size))
+            else:
+                batches.extend(_pack_by_tokens(bucket, self.lengths, self.max_tokens, self.batch_size))
+        if self.drop_last and self.max_tokens is None and batches and len(batches[-1]) < self.batch_size:
+            batches.pop()
+
+        if self.drop_last:
+            num_steps = len(batches) // self.num_replicas
+        else:
+            num_steps = math.ceil(len(batches) / self.num_replicas)
+            # repeat the first batches to split them evenly
+            batches += [batches[i % len(batches)] for i in range(num_steps * self.num_replicas - len(batches))]
+        steps = [batches[i * self.num_replicas:(i + 1) * self.num_replicas] for i in range(num_steps)]
+        if self.shuffle:
+            steps = [steps[i] for i in torch.randperm(num_steps, generator=generator).tolist()]
+
+        self._epoch_steps = (self.epoch, steps)
+        return steps
+
+
+class DynamicBatchSampler(Sampler):
+    """
+    A batch sampler which packs the indices drawn from a sampler into batches of at most ``max_tokens`` tokens,
+    counting each sample as padded to the longest sample of its batch. The batches keep the order of the sampler, so
+    it can wrap the samplers which the Trainer injects in distributed training, such as the
+    :class:`UnrepeatedDistributedSampler` of the prediction.
+
+    The number of batches depends on the order of the indices, so ``len`` is the number of batches of the last pass
+    drawn from the sampler. Before the first iteration, ``len`` draws the pass which the iteration then runs, so the
+    sampler is iterated once per pass. It is only an estimate of the next pass for a sampler which shuffles at random.
+    :meth:`set_epoch` is forwarded to the sampler, such as a ``DistributedSampler``. For training in distributed mode,
+    where all the processes need to run the same number of batches, use a :class:`BucketBatchSampler` with
+    ``max_tokens``.
+
+    Args:
+        sampler: the sampler of the indices
+        lengths: the length of each sample of the dataset
+        max_tokens: the maximum number of tokens of a padded batch, ``number of samples * longest length``. A sample
+            longer than it makes a batch on its own.
+        max_batch_size: the maximum number of samples of a batch
+        drop_last: whether to drop the last batch, which holds the samples left at the end of the pass
+
+    Example::
+
+        lengths = [len(sample["input_ids"]) for sample in dataset]
+        batch_sampler = DynamicBatchSampler(SequentialSampler(dataset), lengths, max_tokens=8192)
+        DataLoader(dataset, batch_sampler=batch_sampler, collate_fn=pad_collate)
+    """
+
+    def __init__(
+        self,
+        sampler: Sampler,
+        lengths: Sequence[int],
+        max_tokens: int,
+        max_batch_size: Optional[int] = None,
+        drop_last: bool = False,
+    ) -> None:
+        if max_tokens < 1:
+            raise ValueError(f"`max_tokens` should be >= 1, got {max_tokens}")
+        self.sampler = sampler
+        self.lengths = list(lengths)
+        self.max_tokens = max_tokens
+        self.max_batch_size = max_batch_size
+        self.drop_last = drop_last
+        # the batches of the last pass drawn from the sampler, and whether they were iterated already
+        self._last_batches: Optional[List[List[int]]] = None
+        self._iterated = False
+
+    @property
+    def batch_size(self) -> Optional[int]:
+        return self.max_batch_size
+
+    def set_epoch(self, epoch: int) -> None:
+        if callable(getattr(self.sampler, "set_epoch", None)):
+            self.sampler.set_epoch(epoch)
+            self._last_batches = None
+
+    def __iter__(self) -> Iterator[List[int]]:
+        if self._last_batches is None or self._iterated:
+            self._last_batches = self._draw()
+        self._iterated = True
+        return iter(self._last_batches)
+
+    def __len__(self) -> int:
+        if self._last_batches is None:
+            self._last_batches = self._draw()
+            self._iterated = False
+        return len(self._last_batches)
+
+    def _draw(self) -> List[List[int]]:
+        batches = list(_pack_by_tokens(self.sampler, self.lengths, self.max_tokens, self.max_batch_size))
+        if self.drop_last and batches:
+            batches.pop()
+        return batches
+
+
+def _pack_by_tokens(
+    indices: Iterable[int], lengths: Sequence[int], max_tokens: int, max_batch_size: Optional[int]
+) -> Iterator[List[int]]:
+    """Packs the indices in order into batches of at most ``max_tokens`` padded tokens."""
+    batch, longest = [], 0
+    for index in indices:
+        length = max(longest, lengths[index])
+        if batch and (length * (len(batch) + 1) > max_tokens or len(batch) == max_batch_size):
+            yield batch
+            batch, length = [], lengths[index]
+        batch.append(index)
+        longest = length
+    if batch:
+        yield batch
 
 
 class IndexBatchSamplerWrapper:
@@ -149,3 +380,123 @@ class IndexBatchSamplerWrapper:
     @property
     def sampler(self) -> Sampler:
         return self._sampler.sampler
+
+
+class BatchIndices(Sequence):
+    """
+    The indices of the batches of a prediction epoch, stored compactly.
+
+    While the batches are consecutive slices of the same arithmetic progression, as produced by the sequential sampler
+    or by the :class:`UnrepeatedDistributedSampler` without shuffling, only the progression is stored and the memory
+    is constant. Otherwise, the indices are stored in a single ``int64`` array, together with the offsets of the
+    batches.
+
+    The batches are converted to lists of integers when they are accessed, so they behave like the lists the indices
+    were previously stored as: they compare equal to lists, can be serialized with ``json`` and can be modified in place
+    without changing the stored indices.
+    """
+
+    def __init__(self, batches: Iterable[Sequence[int]] = ()) -> None:
+        # the arithmetic progression
+        self._start = 0
+        self._step: Optional[int] = None
+        self._batch_size = 0
+        self._last_size = 0
+        # the arrays, once the batches do not follow a progression
+        self._values: Optional[np.ndarray] = None
+        self._offsets: Optional[np.ndarray] = None
+        self._size = 0
+        self._num_batches = 0
+        for batch in batches:
+            self.append(batch)
+
+    def append(self, indices: Sequence[int]) -> None:
+        """Appends the indices of a batch."""
+        batch = np.asarray(indices, dtype=np.int64)
+        if self._values is None:
+            if self._extend_progression(batch):
+                return
+            self._to_arrays()
+
+        self._values = _grow(self._values, self._size + len(batch))
+        self._offsets = _grow(self._offsets, self._num_batches + 2)
+        self._values[self._size:self._size + len(batch)] = batch
+        self._size += len(batch)
+        self._num_batches += 1
+        self._offsets[self._num_batches] = self._size
+
+    def flatten(self) -> Sequence[int]:
+        """Returns the indices of all the batches, as a ``range`` or as a read-only ``int64`` array."""
+        if self._values is None:
+            return range(self._start, self._start + (self._step or 1) * self._size, self._step or 1)
+        return _read_only(self._values[:self._size])
+
+    def __len__(self) -> int:
+        return self._num_batches
+
+    def __getitem__(self, index: Any) -> Any:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._num_batches))]
+        if index < 0:
+            index += self._num_batches
+        if not 0 <= index < self._num_batches:
+            raise IndexError("batch index out of range")
+
+        if self._values is not None:
+            return self._values[self._offsets[index]:self._offsets[index + 1]].tolist()
+        step = self._step or 1
+        start = self._start + step * self._batch_size * index
+        size = self._last_size if index == self._num_batches - 1 else self._batch_size
+        return list(range(start, start + step * size, step))
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({list(self)})"
+
+    def _extend_progression(self, batch: np.ndarray) -> bool:
+        """Extends the progression with the batch if it is its next slice, all the batches but the last one having
+        the same size."""
+        size = len(batch)
+        if not size or self._num_batches and (self._last_size < self._batch_size or size > self._batch_size):
+            return False
+
+        start = self._start if self._size else int(batch[0])
+        step = self._step
+        if step is None:
+            if size > 1:
+                step = int(batch[1] - batch[0])
+            elif self._size:
+                step = int(batch[0]) - start
+        if step == 0:
+            return False
+        if step is not None:
+            if batch[0] != start + step * self._size or (size > 1 and np.any(np.diff(batch) != step)):
+                return False
+
+        self._start, self._step = start, step
+        if not self._num_batches:
+            self._batch_size = size
+        self._last_size = size
+        self._size += size
+        self._num_batches += 1
+        return True
+
+    def _to_arrays(self) -> None:
+        self._values = np.asarray(self.flatten(), dtype=np.int64)
+        offsets = np.arange(self._num_batches + 1, dtype=np.int64) * self._batch_size
+        offsets[-1] = self._size
+        self._offsets = offsets
+
+
+def _grow(array: np.ndarray, size: int) -> np.ndarray:
+    """Returns an array of at least ``size`` elements starting with ``array``, doubling its capacity if needed."""
+    if len(array) >= size:
+        return array
+    grown = np.empty(max(size, 2 * len(array)), dtype=array.dtype)
+    grown[:len(array)] = array
+    return grown
+
+
+def _read_only(array: np.ndarray) -> np.ndarray:
+    array = array.view()
+    array.flags.writeable = False
+    return array
@@ -20,7 +20,8 @@ import sys
 import tempfile
 import time
 from time import sleep
-from typing import Any, Dict, List, Optional, Union
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Union
 
 import __main__
 import numpy as np
@@ -38,18 +39,28 @@ from pytorch_lightning.utilities import (
     _HYDRA_AVAILABLE,
     _TORCH_GREATER_EQUAL_1_7,
     _TORCH_GREATER_EQUAL_1_8,
+    _TORCH_GREATER_EQUAL_1_9,
     rank_zero_deprecation,
     rank_zero_warn,
 )
 from pytorch_lightning.utilities.distributed import (
+    CollectiveHandle,
     distributed_available,
+    HierarchicalGroups,
+    hierarchical_allreduce_hook,
     rank_zero_info,
     rank_zero_only,
     ReduceOp,
     sync_ddp_if_available,
 )
 from pytorch_lightning.utilities.exceptions import DeadlockDetectedException, MisconfigurationException
+from pytorch_lightning.utilities.gradient_compression import get_gradient_compression, GradientCompression
 from pytorch_lightning.utilities.seed import reset_seed
+from pytorch_lightning.utilities.sharded_checkpoint import (
+    is_sharded_checkpoint,
+    load_sharded_checkpoint,
+    save_sharded_checkpoint,
+)
 
 if _HYDRA_AVAILABLE:
     from hydra.core.hydra_config import HydraConfig
@@ -67,9 +78,25 @@ class DDPPlugin(ParallelPlugin):
     The master process in each node spawns N-1 child processes via :func:`subprocess.Popen`,
     where N is the number of devices (e.g. GPU) per node.
     It is very similar to how :mod:`torch.distributed.launch` launches processes.
+
+    With ``sharded_checkpoint=True``, checkpoints are saved as directories with one shard per rank. All ranks write
+    their part of the state in parallel and read only their shards when restoring,
+    see :mod:`pytorch_lightning.utilities.sharded_checkpoint`.
+
+    ``gradient_compression`` compresses the gradients before their all-reduce, with one of the presets of
+    :mod:`pytorch_lightning.utilities.gradient_compression` or a
+    :class:`~pytorch_lightning.utilities.gradient_compression.GradientCompression`. Its state is saved with the
+    checkpoints: the error feedback of every rank with ``sharded_checkpoint=True``, only the one of rank 0 otherwise.
+
+    With ``hierarchical_all_reduce=True``, the gradients and the tensors reduced with :meth:`reduce` are reduced within
+    each node first, all-reduced across the local ranks 0 of the nodes and broadcast back within the nodes, see
+    :class:`~pytorch_lightning.utilities.distributed.HierarchicalGroups`. This divides the traffic between the nodes
+    by the number of processes per node, for clusters whose network is slower than the links within a node.
     """
 
     distributed_backend = "ddp"
+    # the checkpoint entries which differ across ranks and are saved by every rank
+    _sharded_checkpoint_local_keys = ()
 
     def __init__(
         self,
@@ -80,6 +107,9 @@ class DDPPlugin(ParallelPlugin):
         ddp_comm_state: Optional[object] = None,
         ddp_comm_hook: Optional[callable] = None,
         ddp_comm_wrapper: Optional[callable] = None,
+        gradient_compression: Optional[Union[str, GradientCompression]] = None,
+        sharded_checkpoint: bool = False,
+        hierarchical_all_reduce: bool = False,
         **kwargs: Union[Any, Dict[str, Any]],
     ) -> None:
         super().__init__(parallel_devices=parallel_devices, cluster_environment=cluster_environment)
@@ -104,6 +134,18 @@ class DDPPlugin(ParallelPlugin):
         self._ddp_comm_state = ddp_comm_state
         self._ddp_comm_hook = ddp_comm_hook
         self._ddp_comm_wrapper = ddp_comm_wrapper
+        if gradient_compression is not None and ddp_comm_hook is not None:
+            raise MisconfigurationException("`gradient_compression` and `ddp_comm_hook` cannot be set together.")
+        self._gradient_compression = get_gradient_compression(gradient_compression)
+        if hierarchical_all_reduce and (gradient_compression is not None or ddp_comm_hook is not None):
+            raise MisconfigurationException(
+                "`hierarchical_all_reduce` cannot be set together with `gradient_compression` or `ddp_comm_hook`."
+            )
+        self.hierarchical_all_reduce = hierarchical_all_reduce
+        self._hierarchical_groups: Optional[HierarchicalGroups] = None
+        self.sharded_checkpoint = sharded_checkpoint
+        if self._gradient_compression is not None:
+            self._sharded_checkpoint_local_keys = (*self._sharded_checkpoint_local_keys, "gradient_compression")
         self._pids: Optional[List[int]] = None
         self._sync_dir: Optional[str] = None
         self.set_world_ranks()
@@ -257,6 +299,11 @@ class DDPPlugin(ParallelPlugin):
         # where to store ip_table
         self.init_ddp_connection()
 
+        if self.hierarchical_all_reduce:
+            self._hierarchical_groups = HierarchicalGroups(
+                self.num_nodes, self.num_processes, self.node_rank, self.local_rank
+            )
+
         # set the ranks and devices
         self.dist.rank = self.global_rank
         self.dist.device = self.root_device
@@ -292,6 +339,17 @@ class DDPPlugin(ParallelPlugin):
             self._ddp_kwargs["find_unused_parameters"] = True
 
     def _register_ddp_hooks(self) -> None:
+        if self._gradient_compression is not None:
+            # the compressions are not limited to NCCL
+            self._gradient_compression.register(self._model)
+            return
+        if self._hierarchical_groups is not None:
+            if not _TORCH_GREATER_EQUAL_1_8 or (not self.on_gpu and not _TORCH_GREATER_EQUAL_1_9):
+                raise MisconfigurationException(
+                    "`hierarchical_all_reduce` requires PyTorch 1.8 or later, and 1.9 or later on CPU."
+                )
+            self._model.register_comm_hook(self._hierarchical_groups, hierarchical_allreduce_hook)
+            return
         # currently, DDP communication hooks only work with NCCL backend and SPSD (single process single device) mode
         # https://github.com/pytorch/pytorch/blob/v1.8.0/torch/nn/parallel/distributed.py#L1080-L1084
         if (_TORCH_GREATER_EQUAL_1_8 and self.on_gpu and self._is_single_process_single_device):
@@ -371,21 +429,80 @@ class DDPPlugin(ParallelPlugin):
             torch.cuda.set_device(self.root_device)
         self.model.to(self.root_device)
 
-    def reduce(self, tensor, group: Optional[Any] = None, reduce_op: Union[ReduceOp, str] = "mean") -> torch.Tensor:
+    def save_checkpoint(
+        self,
+        checkpoint: Dict[str, Any],
+        filepath: str,
+        writer: Optional[Callable[[Dict[str, Any], str], None]] = None,
+    ) -> None:
+        if not self.sharded_checkpoint:
+            return super().save_checkpoint(checkpoint, filepath, writer=writer)
+        checkpoint = self.on_save(checkpoint)
+        save_sharded_checkpoint(
+            checkpoint,
+            filepath,
+            rank=self.global_rank,
+            world_size=self.world_size,
+            local_keys=self._sharded_checkpoint_local_keys,
+        )
+
+    def on_save_checkpoint(self, checkpoint: Dict[str, Any]) -> None:
+        if self._gradient_compression is not None:
+            checkpoint["gradient_compression"] = self._gradient_compression.dump_checkpoint(
+                self.global_rank, self.world_size
+            )
+
+    def on_load_checkpoint(self, checkpoint: Dict[str, Any]) -> None:
+        if self._gradient_compression is not None and "gradient_compression" in checkpoint:
+            self._gradient_compression.restore_checkpoint(
+                checkpoint["gradient_compression"], self.global_rank, self.world_size
+            )
+
+    def load_checkpoint_file(self, checkpoint_path: Union[str, Path]) -> Dict[str, Any]:
+        if not is_sharded_checkpoint(checkpoint_path) or not distributed_available():
+            return super().load_checkpoint_file(checkpoint_path)
+        # NCCL can only broadcast tensors on the GPU
+        device = self.root_device if torch.distributed.get_backend() == "nccl" else torch.device("cpu")
+        return load_sharded_checkpoint(
+            checkpoint_path,
+            rank=self.global_rank,
+            world_size=self.world_size,
+            device=device,
+            mmap=self.mmap_checkpoint,
+        )
+
+    @property
+    def reduce_is_elementwise(self) -> bool:
+        return True
+
+    def reduce(
+        self,
+        tensor,
+        group: Optional[Any] = None,
+        reduce_op: Union[ReduceOp, str] = "mean",
+        async_op: bool = False,
+    ) -> Union[torch.Tensor, CollectiveHandle]:
         """
         Reduces a tensor from several distributed processes to one aggregated tensor.
 
         Args:
             tensor: the tensor to sync and reduce
-            group: the process group to gather results from. Defaults to all processes (world)
+            group: the process group to gather results from. Defaults to all processes (world),
+                reduced hierarchically with ``hierarchical_all_reduce=True``
             reduce_op: the reduction operation. Defaults to 'mean'/'avg'.
                 Can also be a string 'sum' to calculate the sum during reduction.
+            async_op: whether to return a :class:`~pytorch_lightning.utilities.distributed.CollectiveHandle`,
+                whose ``wait`` returns the reduced value, instead of waiting for the reduction
 
         Return:
             reduced value, except when the input was not a tensor the output remains is unchanged
         """
         if isinstance(tensor, torch.Tensor):
-            tensor = sync_ddp_if_available(tensor, group, reduce_op=reduce_op)
+            if group is None and self._hierarchical_groups is not None:
+                group = self._hierarchical_groups
+            return sync_ddp_if_available(tensor, group, reduce_op=reduce_op, async_op=async_op)
+        if async_op:
+            return CollectiveHandle(None, lambda: tensor)
         return tensor
 
     def training_step(self, *args, **kwargs):
@@ -412,6 +529,14 @@ class DDPPlugin(ParallelPlugin):
             description="DDP Plugin with `find_unused_parameters` as False",
             find_unused_parameters=False
         )
+        for name, description in (
+            ("fp16", "compressing the gradients to half precision"),
+            ("powersgd", "compressing the gradients with PowerSGD"),
+            ("topk", "sparsifying the gradients to their top-k"),
+        ):
+            plugin_registry.register(
+                f"ddp_{name}", cls, description=f"DDP Plugin {description}", gradient_compression=name
+            )
 
     def _share_information_to_prevent_deadlock(self):
         self._share_pids()
@@ -55,6 +55,10 @@ class DDP2Plugin(DDPPlugin):
 
         return apply_to_collection(collection, torch.Tensor, mean)
 
+    @property
+    def reduce_is_elementwise(self) -> bool:
+        return False
+
     @property
     def root_device(self):
         return self.parallel_devices[0]
@@ -14,7 +14,7 @@
 import logging
 import os
 import re
-from typing import Any, List, Optional, Union
+from typing import Any, Dict, List, Optional, Union
 
 import torch
 import torch.distributed
@@ -37,12 +37,15 @@ from pytorch_lightning.utilities import (
 from pytorch_lightning.utilities.cloud_io import atomic_save
 from pytorch_lightning.utilities.cloud_io import load as pl_load
 from pytorch_lightning.utilities.distributed import (
+    CollectiveHandle,
     distributed_available,
     rank_zero_info,
     rank_zero_only,
     ReduceOp,
     sync_ddp_if_available,
 )
+from pytorch_lightning.utilities.exceptions import MisconfigurationException
+from pytorch_lightning.utilities.gradient_compression import get_gradient_compression, GradientCompression
 from pytorch_lightning.utilities.seed import reset_seed
 
 if _TORCH_GREATER_EQUAL_1_8:
@@ -55,6 +58,11 @@ class DDPSpawnPlugin(ParallelPlugin):
     """
     Spawns processes using the :func:`torch.multiprocessing.spawn` method and joins processes after
     training finishes.
+
+    ``gradient_compression`` compresses the gradients before their all-reduce, with one of the presets of
+    :mod:`pytorch_lightning.utilities.gradient_compression` or a
+    :class:`~pytorch_lightning.utilities.gradient_compression.GradientCompression`. Its state is saved with the
+    checkpoints, with the error feedback of rank 0.
     """
 
     distributed_backend = "ddp_spawn"
@@ -68,6 +76,7 @@ class DDPSpawnPlugin(ParallelPlugin):
         ddp_comm_state: Optional[object] = None,
         ddp_comm_hook: Optional[callable] = None,
         ddp_comm_wrapper: Optional[callable] = None,
+        gradient_compression: Optional[Union[str, GradientCompression]] = None,
         **kwargs: Any,
     ):
         super().__init__(parallel_devices=parallel_devices, cluster_environment=cluster_environment)
@@ -90,6 +99,9 @@ class DDPSpawnPlugin(ParallelPlugin):
         self._ddp_comm_state = ddp_comm_state
         self._ddp_comm_hook = ddp_comm_hook
         self._ddp_comm_wrapper = ddp_comm_wrapper
+        if gradient_compression is not None and ddp_comm_hook is not None:
+            raise MisconfigurationException("`gradient_compression` and `ddp_comm_hook` cannot be set together.")
+        self._gradient_compression = get_gradient_compression(gradient_compression)
         self._local_rank = 0
         self.set_world_ranks()
 
@@ -236,6 +248,10 @@ class DDPSpawnPlugin(ParallelPlugin):
             self._ddp_kwargs["find_unused_parameters"] = True
 
     def _register_ddp_hooks(self) -> None:
+        if self._gradient_compression is not None:
+            # the compressions are not limited to NCCL
+            self._gradient_compression.register(self._model)
+            return
         # currently, DDP communication hooks only work with NCCL backend and SPSD (single process single device) mode
         # https://github.com/pytorch/pytorch/blob/v1.8.0/torch/nn/parallel/distributed.py#L1080-L1084
         if (_TORCH_GREATER_EQUAL_1_8 and self.on_gpu and self._is_single_process_single_device):
@@ -317,6 +333,18 @@ class DDPSpawnPlugin(ParallelPlugin):
             ckpt = pl_load(last_path, map_location=lambda storage, loc: storage)
             self.lightning_module.load_state_dict(ckpt)
 
+    def on_save_checkpoint(self, checkpoint: Dict[str, Any]) -> None:
+        if self._gradient_compression is not None:
+            checkpoint["gradient_compression"] = self._gradient_compression.dump_checkpoint(
+                self.global_rank, self.world_size
+            )
+
+    def on_load_checkpoint(self, checkpoint: Dict[str, Any]) -> None:
+        if self._gradient_compression is not None and "gradient_compression" in checkpoint:
+            self._gradient_compression.restore_checkpoint(
+                checkpoint["gradient_compression"], self.global_rank, self.world_size
+            )
+
     def barrier(self, *args, **kwargs) -> None:
         if not distributed_available():
             return
@@ -338,7 +366,17 @@ class DDPSpawnPlugin(ParallelPlugin):
         if not self.lightning_module.automatic_optimization and self.model.require_backward_grad_sync:
             prepare_for_backward(self.model, closure_loss)
 
-    def reduce(self, tensor, group: Optional[Any] = None, reduce_op: Union[ReduceOp, str] = "mean") -> torch.Tensor:
+    @property
+    def reduce_is_elementwise(self) -> bool:
+        return True
+
+    def reduce(
+        self,
+        tensor,
+        group: Optional[Any] = None,
+        reduce_op: Union[ReduceOp, str] = "mean",
+        async_op: bool = False,
+    ) -> Union[torch.Tensor, CollectiveHandle]:
         """
         Reduces a tensor from several distributed processes to one aggregated tensor.
 
@@ -347,12 +385,16 @@ class DDPSpawnPlugin(ParallelPlugin):
             group: the process group to gather results from. Defaults to all processes (world)
             reduce_op: the reduction operation. Defaults to 'mean'/'avg'.
                 Can also be a string 'sum' to calculate the sum during reduction.
+            async_op: whether to return a :class:`~pytorch_lightning.utilities.distributed.CollectiveHandle`,
+                whose ``wait`` returns the reduced value, instead of waiting for the reduction
 
         Return:
             reduced value, except when the input was not a tensor the output remains is unchanged
         """
         if isinstance(tensor, torch.Tensor):
-            tensor = sync_ddp_if_available(tensor, group, reduce_op=reduce_op)
+            return sync_ddp_if_available(tensor, group, reduce_op=reduce_op, async_op=async_op)
+        if async_op:
+            return CollectiveHandle(None, lambda: tensor)
         return tensor
 
     def training_step(self, *args, **kwargs):
@@ -370,3 +412,14 @@ class DDPSpawnPlugin(ParallelPlugin):
     def post_training_step(self):
         if not self.lightning_module.automatic_optimization:
             self.model.require_backward_grad_sync = True
+
+    @classmethod
+    def register_plugins(cls, plugin_registry: Dict) -> None:
+        for name, description in (
+            ("fp16", "compressing the gradients to half precision"),
+            ("powersgd", "compressing the gradients with PowerSGD"),
+            ("topk", "sparsifying the gradients to their top-k"),
+        ):
+            plugin_registry.register(
+                f"ddp_spawn_{name}", cls, description=f"DDP Spawn Plugin {description}", gradient_compression=name
+            )
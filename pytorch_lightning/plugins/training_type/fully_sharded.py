@@ -169,6 +169,16 @@ class DDPFullyShardedPlugin(DDPPlugin):
         self.configure_ddp()
         self.barrier()
 
+    @contextlib.contextmanager
+    def block_backward_sync(self) -> Generator:
+        """Blocks the gradient reduction of the :class:`~fairscale.nn.data_parallel.FullyShardedDataParallel`
+        modules in the backward passes of the context. The unsharded gradients are accumulated until then."""
+        with contextlib.ExitStack() as stack:
+            # `no_sync` applies to the nested modules and is only supported on the outermost ones
+            for module in _outermost_fully_sharded_modules(self.model):
+                stack.enter_context(module.no_sync())
+            yield None
+
     def model_to_device(self) -> None:
         # ensure we update the device type in the lightning module
         self.lightning_module.to(self.root_device)
@@ -206,3 +216,9 @@ class DDPFullyShardedPlugin(DDPPlugin):
             cls,
             description="Fully sharded training with checkpointing the full state dict.",
         )
+
+
+def _outermost_fully_sharded_modules(module: Module) -> List[Module]:
+    if isinstance(module, FullyShardedDataParallel):
+        return [module]
+    return [m for child in module.children() for m in _outermost_fully_sharded_modules(child)]
@@ -11,8 +11,9 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-from contextlib import ExitStack
-from typing import Any, List, Optional, Union
+import sys
+from contextlib import contextmanager, ExitStack
+from typing import Any, Generator, List, Optional, Union
 
 import torch
 from torch.optim.lr_scheduler import _LRScheduler, Optimizer
@@ -32,6 +33,7 @@ class HorovodPlugin(ParallelPlugin):
     def __init__(self, parallel_devices: Optional[List[torch.device]] = None):
         super().__init__(parallel_devices=parallel_devices, cluster_environment=None)
         rank_zero_only.rank = self.global_rank
+        self._backward_sync_blocked = False
 
     @property
     def global_rank(self) -> int:
@@ -194,7 +196,29 @@ class HorovodPlugin(ParallelPlugin):
         gathered_result = list(gathered.split(1, dim=0))
         return gathered_result
 
+    @contextmanager
+    def block_backward_sync(self) -> Generator:
+        """
+        Blocks the gradient all-reduce of the Horovod optimizers in the backward passes of the context.
+
+        The backward hooks of a Horovod optimizer all-reduce a gradient once it was accumulated
+        ``backward_passes_per_step`` times, which is pushed out of reach of the context.
+        """
+        optimizers = self.lightning_module.trainer.optimizers
+        for optimizer in optimizers:
+            optimizer.set_backward_passes_per_step(sys.maxsize)
+        self._backward_sync_blocked = True
+        try:
+            yield None
+        finally:
+            self._backward_sync_blocked = False
+            for optimizer in optimizers:
+                optimizer.set_backward_passes_per_step(1)
+
     def post_backward(self, closure_loss: torch.Tensor, should_accumulate: bool, optimizer: Optimizer, opt_idx: int):
+        if self._backward_sync_blocked:
+            # the gradients are all-reduced after the first backward outside of `block_backward_sync`
+            return
         # synchronize all horovod optimizers.
         for optimizer in self.lightning_module.trainer.optimizers:
             optimizer.synchronize()
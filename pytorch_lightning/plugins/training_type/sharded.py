@@ -11,7 +11,9 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-from typing import Optional
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Generator, Mapping, Optional, Union
 
 import torch
 from torch.optim import Optimizer
@@ -22,6 +24,7 @@ from pytorch_lightning.plugins.training_type.ddp import DDPPlugin
 from pytorch_lightning.trainer.states import TrainerFn
 from pytorch_lightning.utilities import _FAIRSCALE_AVAILABLE, _FAIRSCALE_OSS_FP16_BROADCAST_AVAILABLE, rank_zero_only
 from pytorch_lightning.utilities.exceptions import MisconfigurationException
+from pytorch_lightning.utilities.sharded_checkpoint import is_sharded_checkpoint
 
 if _FAIRSCALE_AVAILABLE:
     from fairscale.nn.data_parallel.sharded_ddp import ShardedDataParallel
@@ -34,6 +37,12 @@ class DDPShardedPlugin(DDPPlugin):
     """ Optimizer and gradient sharded training provided by FairScale. """
 
     _REDUCE_BUFFER_SIZE_DEFAULT = 2**23  # 8M
+    # with sharded checkpoints, every rank saves the optimizer state of its own partition of the parameters
+    _sharded_checkpoint_local_keys = ("optimizer_states", )
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._has_local_optimizer_states = False
 
     def configure_ddp(self):
         self._wrap_optimizers()
@@ -45,6 +54,16 @@ class DDPShardedPlugin(DDPPlugin):
         )
         setattr(self._model, "require_backward_grad_sync", False)
 
+    @contextmanager
+    def block_backward_sync(self) -> Generator:
+        """Blocks the gradient reduction of :class:`~fairscale.nn.data_parallel.ShardedDataParallel` in the
+        backward passes of the context."""
+        if isinstance(self.model, ShardedDataParallel):
+            with self.model.no_sync():
+                yield None
+        else:
+            yield None
+
     def _reinit_optimizers_with_oss(self):
         optimizers = self.lightning_module.trainer.optimizers
         for x, optimizer in enumerate(optimizers):
@@ -74,6 +93,9 @@ class DDPShardedPlugin(DDPPlugin):
     def optimizer_state(self, optimizer: "OSS") -> Optional[dict]:
         if is_lightning_optimizer(optimizer):
             optimizer = optimizer._optimizer
+        if self.sharded_checkpoint:
+            # the state of the local partition, the state is not gathered on rank 0
+            return optimizer.optim.state_dict()
         optimizer.consolidate_state_dict()
         return self._optim_state_dict(optimizer)
 
@@ -85,6 +107,21 @@ class DDPShardedPlugin(DDPPlugin):
         """
         return optimizer.state_dict()
 
+    def load_checkpoint_file(self, checkpoint_path: Union[str, Path]) -> Dict[str, Any]:
+        self._has_local_optimizer_states = is_sharded_checkpoint(checkpoint_path)
+        return super().load_checkpoint_file(checkpoint_path)
+
+    def load_optimizer_state_dict(self, checkpoint: Mapping[str, Any]) -> None:
+        if not self._has_local_optimizer_states:
+            return super().load_optimizer_state_dict(checkpoint)
+        for optimizer, opt_state in zip(self.lightning_module.trainer.accelerator.optimizers,
+                                        checkpoint["optimizer_states"]):
+            if is_lightning_optimizer(optimizer):
+                optimizer = optimizer._optimizer
+            optimizer.optim.load_state_dict(opt_state)
+            # propagates the restored hyper-parameters of the partition to the wrapping optimizer
+            optimizer._sync_param_groups(optimizer.optim.param_groups, optimizer.param_groups)
+
     @property
     def lightning_module(self) -> 'pl.LightningModule':
         if not _FAIRSCALE_AVAILABLE:  # pragma: no cover
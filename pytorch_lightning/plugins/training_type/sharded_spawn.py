@@ -11,7 +11,8 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-from typing import Optional
+from contextlib import contextmanager
+from typing import Generator, Optional
 
 import torch
 from torch.optim import Optimizer
@@ -41,6 +42,16 @@ class DDPSpawnShardedPlugin(DDPSpawnPlugin):
         )
         setattr(self._model, "require_backward_grad_sync", False)
 
+    @contextmanager
+    def block_backward_sync(self) -> Generator:
+        """Blocks the gradient reduction of :class:`~fairscale.nn.data_parallel.ShardedDataParallel` in the
+        backward passes of the context."""
+        if isinstance(self.model, ShardedDataParallel):
+            with self.model.no_sync():
+                yield None
+        else:
+            yield None
+
     def _reinit_optimizers_with_oss(self):
         optimizers = self.lightning_module.trainer.optimizers
         for x, optimizer in enumerate(optimizers):
@@ -23,6 +23,7 @@ from torch.optim import Optimizer
 from torch.utils.data import DataLoader
 
 import pytorch_lightning as pl
+from pytorch_lightning.core.hooks import CheckpointHooks
 from pytorch_lightning.overrides.base import unwrap_lightning_module
 from pytorch_lightning.plugins.base_plugin import Plugin
 from pytorch_lightning.utilities import rank_zero_warn
@@ -33,15 +34,20 @@ from pytorch_lightning.utilities.types import _EVALUATE_OUTPUT, _PREDICT_OUTPUT
 TBroadcast = TypeVar("T")
 
 
-class TrainingTypePlugin(Plugin, ABC):
+class TrainingTypePlugin(Plugin, CheckpointHooks, ABC):
     """
     Base class for all training type plugins that change the behaviour of the training, validation and test-loop.
+
+    Set ``mmap_checkpoint = True`` to memory-map the checkpoints restored by :meth:`load_checkpoint_file`, so the
+    tensors are only read from disk once they are accessed. The restored CPU tensors, optimizer states included, stay
+    backed by copy-on-write pages of the checkpoint file.
     """
 
     def __init__(self) -> None:
         self._model = None
         self._results: Optional[Union[_EVALUATE_OUTPUT, _PREDICT_OUTPUT]] = None
         self._call_configure_sharded_model_hook = True
+        self.mmap_checkpoint = False
 
     def connect(self, model: Module) -> None:
         """Called by the accelerator to connect the accelerator and the model with this plugin"""
@@ -89,12 +95,21 @@ class TrainingTypePlugin(Plugin, ABC):
         """
         Reduces the given tensor (e.g. across GPUs/processes).
 
+        The plugins which can reduce asynchronously accept ``async_op=True`` and return a
+        :class:`~pytorch_lightning.utilities.distributed.CollectiveHandle` instead.
+
         Args:
             tensor: the tensor to sync and reduce
             *args: plugin-specific positional arguments
             **kwargs: plugin-specific keyword arguments
         """
 
+    @property
+    def reduce_is_elementwise(self) -> bool:
+        """Whether :meth:`reduce` reduces each element of a tensor on its own, returning a tensor of the same shape,
+        so that several tensors can be concatenated and reduced at once."""
+        return False
+
     @abstractmethod
     def barrier(self, name: Optional[str] = None) -> None:
         """Forces all possibly joined processes to wait for each other"""
@@ -120,6 +135,16 @@ class TrainingTypePlugin(Plugin, ABC):
     def post_optimizer_step(self, optimizer: Optimizer, optimizer_idx: int, **kwargs) -> None:
         """Hook to do something after each optimizer step."""
 
+    @contextlib.contextmanager
+    def block_backward_sync(self) -> Generator:
+        """
+        Blocks the synchronization of the gradients in the backward passes run in this context. The gradients are
+        accumulated locally and synchronized by the first backward pass outside of it.
+        This is useful for skipping sync when accumulating gradients, reducing communication overhead.
+        The plugins which do not synchronize the gradients during the backward pass leave it as a no-op.
+        """
+        yield
+
     @property
     def model(self) -> Module:
         """Returns the potentially wrapped LightningModule"""
@@ -146,7 +171,7 @@ class TrainingTypePlugin(Plugin, ABC):
         return self._results
 
     def load_checkpoint_file(self, checkpoint_path: Union[str, Path]) -> Dict[str, Any]:
-        return pl_load(checkpoint_path, map_location=(lambda storage, loc: storage))
+        return pl_load(checkpoint_path, map_location=(lambda storage, loc: storage), mmap=self.mmap_checkpoint)
 
     def load_model_state_dict(self, checkpoint: Mapping[str, Any]) -> None:
         self.lightning_module.load_state_dict(checkpoint["state_dict"])
@@ -252,24 +277,32 @@ class TrainingTypePlugin(Plugin, ABC):
         model = self.lightning_module
         return model.state_dict()
 
-    def save_checkpoint(self, checkpoint: Dict[str, Any], filepath: str) -> None:
+    def save_checkpoint(
+        self,
+        checkpoint: Dict[str, Any],
+        filepath: str,
+        writer: Optional[Callable[[Dict[str, Any], str], None]] = None,
+    ) -> None:
         """Save model/training states as a checkpoint file through state-dump and file-write.
 
         Args:
             checkpoint: dict containing model and trainer state
             filepath: write-target file's path
+            writer: writes the post-processed checkpoint to the file on the global zero process, e.g. in the
+                background. Defaults to :func:`~pytorch_lightning.utilities.cloud_io.atomic_save`.
         """
+        writer = writer or atomic_save
         # dump states as a checkpoint dictionary object
         checkpoint = self.on_save(checkpoint)
         if self.is_global_zero:
             try:
                 # write the checkpoint dictionary on the file
-                atomic_save(checkpoint, filepath)
+                writer(checkpoint, filepath)
             except AttributeError as err:
                 key = pl.LightningModule.CHECKPOINT_HYPER_PARAMS_KEY
                 checkpoint.pop(key, None)
                 rank_zero_warn(f'Warning, `{key}` dropped from checkpoint. An attribute is not picklable: {err}')
-                atomic_save(checkpoint, filepath)
+                writer(checkpoint, filepath)
 
     @contextlib.contextmanager
     def model_sharded_context(self) -> Generator:
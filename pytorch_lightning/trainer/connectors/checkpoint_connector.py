@@ -15,7 +15,7 @@
 import os
 import re
 from pathlib import Path
-from typing import Optional, Union
+from typing import Any, Callable, Dict, Optional, Union
 
 import torch
 
@@ -162,6 +162,8 @@ class CheckpointConnector:
 
         # restore precision plugin (scaler etc.)
         self.trainer.precision_plugin.on_load_checkpoint(self._loaded_checkpoint)
+        # restore training type plugin (gradient compression etc.)
+        self.trainer.training_type_plugin.on_load_checkpoint(self._loaded_checkpoint)
         # restore progress (loops etc.)
         self.restore_progress()
 
@@ -183,14 +185,15 @@ class CheckpointConnector:
 
     def restore_progress(self) -> None:
         """
-        Restores the training progress from the pre-loaded checkpoint. This currently includes only the global step
-        and current epoch.
+        Restores the training progress from the pre-loaded checkpoint. This includes the global step, the current
+        epoch and the state of the loops, which continue the epoch of a mid-epoch checkpoint.
         """
         if not self._loaded_checkpoint:
             return
 
         self.trainer.fit_loop.global_step = self._loaded_checkpoint['global_step']
         self.trainer.fit_loop.current_epoch = self._loaded_checkpoint['epoch']
+        self.restore_loops()
 
         # crash if max_epochs is lower then the current epoch from the checkpoint
         if self.trainer.max_epochs is not None and self.trainer.current_epoch > self.trainer.max_epochs:
@@ -199,6 +202,10 @@ class CheckpointConnector:
                 f" but you have set Trainer(max_epochs={self.trainer.max_epochs})."
             )
 
+        if self.trainer.fit_loop.epoch_loop.restarting:
+            # the epoch is continued
+            return
+
         # Division deals with global step stepping once per accumulated batch
         # Inequality deals with different global step for odd vs even num_training_batches
         n_accum = 1 if self.trainer.accumulate_grad_batches is None else self.trainer.accumulate_grad_batches
@@ -211,6 +218,20 @@ class CheckpointConnector:
                 " consider using an end of epoch checkpoint."
             )
 
+    def restore_loops(self) -> None:
+        """
+        Restores the state of the fit loop from the pre-loaded checkpoint. When the checkpoint was saved in the middle
+        of an epoch, the epoch is continued after the last processed batch instead of starting the next one.
+        """
+        loops = self._loaded_checkpoint.get("loops")
+        if not loops:
+            return
+
+        fit_loop = self.trainer.fit_loop
+        fit_loop.load_state_dict(loops["fit_loop"])
+        if fit_loop.epoch_loop.restarting:
+            fit_loop.current_epoch = loops["fit_loop"]["epoch_loop"]["dataloader_state_dict"]["epoch"]
+
     def restore_optimizers_and_schedulers(self) -> None:
         """ Restores the optimizers and learning rate scheduler states from the pre-loaded checkpoint. """
         if not self._loaded_checkpoint:
@@ -307,6 +328,7 @@ class CheckpointConnector:
                 'lr_schedulers':             "PT sched's state_dict"[]   # if not weights_only
                 'native_amp_scaling_state':  PT amp's state_dict         # if not weights_only and use native amp
                 'amp_scaling_state':         Apex's state_dict           # if not weights_only and use apex amp
+                'loops':                     Loops' state_dict           # if not weights_only
                 'state_dict':                Model's state_dict (e.g. network weights)
                 CHECKPOINT_HYPER_PARAMS_NAME:
                 CHECKPOINT_HYPER_PARAMS_KEY:
@@ -353,6 +375,15 @@ class CheckpointConnector:
             checkpoint['lr_schedulers'] = lr_schedulers
 
             self.trainer.precision_plugin.on_save_checkpoint(checkpoint)
+            self.trainer.training_type_plugin.on_save_checkpoint(checkpoint)
+
+            # dump the loops, with the position in the train dataloader of a mid-epoch checkpoint
+            checkpoint['loops'] = {
+                "fit_loop": self.trainer.fit_loop.state_dict(),
+                "validate_loop": self.trainer.validate_loop.state_dict(),
+                "test_loop": self.trainer.test_loop.state_dict(),
+                "predict_loop": self.trainer.predict_loop.state_dict(),
+            }
 
         # dump hyper-parameters
         if model.hparams:
@@ -421,12 +452,18 @@ class CheckpointConnector:
         ckpt_number = max_suffix if max_suffix is not None else 0
         return f'{folder_path}/hpc_ckpt_{ckpt_number}.ckpt'
 
-    def save_checkpoint(self, filepath, weights_only: bool = False) -> None:
+    def save_checkpoint(
+        self,
+        filepath,
+        weights_only: bool = False,
+        writer: Optional[Callable[[Dict[str, Any], str], None]] = None,
+    ) -> None:
         """Save model/training states as a checkpoint file through state-dump and file-write.
 
         Args:
             filepath: write-target file's path
             weights_only: saving model weights only
+            writer: writes the checkpoint to the file, instead of the training type plugin
         """
         _checkpoint = self.dump_checkpoint(weights_only)
-        self.trainer.accelerator.save_checkpoint(_checkpoint, filepath)
+        self.trainer.accelerator.save_checkpoint(_checkpoint, filepath, writer=writer)
@@ -12,10 +12,11 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from typing import Optional, Union
+from functools import partial
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
 
 import pytorch_lightning as pl
-from pytorch_lightning.trainer.supporters import prefetch_iterator
+from pytorch_lightning.trainer.supporters import prefetch_iterator, transfer_prefetch_iterator
 from pytorch_lightning.utilities import rank_zero_deprecation
 from pytorch_lightning.utilities.exceptions import MisconfigurationException
 from pytorch_lightning.utilities.model_helpers import is_overridden
@@ -24,9 +25,29 @@ from pytorch_lightning.utilities.types import EVAL_DATALOADERS, TRAIN_DATALOADER
 
 class DataConnector:
 
-    def __init__(self, trainer: "pl.Trainer", multiple_trainloader_mode: str = "max_size_cycle"):
+    def __init__(
+        self,
+        trainer: "pl.Trainer",
+        multiple_trainloader_mode: str = "max_size_cycle",
+        prefetch_batches: int = 0,
+        bucket_length_key: Optional[Union[str, Callable[[Any], int], Sequence[int]]] = None,
+    ):
         self.trainer = trainer
         self.multiple_trainloader_mode = multiple_trainloader_mode
+        if not isinstance(prefetch_batches, int) or prefetch_batches < 0:
+            raise MisconfigurationException(f"`prefetch_batches` should be an int >= 0, got {prefetch_batches}.")
+        self.prefetch_batches = prefetch_batches
+        if not (
+            bucket_length_key is None or isinstance(bucket_length_key, str) or callable(bucket_length_key)
+            or hasattr(bucket_length_key, "__len__")
+        ):
+            raise MisconfigurationException(
+                "`bucket_length_key` should be a key of the samples, a callable or the lengths of the samples,"
+                f" got {bucket_length_key!r}."
+            )
+        self.bucket_length_key = bucket_length_key
+        # the train dataset and the lengths read from its samples
+        self._bucket_lengths: Optional[Tuple[Any, List[int]]] = None
 
     def on_trainer_init(
         self,
@@ -62,11 +83,28 @@ class DataConnector:
         self.trainer._is_data_prepared = False
 
     def get_profiled_train_dataloader(self, train_dataloader):
-        profiled_dl = self.trainer.profiler.profile_iterable(
-            enumerate(prefetch_iterator(train_dataloader)), "get_train_batch"
-        )
+        if self.prefetch_batches:
+            iterator = self._transfer_prefetch_iterator(train_dataloader, dataloader_idx=0)
+        else:
+            iterator = prefetch_iterator(train_dataloader)
+        profiled_dl = self.trainer.profiler.profile_iterable(enumerate(iterator), "get_train_batch")
         return profiled_dl
 
+    def get_eval_dataloader_iter(self, dataloader: Iterable, dataloader_idx: int) -> Iterator:
+        if not self.prefetch_batches:
+            return enumerate(dataloader)
+        return enumerate(batch for batch, _ in self._transfer_prefetch_iterator(dataloader, dataloader_idx))
+
+    def _transfer_prefetch_iterator(self, dataloader: Iterable, dataloader_idx: int) -> Iterator:
+        """The batches of this iterator are already on the device, the loops skip the transfer"""
+        accelerator = self.trainer.accelerator
+        return transfer_prefetch_iterator(
+            dataloader,
+            partial(accelerator.batch_to_device, dataloader_idx=dataloader_idx),
+            self.prefetch_batches,
+            device=accelerator.root_device,
+        )
+
     def prepare_data(self, model):
         # on multi-gpu jobs we only want to manipulate (download, etc) on node_rank=0, local_rank=0
         # or in the case where each node needs to do its own manipulation in which case just local_rank=0
@@ -11,18 +11,20 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import inspect
 from collections.abc import Generator
 from dataclasses import asdict, dataclass, replace
 from functools import partial, wraps
 from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Tuple, Union
 
 import torch
+from torch.nn.utils.rnn import PackedSequence
 from torchmetrics import Metric
 
 from pytorch_lightning.utilities import rank_zero_warn
 from pytorch_lightning.utilities.apply_func import apply_to_collection, apply_to_collections
 from pytorch_lightning.utilities.device_dtype_mixin import DeviceDtypeModuleMixin
-from pytorch_lightning.utilities.distributed import distributed_available
+from pytorch_lightning.utilities.distributed import distributed_available, sync_ddp, sync_ddp_if_available
 from pytorch_lightning.utilities.enums import LightningEnum
 from pytorch_lightning.utilities.exceptions import MisconfigurationException
 from pytorch_lightning.utilities.metrics import metrics_to_scalars
@@ -35,6 +37,9 @@ _METRIC_COLLECTION = Union[_METRIC, Mapping[str, _METRIC]]
 
 warning_cache = WarningCache()
 
+# the maximum size of the flat tensors synchronized at the end of an epoch
+_SYNC_BUCKET_CAP_BYTES = 25 * 1024 * 1024
+
 
 class MetricSource(LightningEnum):
     CALLBACK = "callback"
@@ -161,6 +166,20 @@ class _Metadata:
         return meta
 
 
+def _is_elementwise(fn: Callable) -> bool:
+    if fn in (sync_ddp, sync_ddp_if_available):
+        return True
+    # the `reduce` method of a training type plugin
+    return getattr(getattr(fn, "__self__", None), "reduce_is_elementwise", False) is True
+
+
+def _accepts_async_op(fn: Callable) -> bool:
+    try:
+        return "async_op" in inspect.signature(fn).parameters
+    except (TypeError, ValueError):
+        return False
+
+
 class ResultMetric(Metric, DeviceDtypeModuleMixin):
     """Wraps the value provided to `:meth:`~pytorch_lightning.core.lightning.LightningModule.log`"""
 
@@ -196,14 +215,23 @@ class ResultMetric(Metric, DeviceDtypeModuleMixin):
 
     def compute(self) -> torch.Tensor:
         if self.is_tensor:
-            value = self.meta.sync(self.value)
-            if self.meta.is_mean_reduction:
-                cumulated_batch_size = self.meta.sync(self.cumulated_batch_size)
-                return value / cumulated_batch_size
-            elif self.meta.is_max_reduction or self.meta.is_min_reduction or self.meta.is_sum_reduction:
-                return value
+            return self._reduce([self.meta.sync(t) for t in self._sync_states])
         return self.value.compute()
 
+    @property
+    def _sync_states(self) -> List[torch.Tensor]:
+        """The states reduced across processes by ``compute``."""
+        if self.meta.is_mean_reduction:
+            return [self.value, self.cumulated_batch_size]
+        return [self.value]
+
+    def _reduce(self, states: List[torch.Tensor]) -> torch.Tensor:
+        """Computes the value from the synchronized ``_sync_states``."""
+        if self.meta.is_mean_reduction:
+            value, cumulated_batch_size = states
+            return value / cumulated_batch_size
+        return states[0]
+
     def reset(self) -> None:
         if self.is_tensor:
             super().reset()
@@ -345,6 +373,8 @@ class ResultCollection(dict):
         self._minimize = None
         self._batch_size = torch.tensor(1, device=device)
         self.device: Optional[Union[str, torch.device]] = device
+        # maps the `(fx, name, dataloader_idx)` of a `log` call to its key, metadata and arguments
+        self._log_cache: Dict[Tuple[str, str, Optional[int]], Tuple[str, _Metadata, tuple]] = {}
 
     @property
     def result_metrics(self) -> List[ResultMetric]:
@@ -434,6 +464,22 @@ class ResultCollection(dict):
         if isinstance(value, torch.Tensor) and value.device.type == "xla":
             value = value.cpu()
 
+        # performance: after the first call, reuse the registered metadata if the arguments did not change
+        cache_key = (fx, name, dataloader_idx)
+        log_args = (
+            prog_bar, logger, on_step, on_epoch, reduce_fx, enable_graph, metric_attribute, sync_dist, sync_dist_fn,
+            sync_dist_group, rank_zero_only
+        )
+        cached = self._log_cache.get(cache_key)
+        if cached is not None:
+            key, meta, cached_log_args = cached
+            item = self.get(key)
+            if item is not None and item.meta is meta and cached_log_args == log_args:
+                if batch_size is not None:
+                    self.batch_size = batch_size
+                self.update_metrics(key, value)
+                return
+
         # storage key
         key = f"{fx}.{name}"
         # add dataloader_suffix to both key and fx
@@ -469,6 +515,7 @@ class ResultCollection(dict):
             raise MisconfigurationException(
                 f'You called `self.log({name}, ...)` twice in `{fx}` with different arguments. This is not allowed'
             )
+        self._log_cache[cache_key] = (key, self[key].meta, log_args)
 
         if batch_size is not None:
             self.batch_size = batch_size
@@ -488,6 +535,12 @@ class ResultCollection(dict):
         self[key] = value
 
     def update_metrics(self, key: str, value: _METRIC_COLLECTION) -> None:
+        result_metric = self[key]
+        if isinstance(result_metric, ResultMetric) and isinstance(value, torch.Tensor):
+            # performance: skip the collection traversal for the common case of a single tensor
+            result_metric.forward(value.to(self.device), self.batch_size)
+            result_metric.has_reset = False
+            return
 
         def fn(result_metric, v):
             # performance: avoid calling `__call__` to avoid the checks in `torch.nn.Module._call_impl`
@@ -502,7 +555,7 @@ class ResultCollection(dict):
         if on_step and result_metric.meta.on_step:
             cache = result_metric._forward_cache
         elif not on_step and result_metric.meta.on_epoch:
-            if not result_metric._computed:
+            if result_metric._computed is None:
                 # always reduce on epoch end
                 should = result_metric.meta.sync.should
                 result_metric.meta.sync.should = True
@@ -513,6 +566,75 @@ class ResultCollection(dict):
             return cache.detach()
         return cache
 
+    def _sync_on_epoch_end(self) -> None:
+        """Synchronizes the values reduced at the end of the epoch with one collective per bucket instead of one per
+        value.
+
+        The states of the tensor metrics are flattened into buckets of the same sync function, reduce op, process
+        group, dtype and device, of at most ``_SYNC_BUCKET_CAP_BYTES``. Each bucket is reduced with a single call to
+        the sync function and the results are scattered back as the computed values. Only the element-wise sync
+        functions are bucketed, the values of the others, e.g. the mean of ``DataParallelPlugin.reduce``, are computed
+        one at a time by ``_get_cache``.
+        """
+        buckets: Dict[tuple, List[ResultMetric]] = {}
+
+        def collect(result_metric: ResultMetric) -> None:
+            sync = result_metric.meta.sync
+            if (
+                not result_metric.is_tensor or not result_metric.meta.on_epoch or sync.rank_zero_only
+                or result_metric._computed is not None or not result_metric._update_called
+                or not _is_elementwise(sync.fn)
+            ):
+                # computed by `_get_cache` as usual
+                return
+            value = result_metric.value
+            key = (sync.fn, sync.op, sync.group, value.dtype, value.device)
+            buckets.setdefault(key, []).append(result_metric)
+
+        for _, item in self.valid_items():
+            apply_to_collection(item, ResultMetric, collect)
+
+        # the buckets of the sync functions accepting `async_op` are all launched before waiting for any of them
+        pending = []
+        for (fn, op, group, *_), result_metrics in buckets.items():
+            bucket, bucket_bytes = [], 0
+            for result_metric in result_metrics:
+                states = result_metric._sync_states
+                nbytes = sum(t.numel() * t.element_size() for t in states)
+                if bucket and bucket_bytes + nbytes > _SYNC_BUCKET_CAP_BYTES:
+                    pending.append(self._sync_bucket(bucket, fn, op, group))
+                    bucket, bucket_bytes = [], 0
+                bucket.append(result_metric)
+                bucket_bytes += nbytes
+            pending.append(self._sync_bucket(bucket, fn, op, group))
+
+        for scatter in pending:
+            scatter()
+
+    @staticmethod
+    def _sync_bucket(
+        result_metrics: List[ResultMetric],
+        fn: Callable,
+        op: Optional[str],
+        group: Optional[Any],
+    ) -> Callable[[], None]:
+        """Launches the reduction of a bucket and returns the function scattering its result back."""
+        states = [t for result_metric in result_metrics for t in result_metric._sync_states]
+        flat = torch.cat([t.reshape(-1) for t in states])
+        if _accepts_async_op(fn):
+            wait = fn(flat, reduce_op=op, group=group, async_op=True).wait
+        else:
+            synced = fn(flat, reduce_op=op, group=group)
+            wait = partial(_Sync.no_op, synced)
+
+        def scatter() -> None:
+            synced = iter(torch.split(wait(), [t.numel() for t in states]))
+            for result_metric in result_metrics:
+                synced_states = [next(synced).view_as(t) for t in result_metric._sync_states]
+                result_metric._computed = result_metric._reduce(synced_states)
+
+        return scatter
+
     def valid_items(self) -> Generator:
         """This function is used to iterate over current valid metrics."""
         return ((k, v) for k, v in self.items()
@@ -531,6 +653,9 @@ class ResultCollection(dict):
     def metrics(self, on_step: bool) -> Dict[MetricSource, Dict[str, _METRIC]]:
         metrics = {k: {} for k in MetricSource}
 
+        if not on_step:
+            self._sync_on_epoch_end()
+
         for _, result_metric in self.valid_items():
 
             # extract forward_cache or computed from the ResultMetric. ignore when the output is None
@@ -562,10 +687,12 @@ class ResultCollection(dict):
                 metrics[MetricSource.CALLBACK][name] = value
                 metrics[MetricSource.CALLBACK][forked_name] = value
 
-            # populate progress_bar metrics. convert tensors to numbers
+            # populate progress_bar metrics
             if result_metric.meta.prog_bar:
-                metrics[MetricSource.PBAR][forked_name] = metrics_to_scalars(value)
+                metrics[MetricSource.PBAR][forked_name] = value
 
+        # convert tensors to numbers, all together to synchronize with the device once
+        metrics[MetricSource.PBAR] = metrics_to_scalars(metrics[MetricSource.PBAR])
         return metrics
 
     def reset(self, metrics: Optional[bool] = None, fx: Optional[str] = None) -> None:
@@ -602,13 +729,17 @@ class ResultCollection(dict):
         """
         if isinstance(batch, torch.Tensor):
             size = batch.size(0)
+        elif isinstance(batch, PackedSequence):
+            # the data of the sequences is packed along the first dimension, the first step holds all of them
+            size = int(batch.batch_sizes[0]) if len(batch.batch_sizes) else 0
         elif isinstance(batch, str):
             return len(batch)
         elif isinstance(batch, dict):
-            sample = next(iter(batch.values()), 1)
+            # skip the loaders which were not sampled by an alternating `CombinedLoader`
+            sample = next((v for v in batch.values() if v is not None), 1)
             size = self._extract_batch_size(sample)
         elif isinstance(batch, Iterable):
-            sample = next(iter(batch), 1)
+            sample = next((v for v in batch if v is not None), 1)
             size = self._extract_batch_size(sample)
         else:
             size = 1
@@ -638,6 +769,8 @@ class ResultCollection(dict):
 
     def __getstate__(self, drop_value: bool = True) -> dict:
         d = self.__dict__.copy()
+        # the cache holds the metadata, which is saved with the items
+        del d['_log_cache']
 
         # can't deepcopy tensors with grad_fn
         minimize = d['_minimize']
@@ -659,6 +792,7 @@ class ResultCollection(dict):
         sync_fn: Optional[Callable] = None,
     ) -> None:
         self.__dict__.update({k: v for k, v in state.items() if k != 'items'})
+        self._log_cache = {}
 
         def setstate(k: str, item: dict) -> Union[ResultMetric, ResultMetricCollection]:
             if not isinstance(item, dict):
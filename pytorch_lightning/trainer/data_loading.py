@@ -17,17 +17,22 @@ import os
 from abc import ABC
 from copy import deepcopy
 from functools import partial
-from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
 
-from torch.utils.data import BatchSampler, DataLoader, RandomSampler, SequentialSampler
+from torch.utils.data import BatchSampler, DataLoader, Dataset, RandomSampler, SequentialSampler
 from torch.utils.data.distributed import DistributedSampler
 
 import pytorch_lightning as pl
 from pytorch_lightning.accelerators import Accelerator
-from pytorch_lightning.overrides.distributed import IndexBatchSamplerWrapper, UnrepeatedDistributedSampler
+from pytorch_lightning.overrides.distributed import (
+    BucketBatchSampler,
+    DynamicBatchSampler,
+    IndexBatchSamplerWrapper,
+    UnrepeatedDistributedSampler,
+)
 from pytorch_lightning.trainer.connectors.accelerator_connector import AcceleratorConnector
 from pytorch_lightning.trainer.states import RunningStage
-from pytorch_lightning.trainer.supporters import CombinedLoader
+from pytorch_lightning.trainer.supporters import _leaf_loaders, CombinedLoader, CycleIterator, FastForwardSampler
 from pytorch_lightning.utilities import _TORCH_GREATER_EQUAL_1_6, rank_zero_warn
 from pytorch_lightning.utilities.apply_func import apply_to_collection
 from pytorch_lightning.utilities.data import has_iterable_dataset, has_len
@@ -111,6 +116,22 @@ class TrainerDataLoadingMixin(ABC):
         if int(os.environ.get("PL_SEED_WORKERS", 0)) and dataloader.worker_init_fn is None:
             dataloader.worker_init_fn = partial(pl_worker_init_function, rank=self.global_rank)
 
+    def auto_add_fast_forward_sampler(self, dataloader: Union[DataLoader, CombinedLoader]) -> None:
+        """Wraps the sampler of the dataloader to be able to resume an epoch from the middle, if it supports it."""
+        if isinstance(dataloader, CombinedLoader):
+            for loader in _leaf_loaders(dataloader.loaders):
+                loader = loader.loader if isinstance(loader, CycleIterator) else loader
+                if isinstance(loader, (DataLoader, CombinedLoader)):
+                    self.auto_add_fast_forward_sampler(loader)
+            return
+
+        batch_sampler = dataloader.batch_sampler
+        # custom batch samplers may not draw the indices of the batches from their `sampler`
+        if type(batch_sampler) is not BatchSampler or isinstance(batch_sampler.sampler, FastForwardSampler):
+            return
+        if FastForwardSampler.supports(batch_sampler.sampler):
+            batch_sampler.sampler = FastForwardSampler(batch_sampler.sampler, batch_sampler.batch_size)
+
     def auto_add_sampler(
         self, dataloader: DataLoader, shuffle: bool, mode: Optional[RunningStage] = None
     ) -> DataLoader:
@@ -126,9 +147,15 @@ class TrainerDataLoadingMixin(ABC):
         if not is_dataloader or is_iterable_ds:
             return dataloader
 
+        if shuffle and self.data_connector.bucket_length_key is not None:
+            # batch together the samples of similar lengths, in every process
+            batch_sampler = self._get_bucket_batch_sampler(dataloader)
+            return self.replace_sampler(dataloader, batch_sampler, mode=mode)
+
+        # the `BucketBatchSampler` splits the batches between the processes itself
         need_dist_sampler = self.accelerator_connector.is_distributed and not isinstance(
             dataloader.sampler, DistributedSampler
-        )
+        ) and not isinstance(dataloader.batch_sampler, BucketBatchSampler)
         if self.accelerator_connector.replace_sampler_ddp and need_dist_sampler:
             if not isinstance(dataloader.sampler, (SequentialSampler, RandomSampler)):
                 raise MisconfigurationException(
@@ -146,15 +173,34 @@ class TrainerDataLoadingMixin(ABC):
 
     @staticmethod
     def _resolve_batch_sampler(dl_args, dataloader, sampler, mode: Optional[RunningStage] = None) -> Dict[str, Any]:
+        if isinstance(sampler, BucketBatchSampler):
+            # the bucketing sampler replaces the batch sampler
+            dl_args['batch_sampler'] = sampler
+            dl_args['batch_size'] = 1
+            dl_args['shuffle'] = False
+            dl_args['sampler'] = None
+            dl_args['drop_last'] = False
+            return dl_args
+
         batch_sampler = getattr(dataloader, "batch_sampler")
         is_predicting = mode == RunningStage.PREDICTING
         # checking the batch sampler type is different than PyTorch default.
         if (batch_sampler is not None and type(batch_sampler) is not BatchSampler) or is_predicting:
-            batch_sampler = type(batch_sampler)(
-                sampler,
-                batch_size=batch_sampler.batch_size,
-                drop_last=(False if is_predicting else batch_sampler.drop_last),
-            )
+            if isinstance(batch_sampler, DynamicBatchSampler):
+                # pack the indices of the new sampler with the same token budget
+                batch_sampler = DynamicBatchSampler(
+                    sampler,
+                    batch_sampler.lengths,
+                    batch_sampler.max_tokens,
+                    max_batch_size=batch_sampler.max_batch_size,
+                    drop_last=(False if is_predicting else batch_sampler.drop_last),
+                )
+            else:
+                batch_sampler = type(batch_sampler)(
+                    sampler,
+                    batch_size=batch_sampler.batch_size,
+                    drop_last=(False if is_predicting else batch_sampler.drop_last),
+                )
             if is_predicting:
                 batch_sampler = IndexBatchSamplerWrapper(batch_sampler)
             dl_args['batch_sampler'] = batch_sampler
@@ -226,6 +272,45 @@ class TrainerDataLoadingMixin(ABC):
         sampler = cls(dataloader.dataset, **kwargs)
         return sampler
 
+    def _get_bucket_batch_sampler(self, dataloader: DataLoader) -> BucketBatchSampler:
+        if dataloader.batch_size is None or not isinstance(dataloader.sampler, (SequentialSampler, RandomSampler)):
+            raise MisconfigurationException(
+                'You seem to have configured a sampler or a batch sampler in your DataLoader. This will be replaced'
+                ' by `BucketBatchSampler` since `bucket_length_key` is set. Either remove the sampler and the batch'
+                ' sampler from your DataLoader or unset `bucket_length_key` if you want to use your custom sampler.'
+            )
+        lengths = self._get_bucket_lengths(dataloader.dataset)
+
+        kwargs = self.distributed_sampler_kwargs if self.accelerator_connector.is_distributed else None
+        kwargs = dict(kwargs or dict(num_replicas=1, rank=0))
+        return BucketBatchSampler(
+            lengths,
+            batch_size=dataloader.batch_size,
+            # like the distributed sampler, keep the order of a dataloader which does not shuffle
+            shuffle=isinstance(dataloader.sampler, RandomSampler) and not self.overfit_batches,
+            drop_last=dataloader.drop_last,
+            seed=int(os.getenv("PL_GLOBAL_SEED", 0)),
+            **kwargs,
+        )
+
+    def _get_bucket_lengths(self, dataset: Dataset) -> Sequence[int]:
+        """Returns the lengths of the samples of the dataset, read from the samples only the first time."""
+        key = self.data_connector.bucket_length_key
+        if not isinstance(key, str) and not callable(key):
+            if len(key) != len(dataset):
+                raise MisconfigurationException(
+                    f"`bucket_length_key` holds {len(key)} lengths but the train dataset has {len(dataset)} samples."
+                )
+            return key
+        cached_dataset, lengths = self.data_connector._bucket_lengths or (None, None)
+        if cached_dataset is not dataset:
+            if callable(key):
+                lengths = [key(dataset[i]) for i in range(len(dataset))]
+            else:
+                lengths = [len(dataset[i][key]) for i in range(len(dataset))]
+            self.data_connector._bucket_lengths = (dataset, lengths)
+        return lengths
+
     def reset_train_dataloader(self, model: 'pl.LightningModule') -> None:
         """Resets the train dataloader and initialises required variables
         (number of batches, when to validate, etc.).
@@ -259,6 +344,9 @@ class TrainerDataLoadingMixin(ABC):
         # add worker_init_fn for correct seeding in worker processes
         apply_to_collection(self.train_dataloader, DataLoader, self.auto_add_worker_init_fn)
 
+        # record the position of the samplers to resume from mid-epoch checkpoints
+        apply_to_collection(self.train_dataloader, (DataLoader, CombinedLoader), self.auto_add_fast_forward_sampler)
+
         # wrap the sequence of train loaders to a CombinedLoader object for computing the num_training_batches
         self.train_dataloader = CombinedLoader(self.train_dataloader, self.data_connector.multiple_trainloader_mode)
 
@@ -12,15 +12,22 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import itertools
 import os
+import queue
+import sys
+import threading
 from collections.abc import Iterable, Iterator, Mapping, Sequence
-from typing import Any, Callable, Generator, Optional, Tuple, Union
+from copy import copy
+from typing import Any, Callable, Dict, Generator, List, Optional, Tuple, Union
 
 import torch
 from torch import Tensor
 from torch.utils.data import Dataset
 from torch.utils.data.dataloader import DataLoader
 from torch.utils.data.dataset import IterableDataset
+from torch.utils.data.distributed import DistributedSampler
+from torch.utils.data.sampler import RandomSampler, Sampler, SequentialSampler
 
 from pytorch_lightning.utilities.apply_func import apply_to_collection
 from pytorch_lightning.utilities.cloud_io import get_filesystem
@@ -186,6 +193,8 @@ class CycleIterator(object):
         self.loader = loader
         self._loader_iter = None
         self.counter = 0
+        # the counter to start the next iteration from, when continuing an iteration
+        self._restored_counter = 0
 
     def __iter__(self) -> Any:
         """
@@ -195,7 +204,7 @@ class CycleIterator(object):
             CycleIterator: self
 
         """
-        self.counter = 0
+        self.counter, self._restored_counter = self._restored_counter, 0
         self._loader_iter = iter(self.loader)
         return self
 
@@ -229,11 +238,106 @@ class CycleIterator(object):
         return self.length
 
 
+class FastForwardSampler(Sampler):
+    """
+    Wraps the sampler of a :class:`~torch.utils.data.BatchSampler` to resume an epoch from the middle.
+
+    It records the random state of the sampler at the start of each pass over it. When the state of a pass is
+    restored, the next pass draws the same indices and skips the ones of the batches which were already
+    processed, without loading their data. The random state is drawn exactly as the sampler would draw it, and the
+    wrapped sampler is left untouched, so the passes which are not restored draw the same indices as without it.
+    """
+
+    def __init__(self, sampler: Sampler, batch_size: int):
+        """
+
+        Args:
+            sampler: the sampler to wrap, see :meth:`supports`.
+            batch_size: the batch size of the :class:`~torch.utils.data.BatchSampler`.
+
+        """
+        self.sampler = sampler
+        self.batch_size = batch_size
+        # the `RandomSampler` draws a new seed for each pass from the global random state when it has no generator
+        self._draw_seed = isinstance(sampler, RandomSampler) and sampler.generator is None
+        # the random states of the passes since the last `reset`
+        self._random_states: List[Dict[str, Any]] = []
+        self._restored_state: Optional[Dict[str, Any]] = None
+
+    @staticmethod
+    def supports(sampler: Sampler) -> bool:
+        """Whether the indices of a pass over the sampler can be drawn again from its random state."""
+        if isinstance(sampler, (SequentialSampler, DistributedSampler, RandomSampler)):
+            return True
+        return isinstance(getattr(sampler, "generator", None), torch.Generator)
+
+    def __len__(self) -> int:
+        return len(self.sampler)
+
+    def __iter__(self) -> Iterator:
+        restored, self._restored_state = self._restored_state, None
+        random_state = restored.get("random_state") if restored else None
+        if random_state is None:
+            random_state = self._get_random_state()
+        elif "generator" in random_state:
+            self.sampler.generator.set_state(random_state["generator"])
+        self._random_states.append(random_state)
+
+        sampler = self.sampler
+        if "seed" in random_state:
+            # a copy, the generator of the sampler of the user stays unset
+            sampler = copy(self.sampler)
+            sampler.generator = torch.Generator()
+            sampler.generator.manual_seed(random_state["seed"])
+        num_skipped = restored["num_batches"] * self.batch_size if restored else 0
+        yield from itertools.islice(sampler, num_skipped, None)
+
+    def _get_random_state(self) -> Dict[str, Any]:
+        if self._draw_seed:
+            # drawn when the pass starts, where the sampler would draw it
+            return {"seed": _draw_seed()}
+        generator = getattr(self.sampler, "generator", None)
+        if generator is not None:
+            return {"generator": generator.get_state()}
+        return {}
+
+    def reset(self) -> None:
+        """Forgets the random states of the previous passes, at the start of an epoch."""
+        self._random_states = []
+
+    def state_dict(self, pass_idx: int, num_batches: int) -> Dict[str, Any]:
+        """
+        Returns the state to continue a pass from.
+
+        Args:
+            pass_idx: the index of the pass since the last :meth:`reset`
+            num_batches: the number of batches of the pass which were processed
+
+        """
+        random_state = self._random_states[pass_idx] if pass_idx < len(self._random_states) else None
+        return {
+            "pass": pass_idx,
+            "num_batches": num_batches,
+            "random_state": random_state,
+        }
+
+    def load_state_dict(self, state_dict: Dict[str, Any]) -> None:
+        """Continues the pass of the state returned by :meth:`state_dict` on the next iteration."""
+        self._random_states = [{}] * state_dict["pass"]
+        self._restored_state = state_dict
+
+
 class CombinedDataset(object):
     """
     Combine multiple datasets and compute their statistics
     """
-    COMPUTE_FUNCS = {'min_size': min, 'max_size_cycle': max}
+    COMPUTE_FUNCS = {
+        'min_size': min,
+        'max_size_cycle': max,
+        'sequential': sum,
+        'round_robin': sum,
+        'weighted_random': sum,
+    }
 
     def __init__(self, datasets: Union[Sequence, Mapping], mode: str = 'min_size'):
         """
@@ -241,8 +345,9 @@ class CombinedDataset(object):
         Args:
             datasets: a sequence/mapping datasets. Can be a collections of torch.utils.Dataset,
                 Iterable or even None.
-            mode: whether to use the minimum number of batches in all samples or the maximum
-                number of batches in all samples.
+            mode: whether to use the minimum number of batches in all samples, the maximum
+                number of batches in all samples or, for the modes which sample from a single dataset at a time,
+                the total number of batches.
 
         """
         self.datasets = datasets
@@ -328,6 +433,11 @@ class CombinedLoader(object):
     StopIteration after the longest loader (the one with most batches) is done, while cycling
     through the shorter loaders.
 
+    The modes 'sequential', 'round_robin' and 'weighted_random' fetch a batch from a single loader at each step,
+    until all the loaders are exhausted. The returned batch keeps the structure of the loaders, with ``None``
+    for the loaders which were not sampled. 'sequential' goes through the loaders one after the other,
+    'round_robin' alternates between them and 'weighted_random' draws a loader at random at each step.
+
     Examples:
         >>> loaders = {'a': torch.utils.data.DataLoader(range(6), batch_size=4),
         ...            'b': torch.utils.data.DataLoader(range(15), batch_size=5)}
@@ -342,23 +452,63 @@ class CombinedLoader(object):
         ...     print(item)
         {'a': tensor([0, 1, 2, 3]), 'b': tensor([0, 1, 2, 3, 4])}
         {'a': tensor([4, 5]), 'b': tensor([5, 6, 7, 8, 9])}
+        >>> combined_loader = CombinedLoader(loaders, 'round_robin')
+        >>> for item in combined_loader:
+        ...     print(item)
+        {'a': tensor([0, 1, 2, 3]), 'b': None}
+        {'a': None, 'b': tensor([0, 1, 2, 3, 4])}
+        {'a': tensor([4, 5]), 'b': None}
+        {'a': None, 'b': tensor([5, 6, 7, 8, 9])}
+        {'a': None, 'b': tensor([10, 11, 12, 13, 14])}
 
     """
-    SUPPORTED_MODES = ('min_size', 'max_size_cycle')
-
-    def __init__(self, loaders: Any, mode: str = 'min_size'):
+    SUPPORTED_MODES = ('min_size', 'max_size_cycle', 'sequential', 'round_robin', 'weighted_random')
+    # the modes which fetch a batch from a single loader at each step
+    ALTERNATING_MODES = ('sequential', 'round_robin', 'weighted_random')
+
+    def __init__(
+        self,
+        loaders: Any,
+        mode: str = 'min_size',
+        weights: Optional[Union[Sequence, Mapping]] = None,
+        temperature: float = 1.0,
+        seed: Optional[int] = None,
+    ):
         """
 
         Args:
             loaders: the loaders to sample from. Can be all kind of collection
-            mode: the mode. Supported are 'min_size' which stops if the shortest loader is exhausted and
-                'max_size_cycle' which stops if the longest loader is exhausted and cycles through the smaller ones.
+            mode: the mode. Supported are 'min_size' which stops if the shortest loader is exhausted,
+                'max_size_cycle' which stops if the longest loader is exhausted and cycles through the smaller ones,
+                'sequential', which goes through the loaders one after the other, 'round_robin', which alternates
+                between the loaders, and 'weighted_random', which draws the loader of each batch at random.
+            weights: for the 'weighted_random' mode, the weight of each loader, in a collection with the same
+                structure as the top level of ``loaders``. Defaults to the number of batches of the loaders,
+                or uniform weights if any of them has no length.
+            temperature: for the 'weighted_random' mode, the sampling probabilities are proportional to
+                ``weights ** (1 / temperature)``. A higher temperature brings them closer to uniform.
+            seed: for the 'weighted_random' mode, the seed of the draws. Defaults to the seed set with
+                :func:`~pytorch_lightning.utilities.seed.seed_everything`, so all processes draw the same loaders.
 
         """
         if mode not in self.SUPPORTED_MODES:
             raise MisconfigurationException(f"Invalid Mode: {mode}")
+        if mode != 'weighted_random' and (weights is not None or seed is not None or temperature != 1.0):
+            raise MisconfigurationException(
+                "`weights`, `temperature` and `seed` are only supported in the 'weighted_random' mode."
+            )
+        if temperature <= 0:
+            raise MisconfigurationException(f"`temperature` should be > 0, got {temperature}.")
 
         self.loaders = loaders
+        self.weights = weights
+        self.temperature = temperature
+        self.seed = seed if seed is not None else int(os.environ.get("PL_GLOBAL_SEED", 0))
+        # the number of iterators created so far, so every epoch draws a different sequence of loaders
+        self._num_iters = 0
+        self._iterator = None
+        self._iterator_start_state = None
+        self._restored_state = None
 
         datasets = apply_to_collection(
             self.loaders, Iterable, getattr, 'dataset', None, wrong_dtype=(Sequence, Mapping)
@@ -394,32 +544,166 @@ class CombinedLoader(object):
                 self.loaders, Iterable, CycleIterator, length=length, wrong_dtype=(Sequence, Mapping)
             )
 
+    def __getstate__(self) -> Dict[str, Any]:
+        # the iterators of the `DataLoader`s cannot be pickled
+        state = self.__dict__.copy()
+        state["_iterator"] = None
+        return state
+
+    @property
+    def _alternates(self) -> bool:
+        return self.mode in self.ALTERNATING_MODES and isinstance(self.loaders, (Sequence, Mapping))
+
     def __iter__(self) -> Any:
         """
-        Create and return an iterator, `CombinedLoaderIterator`, for the combined loader.
+        Create and return an iterator, `CombinedLoaderIterator` or `AlternatingLoaderIterator`, for the combined
+        loader.
+        """
+        state, self._restored_state = self._restored_state, None
+        if state is None:
+            # a new epoch starts
+            for loader in _leaf_loaders(self.loaders):
+                sampler = _fast_forward_sampler(loader)
+                if sampler is not None:
+                    sampler.reset()
+
+        if not self._alternates:
+            num_batches = state["num_batches"] if state is not None else 0
+            if self.mode == 'max_size_cycle':
+                for loader in _leaf_loaders(self.loaders):
+                    if isinstance(loader, CycleIterator):
+                        loader._restored_counter = num_batches
+            self._iterator = CombinedLoaderIterator(self.loaders)
+            self._iterator.num_fetched = num_batches
+            self._iterator_start_state = state
+            return self._iterator
+
+        if state is not None:
+            self._num_iters = state["num_iters"]
+        else:
+            self._num_iters += 1
+
+        self._iterator = self._alternating_iterator(state)
+        self._iterator_start_state = state
+        return self._iterator
+
+    def _alternating_iterator(self, state: Optional[Dict[str, Any]]) -> 'AlternatingLoaderIterator':
+        generator = None
+        probabilities = None
+        if self.mode == 'weighted_random':
+            generator = torch.Generator()
+            generator.manual_seed(self.seed + self._num_iters)
+            probabilities = self._sampling_probabilities()
+        return AlternatingLoaderIterator(
+            self.loaders, self.mode, probabilities=probabilities, generator=generator, state=state
+        )
+
+    def _sampling_probabilities(self) -> List[float]:
+        """Returns the probability of drawing each of the top level loaders in the 'weighted_random' mode."""
+        keys = list(self.loaders.keys()) if isinstance(self.loaders, Mapping) else range(len(self.loaders))
+        if self.weights is not None:
+            if len(self.weights) != len(self.loaders):
+                raise MisconfigurationException(
+                    f"`weights` should have one entry per loader, got {len(self.weights)} for {len(self.loaders)}"
+                    " loaders."
+                )
+            weights = [float(self.weights[k]) for k in keys]
+        else:
+            weights = [float(_nested_calc_num_batches(self.loaders[k], min)) for k in keys]
+            if any(w == float('inf') for w in weights):
+                weights = [1.0] * len(weights)
+        if any(w < 0 for w in weights) or sum(weights) == 0:
+            raise MisconfigurationException(f"`weights` should be >= 0 and not all 0, got {weights}.")
+        weights = [w**(1 / self.temperature) for w in weights]
+        total = sum(weights)
+        return [w / total for w in weights]
+
+    def state_dict(self, num_batches: Optional[int] = None) -> Dict[str, Any]:
         """
-        return CombinedLoaderIterator(self.loaders)
+        Returns the state to continue the current iteration from with :meth:`load_state_dict`.
+
+        Args:
+            num_batches: the number of batches of the current iteration which were processed. Defaults to the number
+                of batches fetched from the current iterator, which is ahead when batches are prefetched.
+
+        Returns:
+            ``num_batches``, the position in the sequence of loaders for the modes which fetch a batch from a single
+            loader at each step and, in ``"samplers"``, the state of each loader which samples through a
+            :class:`FastForwardSampler` (``None`` for the others)
+
+        """
+        if self._iterator is None:
+            return {}
+        if num_batches is None:
+            num_batches = self._iterator.num_fetched
+
+        state = {"num_batches": num_batches}
+        if self._alternates:
+            # replay the sequence of loaders up to the processed batches
+            start_state = self._iterator_start_state
+            schedule = self._alternating_iterator(start_state)
+            schedule.advance(num_batches - (start_state["num_batches"] if start_state is not None else 0))
+            state.update(num_iters=self._num_iters, **schedule.state_dict())
+            # the nested loaders of a top level loader are fetched from together
+            positions = [(self.loaders[k], fetched) for k, fetched in zip(schedule.keys, state["fetched"])]
+        else:
+            positions = [(self.loaders, num_batches)]
+
+        samplers = []
+        for loaders, fetched in positions:
+            for loader in _leaf_loaders(loaders):
+                pass_idx, offset = 0, fetched
+                if isinstance(loader, CycleIterator):
+                    length = get_len(loader.loader)
+                    if length != float('inf'):
+                        pass_idx, offset = divmod(fetched, length)
+                    loader = loader.loader
+                samplers.append(_loader_state_dict(loader, pass_idx, offset))
+        state["samplers"] = samplers
+        return state
+
+    def load_state_dict(self, state_dict: Dict[str, Any]) -> None:
+        """
+        Restores the state returned by :meth:`state_dict`. The next iterator continues the iteration: it only fetches
+        the number of batches which were left in each loader and continues the draws of the 'weighted_random' mode.
+        The loaders which sample through a :class:`FastForwardSampler` skip the batches which were processed, the
+        others are iterated from their start.
+        """
+        self._restored_state = state_dict or None
+        if not state_dict:
+            return
+        loaders = _leaf_loaders(self.loaders)
+        for loader, loader_state in zip(loaders, state_dict.get("samplers", [])):
+            if loader_state is None:
+                continue
+            if isinstance(loader, CycleIterator):
+                loader = loader.loader
+            if isinstance(loader, CombinedLoader):
+                loader.load_state_dict(loader_state)
+            else:
+                _fast_forward_sampler(loader).load_state_dict(loader_state)
 
     @staticmethod
-    def _calc_num_batches(loaders: Any) -> Union[int, float]:
+    def _calc_num_batches(loaders: Any, mode: str = 'min_size') -> Union[int, float]:
         """
         Compute the length (aka the number of batches) of `CombinedLoader`.
 
         Args:
             loaders: a collections of loaders.
+            mode: the mode of the `CombinedLoader`.
 
         Returns:
-            length: the minimum length of loaders
+            length: the minimum length of loaders, or the total number of batches of the top level loaders for the
+                modes which fetch a batch from a single loader at each step
 
         """
-        all_lengths = apply_to_collection(loaders, Iterable, get_len, wrong_dtype=(Sequence, Mapping))
-
-        if isinstance(all_lengths, (int, float)):
-            return all_lengths
-        return _nested_calc_num_data(all_lengths, min)
+        if mode in CombinedLoader.ALTERNATING_MODES and isinstance(loaders, (Sequence, Mapping)):
+            values = loaders.values() if isinstance(loaders, Mapping) else loaders
+            return sum(_nested_calc_num_batches(loader, min) for loader in values)
+        return _nested_calc_num_batches(loaders, min)
 
     def __len__(self) -> int:
-        return self._calc_num_batches(self.loaders)
+        return self._calc_num_batches(self.loaders, self.mode)
 
 
 class CombinedLoaderIterator(object):
@@ -436,6 +720,8 @@ class CombinedLoaderIterator(object):
         """
         self.loaders = loaders
         self._loader_iters = None
+        # the number of batches fetched so far
+        self.num_fetched = 0
 
     @property
     def loader_iters(self) -> Any:
@@ -458,7 +744,9 @@ class CombinedLoaderIterator(object):
             a collections of batch data
 
         """
-        return self.request_next_batch(self.loader_iters)
+        batch = self.request_next_batch(self.loader_iters)
+        self.num_fetched += 1
+        return batch
 
     @staticmethod
     def request_next_batch(loader_iters: Union[Iterator, Sequence, Mapping]) -> Any:
@@ -492,6 +780,169 @@ class CombinedLoaderIterator(object):
         return apply_to_collection(loaders, Iterable, iter, wrong_dtype=(Sequence, Mapping))
 
 
+class AlternatingLoaderIterator(object):
+    """
+    Custom Iterator returning data from a single one of multiple loaders at each step
+    """
+
+    def __init__(
+        self,
+        loaders: Union[Sequence, Mapping],
+        mode: str,
+        probabilities: Optional[List[float]] = None,
+        generator: Optional[torch.Generator] = None,
+        state: Optional[Dict[str, Any]] = None,
+    ):
+        """
+
+        Args:
+            loaders: the top level collection of loaders. Nested collections of loaders are fetched from together,
+                as in the 'min_size' mode.
+            mode: one of 'sequential', 'round_robin' or 'weighted_random'.
+            probabilities: the probability of drawing each loader, for the 'weighted_random' mode.
+            generator: the generator of the draws, for the 'weighted_random' mode.
+            state: the state returned by :meth:`state_dict` to continue from.
+
+        """
+        self.loaders = loaders
+        self.mode = mode
+        self.keys = list(loaders.keys()) if isinstance(loaders, Mapping) else list(range(len(loaders)))
+        self.probabilities = probabilities
+        self.generator = generator
+
+        self.num_batches = [_nested_calc_num_batches(loaders[k], min) for k in self.keys]
+        # the number of batches fetched from each loader
+        self.fetched = [0] * len(self.keys)
+        # the position of the next loader for the 'sequential' and 'round_robin' modes
+        self.position = 0
+        if state is not None:
+            self.fetched = list(state["fetched"])
+            self.position = state["position"]
+            if generator is not None and state.get("generator") is not None:
+                generator.set_state(state["generator"])
+        self.exhausted = [fetched >= n for fetched, n in zip(self.fetched, self.num_batches)]
+        self._loader_iters = [None] * len(self.keys)
+
+    def __iter__(self) -> Any:
+        return self
+
+    def __next__(self) -> Any:
+        """
+        Fetches the next batch from the next of the loaders which are not exhausted
+
+        Returns:
+            a collection with the structure of the loaders, holding the batch of the selected loader and ``None``
+            for the other loaders
+
+        """
+        while not all(self.exhausted):
+            idx = self._select()
+            if self._loader_iters[idx] is None:
+                loader = self.loaders[self.keys[idx]]
+                self._loader_iters[idx] = (
+                    CombinedLoaderIterator(loader) if isinstance(loader, (Sequence, Mapping)) else iter(loader)
+                )
+            try:
+                batch = next(self._loader_iters[idx])
+            except StopIteration:
+                self.exhausted[idx] = True
+                continue
+
+            self._record(idx)
+            return self._collate(idx, batch)
+        raise StopIteration
+
+    @property
+    def num_fetched(self) -> int:
+        return sum(self.fetched)
+
+    def advance(self, num_batches: int) -> None:
+        """Advances the sequence of loaders by ``num_batches`` steps, without fetching the batches."""
+        for _ in range(num_batches):
+            if all(self.exhausted):
+                return
+            self._record(self._select())
+
+    def _record(self, idx: int) -> None:
+        self.fetched[idx] += 1
+        if self.fetched[idx] >= self.num_batches[idx]:
+            self.exhausted[idx] = True
+        if self.mode == 'round_robin':
+            self.position = idx + 1
+
+    def _select(self) -> int:
+        """Returns the index of the loader to fetch the next batch from."""
+        n = len(self.keys)
+        if self.mode == 'weighted_random':
+            probabilities = torch.tensor(
+                [0.0 if exhausted else p for p, exhausted in zip(self.probabilities, self.exhausted)],
+                dtype=torch.float64
+            )
+            if probabilities.sum() == 0:
+                # the remaining loaders have a weight of 0, they are fetched from uniformly
+                probabilities = torch.tensor([0.0 if exhausted else 1.0 for exhausted in self.exhausted])
+            return int(torch.multinomial(probabilities, 1, generator=self.generator))
+        if self.mode == 'sequential':
+            while self.exhausted[self.position]:
+                self.position += 1
+            return self.position
+        # round robin: the next loader which is not exhausted
+        for offset in range(n):
+            idx = (self.position + offset) % n
+            if not self.exhausted[idx]:
+                return idx
+
+    def _collate(self, idx: int, batch: Any) -> Union[Sequence, Mapping]:
+        if isinstance(self.loaders, Mapping):
+            return {k: batch if i == idx else None for i, k in enumerate(self.keys)}
+        return [batch if i == idx else None for i in range(len(self.keys))]
+
+    def state_dict(self) -> Dict[str, Any]:
+        return {
+            "fetched": list(self.fetched),
+            "position": self.position,
+            "generator": self.generator.get_state() if self.generator is not None else None,
+        }
+
+
+def _leaf_loaders(loaders: Any) -> List[Iterable]:
+    """Returns the loaders of a collection in traversal order."""
+    leaves = []
+    apply_to_collection(loaders, Iterable, leaves.append, wrong_dtype=(Sequence, Mapping))
+    return leaves
+
+
+def _draw_seed() -> int:
+    # the same draw as `RandomSampler.__iter__`
+    return int(torch.empty((), dtype=torch.int64).random_().item())
+
+
+def _fast_forward_sampler(loader: Iterable) -> Optional[FastForwardSampler]:
+    if isinstance(loader, CycleIterator):
+        loader = loader.loader
+    sampler = getattr(getattr(loader, "batch_sampler", None), "sampler", None)
+    return sampler if isinstance(sampler, FastForwardSampler) else None
+
+
+def _loader_state_dict(loader: Iterable, pass_idx: int, num_batches: int) -> Optional[Dict[str, Any]]:
+    """Returns the state to continue the iteration over a loader from, or ``None`` if it cannot be continued."""
+    if isinstance(loader, CombinedLoader):
+        state = loader.state_dict(num_batches) if pass_idx == 0 else {}
+        return state if state and all(s is not None for s in state["samplers"]) else None
+    sampler = _fast_forward_sampler(loader)
+    if sampler is None:
+        return None
+    return sampler.state_dict(pass_idx, num_batches)
+
+
+def _nested_calc_num_batches(loaders: Any, compute_func: Callable) -> Union[int, float]:
+    all_lengths = apply_to_collection(loaders, Iterable, get_len, wrong_dtype=(Sequence, Mapping))
+
+    if isinstance(all_lengths, (int, float)):
+        return all_lengths
+    return _nested_calc_num_data(all_lengths, compute_func)
+
+
 def _nested_calc_num_data(data: Union[Mapping, Sequence], compute_func: Callable):
 
     if isinstance(data, (float, int)):
@@ -534,3 +985,88 @@ def prefetch_iterator(iterable: Iterable) -> Generator[Tuple[Any, bool], None, N
         last = val
     # yield last, no longer has next
     yield last, True
+
+
+def transfer_prefetch_iterator(
+    iterable: Iterable,
+    transfer_fn: Callable[[Any], Any],
+    prefetch_batches: int,
+    device: Optional[torch.device] = None,
+) -> Generator[Tuple[Any, bool], None, None]:
+    """
+    Returns an iterator like :func:`prefetch_iterator`, whose items were passed through ``transfer_fn`` ahead of time.
+
+    A background thread fetches and transfers up to ``prefetch_batches`` items while the current one is processed.
+    On CUDA devices, the transfer runs on a side stream which the current stream waits for before the item is
+    returned. On devices other than CPU and CUDA, the items are transferred in the calling thread.
+
+    Args:
+        iterable: The iterable to fetch the items from, usually a :class:`~torch.utils.data.DataLoader`.
+        transfer_fn: Moves an item to the device, such as
+            :meth:`~pytorch_lightning.accelerators.accelerator.Accelerator.batch_to_device`.
+        prefetch_batches: The maximum number of items transferred ahead of the one being processed.
+        device: The device the items are transferred to.
+    """
+    if device is None or device.type not in ("cpu", "cuda"):
+        for item, is_last in prefetch_iterator(iterable):
+            yield transfer_fn(item), is_last
+        return
+
+    stream = torch.cuda.Stream(device) if device.type == "cuda" else None
+    iterator = prefetch_iterator(iterable)
+    items = queue.Queue()
+    slots = threading.Semaphore(prefetch_batches)
+    stop = threading.Event()
+
+    def fetch() -> None:
+        try:
+            while True:
+                slots.acquire()
+                if stop.is_set():
+                    return
+                try:
+                    item, is_last = next(iterator)
+                except StopIteration:
+                    items.put(None)
+                    return
+                if stream is None:
+                    items.put((transfer_fn(item), is_last, None))
+                    continue
+                with torch.cuda.stream(stream):
+                    item = transfer_fn(item)
+                    event = torch.cuda.Event()
+                    event.record(stream)
+                items.put((item, is_last, event))
+        except BaseException as error:
+            items.put(error)
+
+    thread = threading.Thread(target=fetch, name="BatchPrefetcher", daemon=True)
+    thread.start()
+    try:
+        while True:
+            entry = items.get()
+            if entry is None:
+                return
+            if isinstance(entry, BaseException):
+                raise entry
+            item, is_last, event = entry
+            if event is not None:
+                current_stream = torch.cuda.current_stream(device)
+                current_stream.wait_event(event)
+                # the memory was allocated on the side stream, it must not be reused while the current stream uses it
+                apply_to_collection(item, Tensor, _record_stream, current_stream)
+            slots.release()
+            yield item, is_last
+    finally:
+        stop.set()
+        slots.release()
+        # the hooks in ``transfer_fn`` must not run after the iteration ended. daemon threads do not finish
+        # when the interpreter shuts down
+        if not sys.is_finalizing():
+            thread.join()
+
+
+def _record_stream(tensor: Tensor, stream: torch.cuda.Stream) -> Tensor:
+    if tensor.is_cuda:
+        tensor.record_stream(stream)
+    return tensor
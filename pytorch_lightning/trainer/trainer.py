@@ -17,7 +17,7 @@ import traceback
 import warnings
 from datetime import timedelta
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional, Union
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Union
 from weakref import proxy
 
 import torch
@@ -157,7 +157,9 @@ class Trainer(
         distributed_backend: Optional[str] = None,
         move_metrics_to_cpu: bool = False,
         multiple_trainloader_mode: str = 'max_size_cycle',
-        stochastic_weight_avg: bool = False
+        stochastic_weight_avg: bool = False,
+        prefetch_batches: int = 0,
+        bucket_length_key: Optional[Union[str, Callable[[Any], int], Sequence[int]]] = None,
     ):
         r"""
         Customize every aspect of training via flags
@@ -289,7 +291,9 @@ class Trainer(
 
             resume_from_checkpoint: Path/URL of the checkpoint from which training is resumed. If there is
                 no checkpoint file at the path, start from scratch. If resuming from mid-epoch checkpoint,
-                training will start from the beginning of the next epoch.
+                training continues the epoch when the train dataloaders sample with a ``SequentialSampler``,
+                ``RandomSampler`` or ``DistributedSampler``, and starts from the beginning of the next epoch
+                otherwise.
 
             sync_batchnorm: Synchronize batch norm layers between process groups/whole world.
 
@@ -322,11 +326,24 @@ class Trainer(
             multiple_trainloader_mode: How to loop over the datasets when there are multiple train loaders.
                 In 'max_size_cycle' mode, the trainer ends one epoch when the largest dataset is traversed,
                 and smaller datasets reload when running out of their data. In 'min_size' mode, all the datasets
-                reload when reaching the minimum length of datasets.
+                reload when reaching the minimum length of datasets. In the 'sequential', 'round_robin' and
+                'weighted_random' modes, each batch comes from a single dataset, going through them one after
+                the other, alternating between them or drawing one at random, until all datasets are traversed.
 
             stochastic_weight_avg: Whether to use `Stochastic Weight Averaging (SWA)
                 <https://pytorch.org/blog/pytorch-1.6-now-includes-stochastic-weight-averaging/>_`
 
+            prefetch_batches: The number of batches which are fetched and moved to the device in a background thread
+                while the current batch is processed, in the training and evaluation loops. With the default ``0``,
+                each batch is moved to the device right before it is processed.
+
+            bucket_length_key: The key of the length of the samples of the train dataset, a function which
+                returns the length of a sample, or the lengths of the samples. When set, the train dataloaders batch
+                together the samples of similar lengths with a
+                :class:`~pytorch_lightning.overrides.distributed.BucketBatchSampler`, which is split between the
+                processes in distributed training. A string key reads ``len(sample[key])``. The lengths read from the
+                samples are computed once per dataset.
+
         """
         super().__init__()
         Trainer._log_api_event("init")
@@ -336,7 +353,7 @@ class Trainer(
         # init connectors
         self.dev_debugger = InternalDebugger(self)
         self.config_validator = ConfigValidator(self)
-        self.data_connector = DataConnector(self, multiple_trainloader_mode)
+        self.data_connector = DataConnector(self, multiple_trainloader_mode, prefetch_batches, bucket_length_key)
         self.optimizer_connector = OptimizerConnector(self)
 
         self.accelerator_connector = AcceleratorConnector(
@@ -514,8 +531,6 @@ class Trainer(
             model, train_dataloaders=train_dataloaders, val_dataloaders=val_dataloaders, datamodule=datamodule
         )
 
-        self.checkpoint_connector.resume_start()
-
         self._run(model)
 
         assert self.state.stopped
@@ -824,6 +839,9 @@ class Trainer(
         self.call_hook("on_before_accelerator_backend_setup", model)
         self.accelerator.connect(model)
         self.accelerator.setup_environment()
+        if self.state.fn == TrainerFn.FITTING:
+            # the processes are connected at this point, so the checkpoint can be loaded collectively
+            self.checkpoint_connector.resume_start()
         self._call_setup_hook(model)  # allow user to setup lightning_module in accelerator environment
 
         # restore modules after setup
@@ -13,12 +13,13 @@
 # limitations under the License.
 import dataclasses
 import operator
+import threading
 from abc import ABC
 from collections import OrderedDict
 from collections.abc import Mapping, Sequence
 from copy import copy
 from functools import partial
-from typing import Any, Callable, Optional, Union
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
 import numpy as np
 import torch
@@ -78,6 +79,9 @@ def apply_to_collection(
     """
     Recursively applies a function to all elements of a certain dtype.
 
+    Collections are flattened into their elements and a structure signature, from which they are rebuilt.
+    The kind of each node is cached per type, which skips the type checks of the recursive traversal.
+
     Args:
         data: the collection to apply the function to
         dtype: the given function will be applied to all elements of this dtype
@@ -95,13 +99,40 @@ def apply_to_collection(
     if isinstance(data, dtype) and (wrong_dtype is None or not isinstance(data, wrong_dtype)):
         return function(data, *args, **kwargs)
 
+    if include_none:
+        signature, leaves = _flatten(data, dtype, wrong_dtype)
+        if len(signature) == 1:
+            # data is neither of dtype, nor a collection
+            return data
+        return _unflatten(signature, leaves, function, args, kwargs)
+
+    return _apply_to_collection(
+        data, dtype, function, *args, wrong_dtype=wrong_dtype, include_none=include_none, **kwargs
+    )
+
+
+def _apply_to_collection(
+    data: Any,
+    dtype: Union[type, tuple],
+    function: Callable,
+    *args,
+    wrong_dtype: Optional[Union[type, tuple]] = None,
+    include_none: bool = True,
+    **kwargs
+) -> Any:
+    """The recursive implementation of :func:`apply_to_collection`, used with ``include_none=False``, where the
+    ``None`` outputs are dropped, so the structure of the output cannot be rebuilt from the one of the input"""
+    # Breaking condition
+    if isinstance(data, dtype) and (wrong_dtype is None or not isinstance(data, wrong_dtype)):
+        return function(data, *args, **kwargs)
+
     elem_type = type(data)
 
     # Recursively apply to collection items
     if isinstance(data, Mapping):
         out = []
         for k, v in data.items():
-            v = apply_to_collection(v, dtype, function, *args, wrong_dtype=wrong_dtype, **kwargs)
+            v = _apply_to_collection(v, dtype, function, *args, wrong_dtype=wrong_dtype, **kwargs)
             if include_none or v is not None:
                 out.append((k, v))
         return elem_type(OrderedDict(out))
@@ -111,7 +142,7 @@ def apply_to_collection(
     if is_namedtuple or is_sequence:
         out = []
         for d in data:
-            v = apply_to_collection(d, dtype, function, *args, wrong_dtype=wrong_dtype, **kwargs)
+            v = _apply_to_collection(d, dtype, function, *args, wrong_dtype=wrong_dtype, **kwargs)
             if include_none or v is not None:
                 out.append(v)
         return elem_type(*out) if is_namedtuple else elem_type(out)
@@ -119,7 +150,7 @@ def apply_to_collection(
     if _is_dataclass_instance(data):
         out = dict()
         for field in data.__dataclass_fields__:
-            v = apply_to_collection(getattr(data, field), dtype, function, *args, wrong_dtype=wrong_dtype, **kwargs)
+            v = _apply_to_collection(getattr(data, field), dtype, function, *args, wrong_dtype=wrong_dtype, **kwargs)
             if include_none or v is not None:
                 out[field] = v
         return elem_type(**out)
@@ -128,6 +159,90 @@ def apply_to_collection(
     return data
 
 
+# the kinds of nodes in a structure signature
+_APPLY, _KEEP, _MAPPING, _SEQUENCE, _NAMEDTUPLE, _DATACLASS = range(6)
+# the kinds of node per ``(type, dtype, wrong_dtype)``
+_NODE_KINDS: Dict[Tuple[type, Any, Any], int] = {}
+_MAX_CACHE_SIZE = 1024
+
+
+def _node_kind(data: Any, dtype: Union[type, tuple], wrong_dtype: Optional[Union[type, tuple]]) -> int:
+    # the same checks as in `_apply_to_collection`, they only depend on the type
+    if isinstance(data, dtype) and (wrong_dtype is None or not isinstance(data, wrong_dtype)):
+        kind = _APPLY
+    elif isinstance(data, Mapping):
+        kind = _MAPPING
+    elif _is_namedtuple(data):
+        kind = _NAMEDTUPLE
+    elif isinstance(data, Sequence) and not isinstance(data, str):
+        kind = _SEQUENCE
+    elif _is_dataclass_instance(data):
+        kind = _DATACLASS
+    else:
+        kind = _KEEP
+    if len(_NODE_KINDS) >= _MAX_CACHE_SIZE:
+        _NODE_KINDS.clear()
+    _NODE_KINDS[(type(data), dtype, wrong_dtype)] = kind
+    return kind
+
+
+def _flatten(data: Any, dtype: Union[type, tuple], wrong_dtype: Optional[Union[type, tuple]]) -> Tuple[list, list]:
+    """Returns the structure signature of ``data``, its nodes in pre-order, and the elements which are not
+    collections"""
+    signature, leaves = [], []
+    # performance: bind the lookups once, this runs for every node
+    append_node, append_leaf, node_kinds = signature.append, leaves.append, _NODE_KINDS
+
+    def visit(data: Any) -> None:
+        data_type = type(data)
+        kind = node_kinds.get((data_type, dtype, wrong_dtype))
+        if kind is None:
+            kind = _node_kind(data, dtype, wrong_dtype)
+        if kind == _APPLY or kind == _KEEP:
+            append_node(kind)
+            append_leaf(data)
+        elif kind == _MAPPING:
+            append_node((kind, data_type, tuple(data.keys())))
+            for v in data.values():
+                visit(v)
+        elif kind == _DATACLASS:
+            append_node((kind, data_type))
+            for field in data.__dataclass_fields__:
+                visit(getattr(data, field))
+        else:
+            append_node((kind, data_type, len(data)))
+            for v in data:
+                visit(v)
+
+    visit(data)
+    return signature, leaves
+
+
+def _unflatten(signature: list, leaves: list, function: Callable, args: tuple, kwargs: dict) -> Any:
+    """Rebuilds the collection of a structure signature from its leaves, applying ``function`` to the leaves of the
+    dtype"""
+    nodes, leaves = iter(signature), iter(leaves)
+
+    def build() -> Any:
+        node = next(nodes)
+        if node == _APPLY:
+            return function(next(leaves), *args, **kwargs)
+        if node == _KEEP:
+            return next(leaves)
+        kind, elem_type = node[:2]
+        if kind == _MAPPING:
+            items = [(k, build()) for k in node[2]]
+            return dict(items) if elem_type is dict else elem_type(OrderedDict(items))
+        if kind == _DATACLASS:
+            return elem_type(**{field: build() for field in elem_type.__dataclass_fields__})
+        items = [build() for _ in range(node[2])]
+        if kind == _NAMEDTUPLE:
+            return elem_type(*items)
+        return items if elem_type is list else elem_type(items)
+
+    return build()
+
+
 def apply_to_collections(
     data1: Optional[Any],
     data2: Optional[Any],
@@ -213,7 +328,7 @@ class TransferableDataType(ABC):
         return NotImplemented
 
 
-def move_data_to_device(batch: Any, device: torch.device):
+def move_data_to_device(batch: Any, device: torch.device, coalesce: bool = False):
     """
     Transfers a collection of data to the given device. Any object that defines a method
     ``to(device)`` will be moved and all other objects in the collection will be left untouched.
@@ -222,6 +337,9 @@ def move_data_to_device(batch: Any, device: torch.device):
         batch: A tensor or collection of tensors or anything that has a method `.to(...)`.
             See :func:`apply_to_collection` for a list of supported collection types.
         device: The device to which the data should be moved
+        coalesce: Whether to pack the tensors of the same dtype into one contiguous buffer, which is copied at once.
+            The buffer is pinned when copying to a GPU. This saves the overhead of many copies for batches with many
+            small tensors. The returned tensors are views of the buffer on the device.
 
     Return:
         the same collection but with all contained tensors residing on the new device.
@@ -230,6 +348,8 @@ def move_data_to_device(batch: Any, device: torch.device):
         - :meth:`torch.Tensor.to`
         - :class:`torch.device`
     """
+    if coalesce and device is not None:
+        batch = _move_tensors_coalesced(batch, torch.device(device))
 
     def batch_to(data):
         # try to move torchtext data first
@@ -251,6 +371,71 @@ def move_data_to_device(batch: Any, device: torch.device):
     return apply_to_collection(batch, dtype=dtype, function=batch_to)
 
 
+def _move_tensors_coalesced(batch: Any, device: torch.device) -> Any:
+    """Moves the tensors of a collection which can be coalesced, the others are returned as they are"""
+    groups: Dict[torch.dtype, List[torch.Tensor]] = {}
+
+    def can_coalesce(tensor: torch.Tensor) -> bool:
+        return (
+            tensor.device != device and tensor.device.type == "cpu" and tensor.layout == torch.strided
+            and not tensor.requires_grad
+        )
+
+    def collect(tensor: torch.Tensor) -> None:
+        if can_coalesce(tensor):
+            groups.setdefault(tensor.dtype, []).append(tensor)
+
+    apply_to_collection(batch, torch.Tensor, collect)
+    moved = {
+        dtype: iter(_transfer_coalesced(tensors, device))
+        for dtype, tensors in groups.items() if len(tensors) > 1
+    }
+
+    def replace(tensor: torch.Tensor) -> torch.Tensor:
+        if tensor.dtype in moved and can_coalesce(tensor):
+            return next(moved[tensor.dtype])
+        return tensor
+
+    # the collection is traversed in the same order again
+    return apply_to_collection(batch, torch.Tensor, replace)
+
+
+# the pinned buffers reused for the copies to the GPU, with the event recorded after their last copy
+_STAGING_BUFFERS: Dict[Tuple[torch.dtype, torch.device], Tuple[torch.Tensor, Optional[Any]]] = {}
+_STAGING_LOCK = threading.Lock()
+
+
+def _transfer_coalesced(tensors: List[torch.Tensor], device: torch.device) -> List[torch.Tensor]:
+    """Copies tensors of the same dtype to the device at once and returns views of the copy."""
+    numel = sum(t.numel() for t in tensors)
+    dtype = tensors[0].dtype
+    pin_memory = device.type == "cuda"
+    if not pin_memory:
+        staging = torch.cat([t.reshape(-1) for t in tensors])
+        device_buffer = staging.to(device)
+    else:
+        with _STAGING_LOCK:
+            buffer, event = _STAGING_BUFFERS.get((dtype, device), (None, None))
+            if event is not None:
+                # the previous copy out of the buffer has to finish before it is overwritten
+                event.synchronize()
+            if buffer is None or buffer.numel() < numel:
+                buffer = torch.empty(numel, dtype=dtype, pin_memory=True)
+            staging = buffer[:numel]
+            torch.cat([t.reshape(-1) for t in tensors], out=staging)
+            device_buffer = staging.to(device, non_blocking=True)
+            event = torch.cuda.Event()
+            event.record(torch.cuda.current_stream(device))
+            _STAGING_BUFFERS[(dtype, device)] = (buffer, event)
+
+    views = []
+    offset = 0
+    for tensor in tensors:
+        views.append(device_buffer[offset:offset + tensor.numel()].view(tensor.shape))
+        offset += tensor.numel()
+    return views
+
+
 def convert_to_tensors(data: Any, device: torch.device) -> Any:
     if device is None:
         raise MisconfigurationException("`torch.device` should be provided.")
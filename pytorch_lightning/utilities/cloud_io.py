@@ -13,26 +13,159 @@
 # limitations under the License.
 
 import io
+import os
+import pickle
+import queue
+import struct
+import threading
+import uuid
+import zipfile
 from pathlib import Path
-from typing import IO, Union
+from typing import Any, Dict, IO, Optional, Set, Union
 
 import fsspec
+import numpy as np
 import torch
 from fsspec.implementations.local import LocalFileSystem
 from packaging.version import Version
 
+import pytorch_lightning as pl
+from pytorch_lightning.utilities.apply_func import apply_to_collection
+from pytorch_lightning.utilities.incremental_checkpoint import (
+    INCREMENTAL_BASE_KEY,
+    is_incremental_checkpoint,
+    resolve_incremental_checkpoint,
+)
+from pytorch_lightning.utilities.warnings import rank_zero_warn
 
-def load(path_or_url: Union[str, IO, Path], map_location=None):
+
+def load(path_or_url: Union[str, IO, Path], map_location=None, mmap: bool = False):
+    """Loads a checkpoint from a local path, a URL or a file-like object.
+
+    Args:
+        path_or_url: The location of the checkpoint.
+        map_location: How to remap storage locations. The behaviour is the same as in :func:`torch.load`.
+        mmap: Whether to memory-map the tensors of local checkpoints instead of reading them into memory.
+            The data of a tensor is read from disk the first time it is accessed, so tensors which are never used
+            do not cost any I/O. Storages that ``map_location`` moves off the CPU are materialized right away.
+            Falls back to a regular load for remote files, checkpoints saved in the legacy (non-zip) format and on
+            Windows, and, with a warning, for checkpoints which cannot be memory-mapped, e.g. because they contain
+            quantized tensors.
+
+    Sharded checkpoint directories, as saved by :class:`~pytorch_lightning.plugins.DDPPlugin` with
+    ``sharded_checkpoint=True``, are loaded as a whole. The tensors which incremental checkpoints take from their base
+    checkpoint are loaded from the base.
+    """
+    checkpoint = _load(path_or_url, map_location=map_location, mmap=mmap)
+    if isinstance(path_or_url, (str, Path)) and is_incremental_checkpoint(checkpoint):
+        base_path = os.path.join(os.path.dirname(str(path_or_url)), checkpoint[INCREMENTAL_BASE_KEY])
+        base = load(base_path, map_location=map_location, mmap=mmap)
+        return resolve_incremental_checkpoint(checkpoint, base)
+    return checkpoint
+
+
+def _load(path_or_url: Union[str, IO, Path], map_location=None, mmap: bool = False):
     if not isinstance(path_or_url, (str, Path)):
         # any sort of BytesIO or similiar
         return torch.load(path_or_url, map_location=map_location)
     if str(path_or_url).startswith("http"):
         return torch.hub.load_state_dict_from_url(str(path_or_url), map_location=map_location)
     fs = get_filesystem(path_or_url)
+    if fs.isdir(path_or_url):
+        # avoids a circular import, the sharded checkpoints are written with `atomic_save`
+        from pytorch_lightning.utilities.sharded_checkpoint import (
+            _copy_state_dict_metadata,
+            is_sharded_checkpoint,
+            load_sharded_checkpoint,
+        )
+        if is_sharded_checkpoint(path_or_url):
+            restore_location = torch.serialization._get_restore_location(map_location)
+
+            def relocate(t: torch.Tensor) -> torch.Tensor:
+                storage = restore_location(t.storage(), "cpu")
+                return torch._utils._rebuild_tensor(storage, t.storage_offset(), t.size(), t.stride())
+
+            checkpoint = load_sharded_checkpoint(path_or_url, mmap=mmap)
+            relocated = apply_to_collection(checkpoint, torch.Tensor, relocate)
+            _copy_state_dict_metadata(checkpoint, relocated)
+            return relocated
+    if mmap and isinstance(fs, LocalFileSystem) and os.name != "nt":
+        filepath = fs._strip_protocol(str(path_or_url))
+        if zipfile.is_zipfile(filepath):
+            try:
+                return _load_memory_mapped(filepath, map_location=map_location)
+            except _MEMORY_MAP_ERRORS as err:
+                # e.g. quantized storages, which cannot be built as views into a buffer
+                rank_zero_warn(f"Could not memory-map {filepath}, loading it into memory instead: {err!r}")
     with fs.open(path_or_url, "rb") as f:
         return torch.load(f, map_location=map_location)
 
 
+# the errors of archives which `_load_memory_mapped` does not support, e.g. `NotImplementedError` for quantized storages
+_MEMORY_MAP_ERRORS = (RuntimeError, KeyError, struct.error, zipfile.BadZipFile, pickle.UnpicklingError)
+
+# integer types used to reinterpret the bytes of dtypes that NumPy does not support, e.g. ``torch.bfloat16``
+_NUMPY_INT_TYPES = {1: np.uint8, 2: np.int16, 4: np.int32, 8: np.int64}
+
+
+def _tensor_from_buffer(buffer: np.ndarray, dtype: torch.dtype) -> torch.Tensor:
+    empty = torch.empty(0, dtype=dtype)
+    try:
+        return torch.from_numpy(buffer.view(empty.numpy().dtype))
+    except TypeError:
+        return torch.from_numpy(buffer.view(_NUMPY_INT_TYPES[empty.element_size()])).view(dtype)
+
+
+class _Unpickler(pickle.Unpickler):
+
+    def find_class(self, mod_name: str, name: str) -> Any:
+        # the module was renamed in PyTorch 1.9: https://github.com/pytorch/pytorch/pull/51633
+        if mod_name == "torch.tensor" and hasattr(torch, "_tensor"):
+            mod_name = "torch._tensor"
+        return super().find_class(mod_name, name)
+
+
+def _load_memory_mapped(filepath: str, map_location=None) -> Any:
+    """Loads a checkpoint saved with the zipfile serialization of ``torch.save`` with memory-mapped storages.
+
+    The archive stores every storage uncompressed in its own record, so each storage becomes a view into a single
+    copy-on-write mapping of the file. The file itself is never modified.
+    """
+    record_offsets = {}
+    with zipfile.ZipFile(filepath) as zf, open(filepath, "rb") as f:
+        for info in zf.infolist():
+            if info.compress_type != zipfile.ZIP_STORED:
+                raise RuntimeError(f"Cannot memory-map the compressed record {info.filename} of {filepath}.")
+            # the record data follows the 30 bytes local file header, the file name and the extra field
+            f.seek(info.header_offset)
+            name_length, extra_length = struct.unpack("<HH", f.read(30)[26:30])
+            record_offsets[info.filename] = info.header_offset + 30 + name_length + extra_length
+        pickle_record = next((name for name in record_offsets if name.endswith("data.pkl")), None)
+        if pickle_record is None:
+            raise RuntimeError(f"{filepath} was not saved with the zipfile serialization of `torch.save`.")
+        prefix = pickle_record[:-len("data.pkl")]
+        pickle_bytes = zf.read(pickle_record)
+
+    buffer = np.memmap(filepath, dtype=np.uint8, mode="c")
+    restore_location = torch.serialization._get_restore_location(map_location)
+    storages = {}
+
+    def persistent_load(saved_id):
+        _, storage_type, key, location, numel = saved_id
+        if key not in storages:
+            dtype = storage_type(0).dtype
+            start = record_offsets[f"{prefix}data/{key}"]
+            end = start + numel * storage_type(0).element_size()
+            storage = _tensor_from_buffer(buffer[start:end], dtype).storage()
+            location = location.decode("ascii") if isinstance(location, bytes) else location
+            storages[key] = restore_location(storage, location)
+        return storages[key]
+
+    unpickler = _Unpickler(io.BytesIO(pickle_bytes))
+    unpickler.persistent_load = persistent_load
+    return unpickler.load()
+
+
 def get_filesystem(path: Union[str, Path]):
     path = str(path)
     if "://" in path:
@@ -45,6 +178,10 @@ def get_filesystem(path: Union[str, Path]):
 def atomic_save(checkpoint, filepath: str):
     """Saves a checkpoint atomically, avoiding the creation of incomplete checkpoints.
 
+    The checkpoint is streamed into a temporary file of a unique name next to ``filepath``, which is renamed once the
+    write succeeded and removed otherwise.
+    ``torch.save`` writes into the file directly, so no in-memory copy of the serialized checkpoint is made.
+
     Args:
         checkpoint: The object to save.
             Built to be used with the ``dump_checkpoint`` method, but can deal with anything which ``torch.save``
@@ -52,14 +189,119 @@ def atomic_save(checkpoint, filepath: str):
         filepath: The path to which the checkpoint will be saved.
             This points to the file that the checkpoint will be stored in.
     """
+    fs = get_filesystem(filepath)
+    filepath = fs._strip_protocol(str(filepath))
+    dirname, basename = os.path.split(filepath)
+    # unique, so that concurrent writers of the same file, e.g. several ranks on a shared filesystem, do not write into
+    # the same temporary file
+    tmp_path = os.path.join(dirname, f".{basename}.{uuid.uuid4().hex}.part")
+    try:
+        with fs.open(tmp_path, "wb") as f:
+            _torch_save(checkpoint, f)
+        if isinstance(fs, LocalFileSystem):
+            # `os.replace` also overwrites existing files on Windows
+            os.replace(tmp_path, filepath)
+        else:
+            fs.mv(tmp_path, filepath)
+    except BaseException:
+        if fs.exists(tmp_path):
+            fs.rm(tmp_path)
+        raise
 
-    bytesbuffer = io.BytesIO()
+
+def _torch_save(checkpoint, f: IO) -> None:
     # Can't use the new zipfile serialization for 1.6.0 because there's a bug in
     # torch.hub.load_state_dict_from_url() that prevents it from loading the new files.
     # More details can be found here: https://github.com/pytorch/pytorch/issues/42239
     if Version(torch.__version__).release[:3] == (1, 6, 0):
-        torch.save(checkpoint, bytesbuffer, _use_new_zipfile_serialization=False)
+        torch.save(checkpoint, f, _use_new_zipfile_serialization=False)
     else:
-        torch.save(checkpoint, bytesbuffer)
-    with fsspec.open(filepath, "wb") as f:
-        f.write(bytesbuffer.getvalue())
+        torch.save(checkpoint, f)
+
+
+class AsyncCheckpointWriter:
+    """Writes checkpoints from a background thread so the training loop does not block on serialization and I/O.
+
+    Calling :meth:`save` takes a CPU snapshot of every tensor in the checkpoint and puts it into a bounded queue.
+    A single worker thread drains the queue in order and writes each entry with :func:`atomic_save`.
+    When the queue is full, :meth:`save` blocks until the worker catches up, which bounds the host memory used
+    by snapshots to ``max_pending + 1`` checkpoints.
+
+    Args:
+        max_pending: The maximum number of checkpoints that can wait in the queue while another one is written.
+    """
+
+    def __init__(self, max_pending: int = 1) -> None:
+        if max_pending < 1:
+            raise ValueError(f"`max_pending` must be a positive integer, got {max_pending}.")
+        self._queue: queue.Queue = queue.Queue(maxsize=max_pending)
+        self._pending: Set[str] = set()
+        self._lock = threading.Lock()
+        self._error: Optional[BaseException] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def pending(self) -> Set[str]:
+        """The paths of the checkpoints that were submitted but are not yet written."""
+        with self._lock:
+            return set(self._pending)
+
+    def save(self, checkpoint: Dict[str, Any], filepath: str) -> None:
+        """Snapshots the checkpoint to CPU memory and schedules it to be written to ``filepath``."""
+        self._raise_if_failed()
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="AsyncCheckpointWriter", daemon=True)
+            self._thread.start()
+        # the training loop keeps updating the parameters in-place, so a copy is required even for CPU tensors
+        checkpoint = apply_to_collection(checkpoint, torch.Tensor, lambda t: t.detach().to("cpu", copy=True))
+        with self._lock:
+            self._pending.add(str(filepath))
+        self._queue.put((checkpoint, str(filepath)))
+
+    def wait(self) -> None:
+        """Blocks until all scheduled checkpoints are written and re-raises the first error of the worker, if any."""
+        if self._thread is not None:
+            self._queue.join()
+        self._raise_if_failed()
+
+    def close(self) -> None:
+        """Waits for the scheduled checkpoints and stops the worker thread."""
+        try:
+            self.wait()
+        finally:
+            if self._thread is not None:
+                self._queue.put(None)
+                self._thread.join()
+                self._thread = None
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                self._queue.task_done()
+                return
+            checkpoint, filepath = item
+            try:
+                if self._error is None:
+                    self._write(checkpoint, filepath)
+            except BaseException as err:
+                self._error = err
+            finally:
+                with self._lock:
+                    self._pending.discard(filepath)
+                self._queue.task_done()
+
+    @staticmethod
+    def _write(checkpoint: Dict[str, Any], filepath: str) -> None:
+        try:
+            atomic_save(checkpoint, filepath)
+        except AttributeError as err:
+            key = pl.LightningModule.CHECKPOINT_HYPER_PARAMS_KEY
+            checkpoint.pop(key, None)
+            rank_zero_warn(f'Warning, `{key}` dropped from checkpoint. An attribute is not picklable: {err}')
+            atomic_save(checkpoint, filepath)
+
+    def _raise_if_failed(self) -> None:
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise RuntimeError("The background checkpoint writer failed.") from error
@@ -0,0 +1,176 @@
+# Copyright The PyTorch Lightning team.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+On-disk cache of the preprocessed samples of a dataset::
+
+    cache_dir/
+        <fingerprint>/
+            0.pt
+            1.pt
+            ...
+
+Each sample is saved to its own file with :func:`~pytorch_lightning.utilities.cloud_io.atomic_save` and loaded back
+memory-mapped. The files of all the fingerprints of ``cache_dir`` share the size budget, the least recently used ones
+are evicted first: the modification time of a file is updated when it is read.
+"""
+import hashlib
+import json
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+from torch.utils.data import Dataset, IterableDataset
+
+from pytorch_lightning.utilities.cloud_io import atomic_save
+from pytorch_lightning.utilities.cloud_io import load as pl_load
+from pytorch_lightning.utilities.warnings import rank_zero_warn
+
+_SUFFIX = ".pt"
+
+
+def dataset_fingerprint(
+    dataset: Dataset,
+    config: Optional[Dict[str, Any]] = None,
+    fingerprint: Optional[str] = None,
+) -> str:
+    """Returns the key of the cache of a dataset, from its type, its length, its preprocessing config and an optional
+    fingerprint of its content.
+
+    Args:
+        dataset: the dataset
+        config: the configuration of the preprocessing, serializable to JSON
+        fingerprint: identifies the content of the dataset, such as a hash of its files
+    """
+    description = {
+        "type": f"{type(dataset).__module__}.{type(dataset).__qualname__}",
+        "length": len(dataset),
+        "config": config or {},
+        "fingerprint": fingerprint,
+    }
+    encoded = json.dumps(description, sort_keys=True, default=repr).encode()
+    return hashlib.sha1(encoded).hexdigest()[:16]
+
+
+class CachedDataset(Dataset):
+    """
+    Caches the samples of a map-style dataset on disk, to skip their preprocessing in the later epochs and runs.
+
+    The first access to a sample computes it with the wrapped dataset and saves it to ``cache_dir``, the following
+    ones load it back from its file, memory-mapped. The cache of a dataset is keyed by
+    :func:`dataset_fingerprint`, so changing the preprocessing ``config`` or the content ``fingerprint`` starts a new
+    cache. When the cached files exceed ``max_bytes``, the least recently used ones are evicted, across all the
+    datasets cached in ``cache_dir``. The processes and dataloader workers reading the same cache account their own
+    writes, so the budget is only approximately enforced.
+
+    Example::
+
+        def setup(self, stage):
+            dataset = TokenizedDataset(self.files, max_length=128)
+            self.train_set = CachedDataset(dataset, "data_cache", config={"max_length": 128}, max_bytes=10 * 2**30)
+
+    Args:
+        dataset: the map-style dataset, whose samples are anything :func:`torch.save` accepts
+        cache_dir: the directory of the cache, can be shared by several datasets
+        config: the configuration of the preprocessing, serializable to JSON
+        fingerprint: identifies the content of the dataset, such as a hash of its files or a version of the data.
+            Without it, a dataset is identified by its type and length only and a warning is raised: the cache would
+            return stale samples once the content changes but not the length.
+        max_bytes: the size budget of the files of ``cache_dir``, unlimited by default
+    """
+
+    def __init__(
+        self,
+        dataset: Dataset,
+        cache_dir: str,
+        config: Optional[Dict[str, Any]] = None,
+        fingerprint: Optional[str] = None,
+        max_bytes: Optional[int] = None,
+    ):
+        if isinstance(dataset, IterableDataset):
+            raise ValueError("`CachedDataset` only supports map-style datasets, got an `IterableDataset`.")
+        if fingerprint is None:
+            rank_zero_warn(
+                f"The cache of the `{type(dataset).__name__}` is only keyed by its type and length, it returns stale"
+                " samples if the content of the dataset changes but not its length. Pass a `fingerprint` identifying"
+                " the content, such as a hash of its files or a version of the data."
+            )
+        self.dataset = dataset
+        self.cache_dir = str(cache_dir)
+        self.fingerprint = dataset_fingerprint(dataset, config=config, fingerprint=fingerprint)
+        self.max_bytes = max_bytes
+        self._dirpath = os.path.join(self.cache_dir, self.fingerprint)
+        os.makedirs(self._dirpath, exist_ok=True)
+        self._size = sum(size for _, size, _ in _cached_files(self.cache_dir)) if max_bytes is not None else 0
+
+    def __len__(self) -> int:
+        return len(self.dataset)
+
+    def __getitem__(self, index: int) -> Any:
+        path = os.path.join(self._dirpath, f"{index}{_SUFFIX}")
+        try:
+            # marks the file as recently used
+            os.utime(path)
+            return pl_load(path, mmap=True)
+        except FileNotFoundError:
+            # not cached yet, or evicted
+            pass
+        except Exception:
+            # a truncated or corrupted file is a miss, it is replaced by the recomputed sample
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+        sample = self.dataset[index]
+        try:
+            atomic_save(sample, path)
+            size = os.path.getsize(path)
+        except OSError:
+            # the cache is an optimization, a failed write is a miss on the next access. The file can also be evicted
+            # by another process right after it was written
+            return sample
+        if self.max_bytes is not None:
+            self._size += size
+            if self._size > self.max_bytes:
+                self._evict()
+        return sample
+
+    def _evict(self) -> None:
+        """Removes the least recently used files until the cache fits in the budget."""
+        files = sorted(_cached_files(self.cache_dir))
+        self._size = sum(size for _, size, _ in files)
+        for _, size, path in files:
+            if self._size <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                # removed by another process
+                pass
+            self._size -= size
+
+
+def _cached_files(cache_dir: str) -> List[Tuple[float, int, str]]:
+    """Returns the modification time, the size and the path of the files of the cache."""
+    files = []
+    for dirpath, _, filenames in os.walk(cache_dir):
+        for filename in filenames:
+            if not filename.endswith(_SUFFIX) or filename.startswith("."):
+                continue
+            path = os.path.join(dirpath, filename)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+    return files
@@ -14,9 +14,10 @@
 
 import logging
 import os
+import weakref
 from functools import wraps
 from platform import python_version
-from typing import Any, Optional, Union
+from typing import Any, Callable, List, Optional, Union
 
 import torch
 from torch.nn.parallel.distributed import DistributedDataParallel
@@ -105,14 +106,58 @@ def rank_zero_info(*args, stacklevel: int = 4, **kwargs):
     _info(*args, stacklevel=stacklevel, **kwargs)
 
 
-def gather_all_tensors(result: Union[torch.Tensor], group: Optional[Any] = None):
+class CollectiveHandle:
+    """
+    The handle of a collective launched with ``async_op=True``. The collective runs in the background, so that the
+    caller can overlap it with computation, and :meth:`wait` blocks until it completed and returns its result.
+
+    Args:
+        work: the work or the :class:`torch.futures.Future` of the collective, ``None`` if no collective was launched
+        finalize: returns the result once the collective completed
+    """
+
+    def __init__(self, work: Optional[Any], finalize: Callable[[], Any]) -> None:
+        self._work = work
+        self._finalize = finalize
+        self._result = None
+        self._done = False
+
+    def is_completed(self) -> bool:
+        """Whether the collective completed, without blocking."""
+        if self._done or self._work is None:
+            return True
+        if isinstance(self._work, torch.futures.Future):
+            return self._work.done()
+        return self._work.is_completed()
+
+    def wait(self) -> Any:
+        """Waits for the collective to complete and returns its result."""
+        if not self._done:
+            if self._work is not None:
+                self._work.wait()
+            self._result = self._finalize()
+            self._done = True
+            self._work = self._finalize = None
+        return self._result
+
+
+def gather_all_tensors(
+    result: Union[torch.Tensor],
+    group: Optional[Any] = None,
+    async_op: bool = False,
+) -> Union[List[torch.Tensor], CollectiveHandle]:
     """
     Function to gather all tensors from several ddp processes onto a list that
     is broadcasted to all processes
 
+    The tensors can have different shapes on each process, as long as they have the same number of dimensions: the
+    shapes are exchanged first and the tensors padded to the largest one for the gather.
+
     Args:
         result: the value to sync
         group: the process group to gather results from. Defaults to all processes (world)
+        async_op: whether to return a :class:`CollectiveHandle` instead of waiting for the gather.
+            The shapes are still exchanged synchronously.
 
     Return:
         gathered_result: list with size equal to the process group where
@@ -123,16 +168,43 @@ def gather_all_tensors(result: Union[torch.Tensor], group: Optional[Any] = None)
 
     # convert tensors to contiguous format
     result = result.contiguous()
+    if result.ndim == 0:
+        return _all_gather(result, group, async_op)
 
     world_size = torch.distributed.get_world_size(group)
+    local_shape = torch.tensor(result.shape, dtype=torch.long, device=result.device)
+    shapes = [torch.empty_like(local_shape) for _ in range(world_size)]
+    torch.distributed.all_gather(shapes, local_shape, group=group)
+    shapes = torch.stack(shapes)
+    max_shape = shapes.max(dim=0).values
+    if bool((shapes == max_shape).all()):
+        return _all_gather(result, group, async_op)
 
-    gathered_result = [torch.zeros_like(result) for _ in range(world_size)]
+    padded = result.new_zeros(max_shape.tolist())
+    padded[tuple(slice(0, size) for size in result.shape)] = result
+    shapes = shapes.tolist()
 
-    # sync and broadcast all
-    torch.distributed.barrier(group=group)
-    torch.distributed.all_gather(gathered_result, result, group)
+    def unpad(gathered: List[torch.Tensor]) -> List[torch.Tensor]:
+        return [t[tuple(slice(0, size) for size in shape)] for t, shape in zip(gathered, shapes)]
 
-    return gathered_result
+    gathered = _all_gather(padded, group, async_op)
+    if async_op:
+        return CollectiveHandle(gathered, lambda: unpad(gathered.wait()))
+    return unpad(gathered)
+
+
+def _all_gather(
+    result: torch.Tensor,
+    group: Optional[Any] = None,
+    async_op: bool = False,
+) -> Union[List[torch.Tensor], CollectiveHandle]:
+    """Gathers tensors of the same shape on all processes."""
+    world_size = torch.distributed.get_world_size(group)
+    gathered = [torch.empty_like(result) for _ in range(world_size)]
+    work = torch.distributed.all_gather(gathered, result, group, async_op=async_op)
+    if async_op:
+        return CollectiveHandle(work, lambda: gathered)
+    return gathered
 
 
 def distributed_available() -> bool:
@@ -142,8 +214,9 @@ def distributed_available() -> bool:
 def sync_ddp_if_available(
     result: Union[torch.Tensor],
     group: Optional[Any] = None,
-    reduce_op: Optional[Union[ReduceOp, str]] = None
-) -> torch.Tensor:
+    reduce_op: Optional[Union[ReduceOp, str]] = None,
+    async_op: bool = False,
+) -> Union[torch.Tensor, CollectiveHandle]:
     """
     Function to reduce a tensor across worker processes during distributed training
     Args:
@@ -151,28 +224,36 @@ def sync_ddp_if_available(
         group: the process group to gather results from. Defaults to all processes (world)
         reduce_op: the reduction operation. Defaults to sum.
             Can also be a string of 'avg', 'mean' to calculate the mean during reduction.
+        async_op: whether to return a :class:`CollectiveHandle` instead of waiting for the reduction
 
     Return:
         reduced value
     """
     if distributed_available():
-        return sync_ddp(result, group=group, reduce_op=reduce_op)
+        return sync_ddp(result, group=group, reduce_op=reduce_op, async_op=async_op)
+    if async_op:
+        return CollectiveHandle(None, lambda: result)
     return result
 
 
 def sync_ddp(
     result: Union[torch.Tensor],
     group: Optional[Any] = None,
-    reduce_op: Optional[Union[ReduceOp, str]] = None
-) -> torch.Tensor:
+    reduce_op: Optional[Union[ReduceOp, str]] = None,
+    async_op: bool = False,
+) -> Union[torch.Tensor, CollectiveHandle]:
     """
     Function to reduce the tensors from several ddp processes to one master process
 
+    The reduction is done in-place. It synchronizes the processes by itself, so no barrier is needed before it.
+
     Args:
         result: the value to sync and reduce (typically tensor or number)
-        group: the process group to gather results from. Defaults to all processes (world)
+        group: the process group to gather results from. Defaults to all processes (world).
+            With :class:`HierarchicalGroups`, the reduction is hierarchical.
         reduce_op: the reduction operation. Defaults to sum.
             Can also be a string of 'avg', 'mean' to calculate the mean during reduction.
+        async_op: whether to return a :class:`CollectiveHandle` instead of waiting for the reduction
 
     Return:
         reduced value
@@ -187,16 +268,134 @@ def sync_ddp(
     if isinstance(reduce_op, str) and reduce_op.lower() in ("avg", "mean"):
         divide_by_world_size = True
 
-    # sync all processes before reduction
-    torch.distributed.barrier(group=group)
-    torch.distributed.all_reduce(result, op=op, group=group, async_op=False)
+    if isinstance(group, HierarchicalGroups):
+        work = group.all_reduce(result, op=op, async_op=async_op)
+        world_size = group.world_size
+    else:
+        work = torch.distributed.all_reduce(result, op=op, group=group, async_op=async_op)
+        world_size = torch.distributed.get_world_size(group)
+
+    def finalize() -> torch.Tensor:
+        if divide_by_world_size:
+            return result / world_size
+        return result
 
-    if divide_by_world_size:
-        result = result / torch.distributed.get_world_size(group)
+    if async_op:
+        return CollectiveHandle(work, finalize)
+    return finalize()
 
+
+class HierarchicalGroups:
+    """
+    The process groups of a hierarchical all-reduce, for clusters whose links within a node are faster than the
+    network between the nodes. Has to be created by all the processes, after the default process group.
+
+    :meth:`all_reduce` reduces the tensors of a node to its local rank 0 first, all-reduces them across these node
+    leaders and broadcasts the result back within each node. Only the node leaders communicate across the nodes, which
+    divides the network traffic by the number of processes per node.
+
+    With ``async_op=True``, each stage is launched asynchronously once the previous one completed, so that the
+    reductions of several tensors are pipelined. The stages of consecutive reductions are launched in the same order on
+    all the processes, the broadcasts using their own process group.
+
+    The global rank of a process is expected to be ``node_rank * processes_per_node + local_rank``.
+
+    Args:
+        num_nodes: the number of nodes
+        processes_per_node: the number of processes of every node
+        node_rank: the rank of the node of the current process
+        local_rank: the rank of the current process within its node
+    """
+
+    def __init__(self, num_nodes: int, processes_per_node: int, node_rank: int, local_rank: int) -> None:
+        self.world_size = num_nodes * processes_per_node
+        self.node_leader = node_rank * processes_per_node
+        self.is_node_leader = local_rank == 0
+        # all the processes take part in the creation of every group
+        self.node_group = self.broadcast_group = None
+        for node in range(num_nodes):
+            ranks = list(range(node * processes_per_node, (node + 1) * processes_per_node))
+            node_group = torch.distributed.new_group(ranks)
+            broadcast_group = torch.distributed.new_group(ranks)
+            if node == node_rank:
+                self.node_group, self.broadcast_group = node_group, broadcast_group
+        self.leader_group = torch.distributed.new_group(list(range(0, self.world_size, processes_per_node)))
+        # the last stages launched, which the next reduction waits for
+        self._all_reduced = self._broadcast = _completed_future()
+
+    def all_reduce(self, tensor: torch.Tensor, op: Optional[ReduceOp] = None, async_op: bool = False) -> Optional[Any]:
+        """
+        Reduces the tensor of all the processes in-place. With ``async_op=True``, returns a
+        :class:`torch.futures.Future` completed once the tensor is reduced.
+        """
+        op = op if op is not None else ReduceOp.SUM
+        reduced = torch.distributed.reduce(tensor, self.node_leader, op=op, group=self.node_group, async_op=True)
+        # the stages are launched from the threads of the process groups, which must not release the last reference
+        # to the groups: a process group cannot be destroyed by one of its own threads
+        groups = weakref.ref(self)
+        is_node_leader, node_leader = self.is_node_leader, self.node_leader
+
+        def all_reduce_leaders() -> Optional[Any]:
+            if is_node_leader:
+                return torch.distributed.all_reduce(tensor, op=op, group=groups().leader_group, async_op=True)
+
+        def broadcast() -> Any:
+            return torch.distributed.broadcast(tensor, node_leader, group=groups().broadcast_group, async_op=True)
+
+        self._all_reduced = _launch_after([reduced.get_future(), self._all_reduced], all_reduce_leaders)
+        self._broadcast = _launch_after([self._all_reduced, self._broadcast], broadcast)
+        if async_op:
+            return self._broadcast
+        self._broadcast.wait()
+
+
+def _completed_future() -> torch.futures.Future:
+    future = torch.futures.Future()
+    future.set_result(None)
+    return future
+
+
+def _launch_after(futures: List[torch.futures.Future], launch: Callable[[], Optional[Any]]) -> torch.futures.Future:
+    """
+    Launches an asynchronous collective with ``launch`` once all the ``futures`` completed, without blocking, and
+    returns a future completed with the collective.
+    """
+    result = torch.futures.Future()
+
+    def set_result(future: torch.futures.Future) -> None:
+        try:
+            future.wait()
+        except Exception as e:
+            result.set_exception(e)
+        else:
+            result.set_result(None)
+
+    def on_completed(future: torch.futures.Future) -> None:
+        try:
+            for f in future.wait():
+                f.wait()
+            work = launch()
+        except Exception as e:
+            result.set_exception(e)
+            return
+        if work is None:
+            result.set_result(None)
+        else:
+            work.get_future().then(set_result)
+
+    torch.futures.collect_all(futures).then(on_completed)
     return result
 
 
+def hierarchical_allreduce_hook(groups: HierarchicalGroups, bucket) -> torch.futures.Future:
+    """
+    DDP communication hook averaging the gradients with :meth:`HierarchicalGroups.all_reduce`, to register with
+    ``model.register_comm_hook(groups, hierarchical_allreduce_hook)``. Returns without waiting for the reduction.
+    """
+    tensor = bucket.get_tensor().div_(groups.world_size)
+    return groups.all_reduce(tensor, async_op=True).then(lambda fut: [tensor])
+
+
 class AllGatherGrad(torch.autograd.Function):
 
     @staticmethod
@@ -237,8 +436,7 @@ def all_gather_ddp_if_available(
     if distributed_available():
         if sync_grads:
             return AllGatherGrad.apply(tensor, group)
-        with torch.no_grad():
-            return AllGatherGrad.apply(tensor, group)
+        return torch.stack(_all_gather(tensor.contiguous(), group))
     return tensor
 
 
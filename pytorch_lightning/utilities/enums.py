@@ -28,6 +28,9 @@ class LightningEnum(str, Enum):
         return None
 
     def __eq__(self, other: Union[str, Enum]) -> bool:
+        if other is self:
+            # performance: skip the string conversions, this is called in hot paths such as `Trainer.training`
+            return True
         other = other.value if isinstance(other, Enum) else str(other)
         return self.value.lower() == other.lower()
 
@@ -0,0 +1,346 @@
+# Copyright The PyTorch Lightning team.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Gradient compression for :class:`~torch.nn.parallel.DistributedDataParallel`, implemented as DDP communication hooks
+whose state is saved with the checkpoints.
+
+The presets are selected by name with the ``gradient_compression`` argument of
+:class:`~pytorch_lightning.plugins.DDPPlugin` and :class:`~pytorch_lightning.plugins.DDPSpawnPlugin`:
+
+- ``"fp16"``: :class:`FP16Compression`, all-reduces the gradients in half precision
+- ``"powersgd"``: :class:`PowerSGDCompression`, all-reduces low-rank approximations of the gradients
+- ``"topk"``: :class:`TopKCompression`, all-gathers the largest gradients only
+
+The first iteration of a process always all-reduces the full gradients, as DDP rebuilds its gradient buckets after
+it, and so does every iteration before ``start_iter``.
+"""
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Optional, Union
+
+import torch
+from torch.nn.parallel import DistributedDataParallel
+
+from pytorch_lightning.utilities.exceptions import MisconfigurationException
+from pytorch_lightning.utilities.imports import _TORCH_GREATER_EQUAL_1_8, _TORCH_GREATER_EQUAL_1_9
+from pytorch_lightning.utilities.warnings import rank_zero_warn
+
+if _TORCH_GREATER_EQUAL_1_8 and torch.distributed.is_available():
+    from torch.distributed.algorithms.ddp_comm_hooks import default_hooks, powerSGD_hook
+
+
+class GradientCompression(ABC):
+    """
+    Base class of the gradient compressions, which compress the gradient buckets of
+    :class:`~torch.nn.parallel.DistributedDataParallel` before their communication.
+
+    Args:
+        start_iter: the number of iterations all-reducing the full gradients before the compression starts
+    """
+
+    def __init__(self, start_iter: int = 0) -> None:
+        if start_iter < 0:
+            raise MisconfigurationException(f"`start_iter` should be non-negative, got {start_iter}.")
+        self.start_iter = start_iter
+        # the number of gradient synchronizations, saved with the checkpoints
+        self.iteration = 0
+        self.process_group: Optional[Any] = None
+        # the number of gradient synchronizations of this process
+        self._local_iteration = 0
+        # the restored states of the buckets, loaded into the buckets of the same size on their first compression
+        self._pending_bucket_states: Dict[int, Dict[str, torch.Tensor]] = {}
+
+    def register(self, model: DistributedDataParallel, process_group: Optional[Any] = None) -> None:
+        """Registers the compression as the communication hook of the model."""
+        if not _TORCH_GREATER_EQUAL_1_8:
+            raise MisconfigurationException("Gradient compression requires PyTorch 1.8 or later.")
+        if not _TORCH_GREATER_EQUAL_1_9 and not next(model.parameters()).is_cuda:
+            raise MisconfigurationException("Gradient compression on CPU requires PyTorch 1.9 or later.")
+        # the buckets of the model are rebuilt after its first iteration, their states are loaded back then
+        self._pending_bucket_states.update(self._bucket_states())
+        self._local_iteration = 0
+        self.process_group = process_group
+        self._reset()
+        model.register_comm_hook(self, type(self)._comm_hook)
+
+    def _reset(self) -> None:
+        """Clears the states of the buckets, called when the compression is registered to a model."""
+
+    # not annotated, DDP compares the string annotations with the classes
+    def _comm_hook(self, bucket):
+        if self._local_iteration == 0 or self.iteration < self.start_iter:
+            future = default_hooks._allreduce_fut(self.process_group, bucket.get_tensor())
+        else:
+            index = bucket.get_index()
+            state = self._pending_bucket_states.pop(index, None)
+            if state is not None:
+                self._load_bucket_state(index, state, bucket.get_tensor())
+            future = self._compress(bucket)
+
+        if bucket.is_the_last_bucket_to_allreduce():
+            self.iteration += 1
+            self._local_iteration += 1
+        return future
+
+    @abstractmethod
+    def _compress(self, bucket: "torch.distributed.GradBucket") -> torch.futures.Future:
+        """Communicates the compressed bucket, returns the future of the averaged gradients."""
+
+    def _bucket_states(self) -> Dict[int, Dict[str, torch.Tensor]]:
+        """Returns the states of the buckets."""
+        return {}
+
+    def _load_bucket_state(self, index: int, state: Dict[str, torch.Tensor], tensor: torch.Tensor) -> None:
+        """Loads the state of a bucket, called before its first compression."""
+
+    def state_dict(self, error_feedback: bool = True) -> Dict[str, Any]:
+        """
+        Returns the state of the compression, on CPU.
+
+        Args:
+            error_feedback: whether to include the states of the buckets, specific to each process
+        """
+        state = {"iteration": self.iteration}
+        if error_feedback:
+            bucket_states = {**self._pending_bucket_states, **self._bucket_states()}
+            state["buckets"] = {
+                index: {k: v.detach().cpu() for k, v in bucket_state.items()}
+                for index, bucket_state in bucket_states.items()
+            }
+        return state
+
+    def load_state_dict(self, state_dict: Dict[str, Any], error_feedback: bool = True) -> None:
+        """
+        Loads the state of the compression.
+
+        Args:
+            state_dict: the state returned by :meth:`state_dict`
+            error_feedback: whether to load the error feedback of the buckets, which is only valid in the process
+                it was saved from
+        """
+        self.iteration = state_dict["iteration"]
+        bucket_states = state_dict.get("buckets", {})
+        if not error_feedback:
+            bucket_states = {
+                index: {k: v for k, v in bucket_state.items() if k != "error"}
+                for index, bucket_state in bucket_states.items()
+            }
+        self._pending_bucket_states = {index: state for index, state in bucket_states.items() if state}
+
+    def dump_checkpoint(self, rank: int, world_size: int) -> Dict[str, Any]:
+        """Returns the entry of the checkpoints of the process ``rank``."""
+        return {"rank": rank, "world_size": world_size, "state": self.state_dict()}
+
+    def restore_checkpoint(self, checkpoint_state: Dict[str, Any], rank: int, world_size: int) -> None:
+        """Restores the entry of a checkpoint. The error feedback is only restored in the process which saved it."""
+        if checkpoint_state["world_size"] != world_size:
+            rank_zero_warn(
+                f"The gradient compression state was saved with {checkpoint_state['world_size']} processes and is"
+                f" restored with {world_size}, the error feedback of the compression is reset."
+            )
+        same_process = checkpoint_state["rank"] == rank and checkpoint_state["world_size"] == world_size
+        self.load_state_dict(checkpoint_state["state"], error_feedback=same_process)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # the process group can't be pickled, as when the plugin is sent to the processes of ``ddp_spawn``
+        return {**self.__dict__, "process_group": None}
+
+
+class FP16Compression(GradientCompression):
+    """Casts the gradients to half precision for their all-reduce, which halves the communication."""
+
+    def _compress(self, bucket: "torch.distributed.GradBucket") -> torch.futures.Future:
+        return default_hooks.fp16_compress_hook(self.process_group, bucket)
+
+
+class PowerSGDCompression(GradientCompression):
+    """
+    All-reduces low-rank approximations of the gradients computed with PowerSGD, with error feedback,
+    see :func:`torch.distributed.algorithms.ddp_comm_hooks.powerSGD_hook.powerSGD_hook`.
+
+    Args:
+        matrix_approximation_rank: the rank of the approximations, the higher the more accurate
+        start_iter: the number of iterations all-reducing the full gradients before the compression starts
+        min_compression_rate: the buckets compressed less than this rate are all-reduced in full
+        use_error_feedback: whether to add the compression error of a step to the gradients of the next one
+        warm_start: whether to reuse the low-rank factors of the previous step
+        seed: the seed of the initialization of the low-rank factors, the same on all the processes
+    """
+
+    def __init__(
+        self,
+        matrix_approximation_rank: int = 1,
+        start_iter: int = 1000,
+        min_compression_rate: float = 2,
+        use_error_feedback: bool = True,
+        warm_start: bool = True,
+        seed: int = 0,
+    ) -> None:
+        super().__init__(start_iter=start_iter)
+        self.matrix_approximation_rank = matrix_approximation_rank
+        self.min_compression_rate = min_compression_rate
+        self.use_error_feedback = use_error_feedback
+        self.warm_start = warm_start
+        self.seed = seed
+        self._state: Optional["powerSGD_hook.PowerSGDState"] = None
+        # the state of the random generator of the low-rank factors, until the state is created
+        self._rng_state: Optional[tuple] = None
+
+    def _reset(self) -> None:
+        if self._state is not None:
+            self._rng_state = self._state.rng.get_state()
+        self._state = powerSGD_hook.PowerSGDState(
+            process_group=self.process_group,
+            matrix_approximation_rank=self.matrix_approximation_rank,
+            # the warm-up is handled by `GradientCompression`
+            start_powerSGD_iter=2,
+            min_compression_rate=self.min_compression_rate,
+            use_error_feedback=self.use_error_feedback,
+            warm_start=self.warm_start,
+            random_seed=self.seed,
+        )
+        self._state.iter = self._state.start_powerSGD_iter
+        if self._rng_state is not None:
+            self._state.rng.set_state(self._rng_state)
+            self._rng_state = None
+
+    def _compress(self, bucket: "torch.distributed.GradBucket") -> torch.futures.Future:
+        return powerSGD_hook.powerSGD_hook(self._state, bucket)
+
+    def _bucket_states(self) -> Dict[int, Dict[str, torch.Tensor]]:
+        if self._state is None:
+            return {}
+        states = {}
+        for name, memory in (
+            ("error", self._state.error_dict),
+            ("p", self._state.p_memory_dict),
+            ("q", self._state.q_memory_dict),
+        ):
+            for index, tensor in memory.items():
+                states.setdefault(index, {})[name] = tensor
+        return states
+
+    def _load_bucket_state(self, index: int, state: Dict[str, torch.Tensor], tensor: torch.Tensor) -> None:
+        if "error" in state and state["error"].numel() != tensor.numel():
+            # the buckets were laid out differently, the compression of this bucket starts over
+            return
+        for name, memory in (
+            ("error", self._state.error_dict),
+            ("p", self._state.p_memory_dict),
+            ("q", self._state.q_memory_dict),
+        ):
+            if name in state:
+                memory[index] = state[name].to(tensor.device)
+
+    def state_dict(self, error_feedback: bool = True) -> Dict[str, Any]:
+        state = super().state_dict(error_feedback=error_feedback)
+        rng_state = self._state.rng.get_state() if self._state is not None else self._rng_state
+        if rng_state is not None:
+            state["rng"] = rng_state
+        return state
+
+    def load_state_dict(self, state_dict: Dict[str, Any], error_feedback: bool = True) -> None:
+        super().load_state_dict(state_dict, error_feedback=error_feedback)
+        if "rng" not in state_dict:
+            return
+        if self._state is not None:
+            self._state.rng.set_state(state_dict["rng"])
+        else:
+            self._rng_state = state_dict["rng"]
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = super().__getstate__()
+        if self._state is not None:
+            state["_rng_state"] = self._state.rng.get_state()
+        return {**state, "_state": None}
+
+
+class TopKCompression(GradientCompression):
+    """
+    Sparsifies the gradients: every process sends the ``ratio`` of its gradients of the largest magnitude, the others
+    are kept as error feedback and added to the gradients of the next step.
+
+    Args:
+        ratio: the fraction of the gradients communicated
+        start_iter: the number of iterations all-reducing the full gradients before the compression starts
+    """
+
+    def __init__(self, ratio: float = 0.01, start_iter: int = 0) -> None:
+        super().__init__(start_iter=start_iter)
+        if not 0 < ratio <= 1:
+            raise MisconfigurationException(f"`ratio` should be in (0, 1], got {ratio}.")
+        self.ratio = ratio
+        self._error_dict: Dict[int, torch.Tensor] = {}
+
+    def _compress(self, bucket: "torch.distributed.GradBucket") -> torch.futures.Future:
+        group = self.process_group if self.process_group is not None else torch.distributed.group.WORLD
+        world_size = group.size()
+        tensor = bucket.get_tensor()
+        index = bucket.get_index()
+
+        # the gradients with the error of the previous step
+        error = self._error_dict.get(index)
+        if error is None or error.numel() != tensor.numel():
+            error = self._error_dict[index] = torch.zeros_like(tensor)
+        error.add_(tensor)
+        k = max(1, int(tensor.numel() * self.ratio))
+        indices = error.abs().topk(k, sorted=False).indices
+        values = error[indices]
+        # what is not sent is fed back
+        error[indices] = 0
+
+        gathered_values = [torch.empty_like(values) for _ in range(world_size)]
+        gathered_indices = [torch.empty_like(indices) for _ in range(world_size)]
+        futures = [
+            torch.distributed.all_gather(gathered_values, values, group=group, async_op=True).get_future(),
+            torch.distributed.all_gather(gathered_indices, indices, group=group, async_op=True).get_future(),
+        ]
+
+        def decompress(_: torch.futures.Future) -> list:
+            tensor.zero_()
+            for rank_values, rank_indices in zip(gathered_values, gathered_indices):
+                tensor.index_add_(0, rank_indices, rank_values)
+            return [tensor.div_(world_size)]
+
+        return torch.futures.collect_all(futures).then(decompress)
+
+    def _reset(self) -> None:
+        self._error_dict = {}
+
+    def _bucket_states(self) -> Dict[int, Dict[str, torch.Tensor]]:
+        return {index: {"error": error} for index, error in self._error_dict.items()}
+
+    def _load_bucket_state(self, index: int, state: Dict[str, torch.Tensor], tensor: torch.Tensor) -> None:
+        if state["error"].numel() == tensor.numel():
+            self._error_dict[index] = state["error"].to(tensor.device, tensor.dtype)
+
+
+_PRESETS = {
+    "fp16": FP16Compression,
+    "powersgd": PowerSGDCompression,
+    "topk": TopKCompression,
+}
+
+
+def get_gradient_compression(
+    gradient_compression: Optional[Union[str, GradientCompression]]
+) -> Optional[GradientCompression]:
+    """Returns the compression of a preset name, or the given compression."""
+    if gradient_compression is None or isinstance(gradient_compression, GradientCompression):
+        return gradient_compression
+    if gradient_compression not in _PRESETS:
+        raise MisconfigurationException(
+            f"`gradient_compression={gradient_compression!r}` is not supported,"
+            f" choose one of {list(_PRESETS)} or pass a `GradientCompression`."
+        )
+    return _PRESETS[gradient_compression]()
@@ -0,0 +1,144 @@
+# Copyright The PyTorch Lightning team.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Incremental checkpoints store only the tensors which changed since a base checkpoint.
+
+The base is a regular checkpoint. An incremental checkpoint is a regular checkpoint file too, but the tensors with
+the same content as in the base are replaced by references to their location in the base, and the relative path of
+the base is stored under ``INCREMENTAL_BASE_KEY``. :func:`~pytorch_lightning.utilities.cloud_io.load` resolves the
+references, so incremental checkpoints can be loaded like any other checkpoint.
+"""
+import copy
+import hashlib
+import os
+from collections.abc import Mapping
+from typing import Any, Callable, Dict, NamedTuple, Optional, Tuple, Union
+
+import numpy as np
+import torch
+
+INCREMENTAL_BASE_KEY = "incremental_checkpoint_base"
+
+_Path = Tuple[Union[str, int], ...]
+
+
+class _BaseTensorRef(NamedTuple):
+    """Takes the place of an unchanged tensor and holds the keys which lead to it in the base checkpoint."""
+    path: _Path
+
+
+def tensor_digest(tensor: torch.Tensor) -> str:
+    """Computes a hash of the dtype, shape and content of a tensor."""
+    tensor = tensor.detach().cpu().contiguous()
+    try:
+        array = tensor.numpy()
+    except TypeError:
+        # NumPy has no bfloat16, the bytes are hashed as integers of the same size
+        array = tensor.view(torch.int16).numpy()
+    digest = hashlib.blake2b(f"{tensor.dtype}{tuple(tensor.shape)}".encode())
+    digest.update(np.ascontiguousarray(array).reshape(-1).view(np.uint8))
+    return digest.hexdigest()
+
+
+class IncrementalCheckpointer:
+    """Turns checkpoints into incremental checkpoints against a base checkpoint.
+
+    Example::
+
+        checkpointer = IncrementalCheckpointer()
+        base_path = checkpointer.set_base(checkpoint, dirpath)
+        atomic_save(checkpoint, base_path)
+        ...
+        atomic_save(checkpointer.to_incremental(new_checkpoint, filepath), filepath)
+    """
+
+    def __init__(self) -> None:
+        self.base_path: Optional[str] = None
+        self._base_digests: Dict[_Path, str] = {}
+
+    def set_base(self, checkpoint: Dict[str, Any], dirpath: str) -> str:
+        """Records the tensors of the checkpoint and returns the path in ``dirpath`` to save it to as the base.
+
+        The file name is derived from the content of the tensors, so the bases of different runs sharing a directory
+        do not overwrite each other.
+        """
+        digests = {}
+
+        def record(tensor: torch.Tensor, path: _Path) -> torch.Tensor:
+            digests[path] = tensor_digest(tensor)
+            return tensor
+
+        _map_with_path(checkpoint, torch.Tensor, record)
+        name = hashlib.blake2b("".join(digests.values()).encode(), digest_size=8).hexdigest()
+        self.base_path = os.path.join(str(dirpath), f".base-{name}.ckpt")
+        self._base_digests = digests
+        return self.base_path
+
+    def reset(self) -> None:
+        """Forgets the base, the next checkpoint has to be saved as a new base."""
+        self.base_path = None
+        self._base_digests = {}
+
+    def to_incremental(self, checkpoint: Dict[str, Any], filepath: str) -> Dict[str, Any]:
+        """Replaces the tensors which did not change since the base with references.
+
+        Args:
+            checkpoint: dict containing model and trainer state
+            filepath: the path the incremental checkpoint is saved to. The base is referenced relative to it.
+        """
+        if self.base_path is None:
+            raise RuntimeError("A base has to be set before saving incremental checkpoints.")
+
+        def replace(tensor: torch.Tensor, path: _Path) -> Union[torch.Tensor, _BaseTensorRef]:
+            if self._base_digests.get(path) == tensor_digest(tensor):
+                return _BaseTensorRef(path)
+            return tensor
+
+        incremental = _map_with_path(checkpoint, torch.Tensor, replace)
+        incremental[INCREMENTAL_BASE_KEY] = os.path.relpath(self.base_path, os.path.dirname(str(filepath)))
+        return incremental
+
+
+def is_incremental_checkpoint(checkpoint: Any) -> bool:
+    """Checks whether a loaded checkpoint still holds references to its base checkpoint."""
+    return isinstance(checkpoint, Mapping) and INCREMENTAL_BASE_KEY in checkpoint
+
+
+def resolve_incremental_checkpoint(checkpoint: Dict[str, Any], base: Dict[str, Any]) -> Dict[str, Any]:
+    """Replaces the references of an incremental checkpoint with the tensors of the loaded base checkpoint."""
+
+    def resolve(ref: _BaseTensorRef, _: _Path) -> torch.Tensor:
+        tensor = base
+        for key in ref.path:
+            tensor = tensor[key]
+        return tensor
+
+    checkpoint = _map_with_path(checkpoint, _BaseTensorRef, resolve)
+    del checkpoint[INCREMENTAL_BASE_KEY]
+    return checkpoint
+
+
+def _map_with_path(data: Any, dtype: type, function: Callable[[Any, _Path], Any], path: _Path = ()) -> Any:
+    """Like :func:`~pytorch_lightning.utilities.apply_func.apply_to_collection`, but passes the keys leading to an
+    element and keeps the attributes of mappings, such as the ``_metadata`` of state dicts."""
+    if isinstance(data, dtype):
+        return function(data, path)
+    if isinstance(data, Mapping):
+        out = copy.copy(data)
+        for k, v in data.items():
+            out[k] = _map_with_path(v, dtype, function, path + (k, ))
+        return out
+    if isinstance(data, (list, tuple)) and not hasattr(data, "_fields"):
+        return type(data)(_map_with_path(v, dtype, function, path + (i, )) for i, v in enumerate(data))
+    return data
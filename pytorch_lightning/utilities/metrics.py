@@ -13,7 +13,7 @@
 # limitations under the License.
 """Helper functions to operate on metric values. """
 import numbers
-from typing import Any
+from typing import Any, Dict, Iterator, List, Tuple
 
 import torch
 
@@ -25,17 +25,32 @@ def metrics_to_scalars(metrics: Any) -> Any:
     """
     Recursively walk through a collection and convert single-item tensors to scalar values
 
+    The tensors are copied to the host in one transfer per device and dtype rather than one per tensor,
+    so a collection of metrics on the GPU synchronizes with the device only once.
+
     Raises:
         MisconfigurationException:
             If ``value`` contains multiple elements, hence preventing conversion to ``float``
     """
+    groups: Dict[Tuple[torch.device, torch.dtype], List[torch.Tensor]] = {}
 
-    def to_item(value: torch.Tensor) -> numbers.Number:
+    def collect(value: torch.Tensor) -> None:
         if value.numel() != 1:
             raise MisconfigurationException(
                 f"The metric `{value}` does not contain a single element"
                 f" thus it cannot be converted to float."
             )
-        return value.item()
+        groups.setdefault((value.device, value.dtype), []).append(value)
+
+    apply_to_collection(metrics, torch.Tensor, collect)
+    scalars: Dict[Tuple[torch.device, torch.dtype], Iterator[numbers.Number]] = {
+        key: iter(_to_scalars(tensors))
+        for key, tensors in groups.items()
+    }
+    # the collection is traversed in the same order again
+    return apply_to_collection(metrics, torch.Tensor, lambda value: next(scalars[(value.device, value.dtype)]))
+
 
-    return apply_to_collection(metrics, torch.Tensor, to_item)
+def _to_scalars(tensors: List[torch.Tensor]) -> List[numbers.Number]:
+    """Copies single-element tensors of the same device and dtype to the host in one transfer."""
+    return torch.stack([t.detach().reshape(()) for t in tensors]).tolist()
@@ -0,0 +1,219 @@
+# Copyright The PyTorch Lightning team.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Sharded checkpoints are directories holding a manifest and one shard file per rank::
+
+    epoch=0-step=99.ckpt/
+        manifest.pt
+        shard-00000-of-00002.pt
+        shard-00001-of-00002.pt
+
+The tensors of the checkpoint are split across the shards, so every rank writes a slice of the state in parallel.
+The manifest holds the rest of the checkpoint with references in place of the tensors. It is written last, a
+directory without a manifest is an incomplete checkpoint.
+"""
+import os
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+import torch
+import torch.distributed
+
+import pytorch_lightning as pl
+from pytorch_lightning.utilities.apply_func import apply_to_collection
+from pytorch_lightning.utilities.cloud_io import atomic_save, get_filesystem
+from pytorch_lightning.utilities.cloud_io import load as pl_load
+from pytorch_lightning.utilities.exceptions import MisconfigurationException
+from pytorch_lightning.utilities.warnings import rank_zero_warn
+
+_MANIFEST_NAME = "manifest.pt"
+_SHARD_NAME = "shard-{:05d}-of-{:05d}.pt"
+
+
+class _ShardedTensorRef(NamedTuple):
+    """Takes the place of a tensor in the manifest and points to its location in the shards."""
+    shard: int
+    index: int
+    shape: Tuple[int, ...]
+    dtype: torch.dtype
+
+
+def is_sharded_checkpoint(path: Union[str, os.PathLike]) -> bool:
+    """Checks whether the path points to a complete sharded checkpoint directory."""
+    fs = get_filesystem(path)
+    return fs.isdir(path) and fs.exists(os.path.join(path, _MANIFEST_NAME))
+
+
+def save_sharded_checkpoint(
+    checkpoint: Dict[str, Any],
+    dirpath: Union[str, os.PathLike],
+    rank: int,
+    world_size: int,
+    local_keys: Sequence[str] = (),
+) -> None:
+    """Saves the checkpoint as a directory with one shard per rank. Has to be called on all ranks.
+
+    The tensors are expected to be the same on all ranks. They are distributed across the shards so that each
+    rank writes about the same amount of bytes.
+
+    Args:
+        checkpoint: dict containing model and trainer state
+        dirpath: the directory to write the checkpoint to
+        rank: the global rank of the current process
+        world_size: the number of processes taking part in the save
+        local_keys: the entries of the checkpoint which differ across ranks, such as the partitioned optimizer
+            states of sharded training. Every rank writes its own version of them to its shard.
+    """
+    dirpath = str(dirpath)
+    fs = get_filesystem(dirpath)
+    manifest_path = os.path.join(dirpath, _MANIFEST_NAME)
+    if rank == 0:
+        fs.makedirs(dirpath, exist_ok=True)
+        if fs.exists(manifest_path):
+            # a previous checkpoint at the same location is invalidated before its shards get replaced
+            fs.rm(manifest_path)
+    _barrier(world_size)
+
+    shared = {k: v for k, v in checkpoint.items() if k not in local_keys}
+    tensors = _collect_tensors(shared)
+    refs = _partition(tensors, world_size)
+    shard = {
+        "tensors": [t for t, ref in zip(tensors, refs) if ref.shard == rank],
+        "local": {k: checkpoint[k] for k in local_keys if k in checkpoint},
+    }
+    atomic_save(shard, os.path.join(dirpath, _SHARD_NAME.format(rank, world_size)))
+    _barrier(world_size)
+
+    if rank == 0:
+        refs = iter(refs)
+        skeleton = apply_to_collection(shared, torch.Tensor, lambda _: next(refs))
+        _copy_state_dict_metadata(shared, skeleton)
+        manifest = {
+            "world_size": world_size,
+            "local_keys": [k for k in local_keys if k in checkpoint],
+            "checkpoint": skeleton,
+        }
+        try:
+            atomic_save(manifest, manifest_path)
+        except AttributeError as err:
+            key = pl.LightningModule.CHECKPOINT_HYPER_PARAMS_KEY
+            skeleton.pop(key, None)
+            rank_zero_warn(f'Warning, `{key}` dropped from checkpoint. An attribute is not picklable: {err}')
+            atomic_save(manifest, manifest_path)
+        _remove_stale_shards(dirpath, world_size)
+    _barrier(world_size)
+
+
+def load_sharded_checkpoint(
+    dirpath: Union[str, os.PathLike],
+    rank: int = 0,
+    world_size: int = 1,
+    device: Optional[torch.device] = None,
+    mmap: bool = False,
+) -> Dict[str, Any]:
+    """Loads a sharded checkpoint. Has to be called on all ranks if ``world_size > 1``.
+
+    Each rank reads only the shards it owns and receives the remaining tensors through broadcasts from their
+    owners, so the checkpoint can be restored with a different number of processes than it was saved with.
+    The entries saved per rank are loaded from the shard of the current rank.
+
+    Args:
+        dirpath: the directory of the sharded checkpoint
+        rank: the global rank of the current process
+        world_size: the number of processes taking part in the restore
+        device: the device to broadcast the tensors on. It has to be supported by the process group backend.
+            Defaults to the CPU.
+        mmap: whether to memory-map the shards, see :func:`~pytorch_lightning.utilities.cloud_io.load`
+
+    Raises:
+        MisconfigurationException:
+            If the checkpoint holds entries saved per rank and ``world_size`` differs from the one it was saved with.
+    """
+    dirpath = str(dirpath)
+    device = device or torch.device("cpu")
+    manifest = pl_load(os.path.join(dirpath, _MANIFEST_NAME))
+    saved_world_size = manifest["world_size"]
+    local_keys = manifest["local_keys"]
+    if local_keys and world_size > 1 and world_size != saved_world_size:
+        raise MisconfigurationException(
+            f"The checkpoint entries {local_keys} were saved per rank with {saved_world_size} processes"
+            f" and cannot be restored with {world_size} processes."
+        )
+
+    shards = {}
+    for shard in range(saved_world_size):
+        needs_local = local_keys and shard == (rank if world_size > 1 else 0)
+        if shard % world_size == rank or needs_local:
+            shard_path = os.path.join(dirpath, _SHARD_NAME.format(shard, saved_world_size))
+            shards[shard] = pl_load(shard_path, map_location=(lambda storage, loc: storage), mmap=mmap)
+
+    def restore(ref: _ShardedTensorRef) -> torch.Tensor:
+        owner = ref.shard % world_size
+        if owner == rank:
+            tensor = shards[ref.shard]["tensors"][ref.index]
+        else:
+            tensor = torch.empty(ref.shape, dtype=ref.dtype, device=device)
+        if world_size > 1:
+            tensor = tensor.to(device).contiguous()
+            torch.distributed.broadcast(tensor, src=owner)
+        return tensor
+
+    checkpoint = apply_to_collection(manifest["checkpoint"], _ShardedTensorRef, restore)
+    _copy_state_dict_metadata(manifest["checkpoint"], checkpoint)
+    if local_keys:
+        checkpoint.update(shards[rank if world_size > 1 else 0]["local"])
+    return checkpoint
+
+
+def _collect_tensors(data: Any) -> List[torch.Tensor]:
+    tensors = []
+    apply_to_collection(data, torch.Tensor, tensors.append)
+    return tensors
+
+
+def _partition(tensors: List[torch.Tensor], num_shards: int) -> List[_ShardedTensorRef]:
+    """Assigns the largest tensors first, each to the shard with the fewest bytes so far."""
+    sizes = [t.numel() * t.element_size() for t in tensors]
+    loads = [0] * num_shards
+    counts = [0] * num_shards
+    assignment = [0] * len(tensors)
+    for i in sorted(range(len(tensors)), key=lambda i: (-sizes[i], i)):
+        shard = min(range(num_shards), key=lambda s: (loads[s], s))
+        loads[shard] += sizes[i]
+        assignment[i] = shard
+    refs = []
+    # within a shard, the tensors are stored in the order they appear in the checkpoint
+    for tensor, shard in zip(tensors, assignment):
+        refs.append(_ShardedTensorRef(shard, counts[shard], tuple(tensor.shape), tensor.dtype))
+        counts[shard] += 1
+    return refs
+
+
+def _copy_state_dict_metadata(src: Dict[str, Any], dst: Dict[str, Any]) -> None:
+    # `apply_to_collection` drops the version metadata which `Module.load_state_dict` relies on
+    metadata = getattr(src.get("state_dict"), "_metadata", None)
+    if metadata is not None:
+        dst["state_dict"]._metadata = metadata
+
+
+def _remove_stale_shards(dirpath: str, world_size: int) -> None:
+    fs = get_filesystem(dirpath)
+    current = {_SHARD_NAME.format(rank, world_size) for rank in range(world_size)} | {_MANIFEST_NAME}
+    for path in fs.ls(dirpath, detail=False):
+        if os.path.basename(path) not in current:
+            fs.rm(path)
+
+
+def _barrier(world_size: int) -> None:
+    if world_size > 1:
+        torch.distributed.barrier()
@@ -0,0 +1,190 @@
+# Copyright The PyTorch Lightning team.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Node-local shared memory for the in-memory datasets of distributed training.
+
+With ``ddp``, the process of local rank 0 writes the tensors and NumPy arrays of the data to a directory of
+``/dev/shm``, the other processes of the node map the files instead of loading their own copy::
+
+    /dev/shm/pytorch_lightning-<master port>-<name>/
+        index.pkl
+        0.bin
+        1.npy
+
+The index holds the data with references in place of the arrays. It is written last, after which all the processes
+map the files, and the directory is removed: the memory is released once the last process drops the data.
+
+In a single process, as in the main process of ``ddp_spawn``, the arrays are moved to torch shared memory instead, so
+that the spawned processes receive them without a copy.
+"""
+import os
+import pickle
+import shutil
+from typing import Any, Callable, NamedTuple, Optional, Tuple
+
+import numpy as np
+import torch
+import torch.distributed
+
+from pytorch_lightning.utilities.apply_func import apply_to_collection
+
+_INDEX_NAME = "index.pkl"
+
+
+class _SharedArrayRef(NamedTuple):
+    """Takes the place of a tensor or array in the index and points to its file."""
+    filename: str
+    shape: Tuple[int, ...]
+    dtype: Any
+    is_tensor: bool
+
+
+class _SharedNumpyArray(np.ndarray):
+    """A NumPy view of a shared tensor, which pickles as the shared tensor rather than by value."""
+
+    _tensor: Optional[torch.Tensor] = None
+
+    def __reduce__(self) -> Any:
+        if self._tensor is None:
+            # a view created from this array, which owns no tensor
+            return np.asarray(self).__reduce__()
+        return _numpy_from_tensor, (self._tensor, )
+
+
+def _numpy_from_tensor(tensor: torch.Tensor) -> np.ndarray:
+    array = tensor.numpy().view(_SharedNumpyArray)
+    array._tensor = tensor
+    return array
+
+
+def shared_memory_dir(name: str, root: str = "/dev/shm") -> str:
+    """The directory in which the data of ``name`` is shared, unique to a training job on the node."""
+    return os.path.join(root, f"pytorch_lightning-{os.environ.get('MASTER_PORT', '')}-{name}")
+
+
+def load_shared(
+    fn: Callable[[], Any],
+    name: str,
+    local_rank: int,
+    barrier: Callable[[], None],
+    root: str = "/dev/shm",
+) -> Any:
+    """Loads the data returned by ``fn`` once per node and shares its tensors and NumPy arrays between the processes
+    of the node, without a copy. Has to be called by all the processes.
+
+    When the default process group is initialized, the process of local rank 0 calls ``fn`` and the other processes
+    map the tensors and arrays it wrote to ``root``. Otherwise, ``fn`` is called and its tensors and arrays are moved
+    to shared memory, for the processes spawned later on.
+
+    The shared tensors and arrays are writable and the writes are seen by all the processes of the node. The other
+    objects of the data are copied to every process.
+
+    Args:
+        fn: returns the data, a collection of tensors, NumPy arrays and other objects
+        name: the name of the data, unique to the data shared in the training job
+        local_rank: the rank of the current process on its node
+        barrier: synchronizes all the processes
+        root: the directory of the shared memory files
+    """
+    if not (torch.distributed.is_available() and torch.distributed.is_initialized()):
+        return _to_shared_memory(fn())
+
+    dirpath = shared_memory_dir(name, root=root)
+    if local_rank == 0:
+        # the directory of a job which did not complete
+        shutil.rmtree(dirpath, ignore_errors=True)
+        _write(fn(), dirpath)
+    barrier()
+
+    data = _attach(dirpath)
+    # all the processes mapped the files, which are released with the last mapping
+    barrier()
+    if local_rank == 0:
+        shutil.rmtree(dirpath, ignore_errors=True)
+    return data
+
+
+def _to_shared_memory(data: Any) -> Any:
+
+    def share_tensor(tensor: torch.Tensor) -> torch.Tensor:
+        return tensor.detach().cpu().share_memory_()
+
+    def share_array(array: np.ndarray) -> np.ndarray:
+        if array.dtype.hasobject:
+            return array
+        return _numpy_from_tensor(torch.from_numpy(np.ascontiguousarray(array)).clone().share_memory_())
+
+    data = apply_to_collection(data, torch.Tensor, share_tensor)
+    return apply_to_collection(data, np.ndarray, share_array)
+
+
+def _write(data: Any, dirpath: str) -> None:
+    os.makedirs(dirpath)
+    count = 0
+
+    def write_tensor(tensor: torch.Tensor) -> _SharedArrayRef:
+        nonlocal count
+        tensor = tensor.detach().cpu().contiguous()
+        filename = f"{count}.bin"
+        count += 1
+        path = os.path.join(dirpath, filename)
+        with open(path, "wb") as f:
+            f.truncate(tensor.numel() * tensor.element_size())
+        if tensor.numel():
+            _map_tensor(path, tensor.shape, tensor.dtype).copy_(tensor)
+        return _SharedArrayRef(filename, tuple(tensor.shape), tensor.dtype, True)
+
+    def write_array(array: np.ndarray) -> Any:
+        nonlocal count
+        if array.dtype.hasobject:
+            # the python objects cannot be mapped, they are pickled in the index
+            return array
+        filename = f"{count}.npy"
+        count += 1
+        path = os.path.join(dirpath, filename)
+        mapped = np.lib.format.open_memmap(path, mode="w+", dtype=array.dtype, shape=array.shape)
+        mapped[...] = array
+        mapped.flush()
+        return _SharedArrayRef(filename, array.shape, array.dtype, False)
+
+    data = apply_to_collection(data, torch.Tensor, write_tensor)
+    data = apply_to_collection(data, np.ndarray, write_array)
+    # the index is written last, under a temporary name
+    tmp_path = os.path.join(dirpath, _INDEX_NAME + ".tmp")
+    with open(tmp_path, "wb") as f:
+        pickle.dump(data, f)
+    os.replace(tmp_path, os.path.join(dirpath, _INDEX_NAME))
+
+
+def _attach(dirpath: str) -> Any:
+    with open(os.path.join(dirpath, _INDEX_NAME), "rb") as f:
+        data = pickle.load(f)
+
+    def attach(ref: _SharedArrayRef) -> Any:
+        path = os.path.join(dirpath, ref.filename)
+        if not ref.is_tensor:
+            return np.load(path, mmap_mode="r+")
+        if not np.prod(ref.shape, dtype=np.int64):
+            return torch.empty(ref.shape, dtype=ref.dtype)
+        return _map_tensor(path, ref.shape, ref.dtype)
+
+    return apply_to_collection(data, _SharedArrayRef, attach)
+
+
+def _map_tensor(path: str, shape: Tuple[int, ...], dtype: torch.dtype) -> torch.Tensor:
+    numel = int(np.prod(shape, dtype=np.int64))
+    storage_type = torch.empty(0, dtype=dtype).storage_type()
+    # a shared mapping, the writes reach the file and the other processes
+    storage = storage_type.from_file(path, True, numel)
+    return torch.empty(0, dtype=dtype).set_(storage).view(shape)
@@ -160,3 +160,26 @@ def test_plugin_on_reset_dataloader_hooks(tmpdir):
     assert plugin.val_count == 1
     assert plugin.test_count == 1
     assert plugin.predict_count == 1
+
+
+def test_accelerator_coalesce_batch_transfer():
+    """Test that the batch transfer of the accelerator can be coalesced, unless the hook is overridden."""
+
+    class CustomModel(BoringModel):
+
+        def transfer_batch_to_device(self, batch, device, dataloader_idx):
+            return [batch[0] * 2]
+
+    device = torch.device("meta")
+    accelerator = CPUAccelerator(PrecisionPlugin(), SingleDevicePlugin(device), coalesce_batch_transfer=True)
+    batch = [torch.rand(2), torch.rand(3)]
+
+    accelerator.connect(BoringModel())
+    moved = accelerator.batch_to_device(batch, device)
+    assert all(t.device == device for t in moved)
+    assert moved[0]._base is moved[1]._base is not None
+
+    accelerator.connect(CustomModel())
+    moved = accelerator.batch_to_device(batch, torch.device("cpu"))
+    assert len(moved) == 1
+    assert torch.equal(moved[0], batch[0] * 2)
@@ -35,8 +35,9 @@ from torch import optim
 import pytorch_lightning as pl
 import tests.helpers.utils as tutils
 from pytorch_lightning import seed_everything, Trainer
-from pytorch_lightning.callbacks import ModelCheckpoint
+from pytorch_lightning.callbacks import BaseFinetuning, ModelCheckpoint
 from pytorch_lightning.loggers import TensorBoardLogger
+from pytorch_lightning.utilities.cloud_io import AsyncCheckpointWriter
 from pytorch_lightning.utilities.cloud_io import load as pl_load
 from pytorch_lightning.utilities.exceptions import MisconfigurationException
 from tests.helpers import BoringModel
@@ -1322,3 +1323,168 @@ def test_trainer_checkpoint_callback_bool(tmpdir):
     mc = ModelCheckpoint(dirpath=tmpdir)
     with pytest.raises(MisconfigurationException, match="Invalid type provided for checkpoint_callback"):
         Trainer(checkpoint_callback=mc)
+
+
+@pytest.mark.parametrize("save_top_k", [1, 2, -1])
+def test_model_checkpoint_save_async(tmpdir, save_top_k):
+    """ Test that the background writer produces the same checkpoints as the synchronous save. """
+
+    def run(dirpath, save_async):
+        seed_everything(1)
+        model = LogInTwoMethods()
+        mc = ModelCheckpoint(
+            dirpath=dirpath, monitor="early_stop_on", save_top_k=save_top_k, save_last=True, save_async=save_async
+        )
+        trainer = Trainer(
+            default_root_dir=tmpdir,
+            callbacks=[mc],
+            max_epochs=4,
+            limit_train_batches=2,
+            limit_val_batches=1,
+            logger=False,
+            weights_summary=None,
+            progress_bar_refresh_rate=0,
+        )
+        trainer.fit(model)
+        # the writer is released on teardown
+        assert mc._checkpoint_writer is None
+        return mc
+
+    sync_mc = run(tmpdir / "sync", save_async=False)
+    async_mc = run(tmpdir / "async", save_async=True)
+
+    assert sorted(os.listdir(tmpdir / "sync")) == sorted(os.listdir(tmpdir / "async"))
+    assert Path(sync_mc.best_model_path).name == Path(async_mc.best_model_path).name
+    for name in os.listdir(tmpdir / "sync"):
+        sync_ckpt = pl_load(str(tmpdir / "sync" / name))
+        async_ckpt = pl_load(str(tmpdir / "async" / name))
+        assert sync_ckpt["global_step"] == async_ckpt["global_step"]
+        for k, v in sync_ckpt["state_dict"].items():
+            torch.testing.assert_allclose(v, async_ckpt["state_dict"][k])
+
+
+@pytest.mark.parametrize(["save_async", "save_incremental"], [(True, False), (False, True)])
+def test_model_checkpoint_save_async_through_plugin(tmpdir, save_async, save_incremental):
+    """ Test that the background and incremental saves go through the connector and the training type plugin. """
+    mc = ModelCheckpoint(dirpath=tmpdir, save_top_k=-1, save_async=save_async, save_incremental=save_incremental)
+    trainer = Trainer(
+        default_root_dir=tmpdir,
+        callbacks=[mc],
+        max_epochs=2,
+        limit_train_batches=1,
+        limit_val_batches=0,
+        logger=False,
+        weights_summary=None,
+        progress_bar_refresh_rate=0,
+    )
+    connector, plugin = trainer.checkpoint_connector, trainer.training_type_plugin
+    with mock.patch.object(connector, "save_checkpoint", wraps=connector.save_checkpoint) as connector_save, \
+            mock.patch.object(plugin, "save_checkpoint", wraps=plugin.save_checkpoint) as plugin_save:
+        trainer.fit(BoringModel())
+    assert connector_save.call_count == plugin_save.call_count == 2
+    assert all(kwargs["writer"] is not None for _, kwargs in plugin_save.call_args_list)
+    assert "state_dict" in pl_load(str(tmpdir / "epoch=1-step=1.ckpt"))
+
+
+@pytest.mark.parametrize("save_async", [False, True])
+def test_model_checkpoint_save_incremental_on_save_once(tmpdir, save_async):
+    """ Test that the training type plugin post-processes each incremental checkpoint once. """
+    mc = ModelCheckpoint(dirpath=tmpdir, save_top_k=-1, save_async=save_async, save_incremental=True)
+    trainer = Trainer(
+        default_root_dir=tmpdir,
+        callbacks=[mc],
+        max_epochs=3,
+        limit_train_batches=1,
+        limit_val_batches=0,
+        logger=False,
+        weights_summary=None,
+        progress_bar_refresh_rate=0,
+    )
+    plugin = trainer.training_type_plugin
+    with mock.patch.object(plugin, "on_save", wraps=plugin.on_save) as on_save:
+        trainer.fit(BoringModel())
+    assert on_save.call_count == 3
+
+
+def test_model_checkpoint_save_async_custom_save_function(tmpdir):
+    """ Test that a custom `save_function` is used as is by the background saves. """
+    mc = ModelCheckpoint(dirpath=tmpdir, save_async=True)
+    trainer = Trainer(default_root_dir=tmpdir, callbacks=[mc], fast_dev_run=1, logger=False)
+    trainer.fit(BoringModel())
+    save_function = Mock()
+    mc._save_function = save_function
+    with pytest.warns(UserWarning, match="do not apply to a custom `save_function`"):
+        mc._save_model(trainer, str(tmpdir / "custom.ckpt"))
+    save_function.assert_called_once_with(str(tmpdir / "custom.ckpt"), False)
+
+
+def test_async_checkpoint_writer(tmpdir):
+    """ Test that the writer snapshots tensors on submission and reports errors of the worker thread. """
+    writer = AsyncCheckpointWriter()
+    tensor = torch.zeros(2)
+    filepath = str(tmpdir / "a.ckpt")
+    writer.save({"tensor": tensor}, filepath)
+    tensor.add_(1)
+    writer.wait()
+    assert not writer.pending
+    assert torch.equal(torch.load(filepath)["tensor"], torch.zeros(2))
+
+    with mock.patch("pytorch_lightning.utilities.cloud_io.atomic_save", side_effect=OSError("disk full")):
+        writer.save({"tensor": tensor}, str(tmpdir / "b.ckpt"))
+        with pytest.raises(RuntimeError, match="background checkpoint writer failed"):
+            writer.wait()
+    writer.close()
+    assert not os.path.exists(tmpdir / "b.ckpt")
+
+
+@pytest.mark.parametrize("save_async", [False, True])
+def test_model_checkpoint_save_incremental(tmpdir, save_async):
+    """ Test that incremental checkpoints store only the trained parameters and load like full checkpoints. """
+
+    class FrozenBackboneModel(BoringModel):
+
+        def __init__(self):
+            super().__init__()
+            self.backbone = torch.nn.Linear(32, 256)
+            BaseFinetuning.freeze(self.backbone)
+            self.layer = torch.nn.Linear(256, 2)
+
+        def forward(self, x):
+            return self.layer(self.backbone(x))
+
+        def configure_optimizers(self):
+            return torch.optim.Adam(self.layer.parameters(), lr=0.1)
+
+    def run(dirpath, save_incremental):
+        seed_everything(1)
+        mc = ModelCheckpoint(dirpath=dirpath, save_top_k=-1, save_async=save_async, save_incremental=save_incremental)
+        trainer = Trainer(
+            default_root_dir=tmpdir,
+            callbacks=[mc],
+            max_epochs=3,
+            limit_train_batches=2,
+            limit_val_batches=0,
+            logger=False,
+            weights_summary=None,
+            progress_bar_refresh_rate=0,
+        )
+        trainer.fit(FrozenBackboneModel())
+
+    run(tmpdir / "full", save_incremental=False)
+    run(tmpdir / "incremental", save_incremental=True)
+
+    names = sorted(os.listdir(tmpdir / "full"))
+    assert len(names) == 3
+    base_names = [name for name in os.listdir(tmpdir / "incremental") if name.startswith(".base-")]
+    assert len(base_names) == 1
+    assert sorted(os.listdir(tmpdir / "incremental")) == sorted(names + base_names)
+    for name in names:
+        full_path, incremental_path = str(tmpdir / "full" / name), str(tmpdir / "incremental" / name)
+        # the frozen backbone is only stored in the base
+        assert os.path.getsize(incremental_path) < 0.25 * os.path.getsize(full_path)
+        full_ckpt, incremental_ckpt = pl_load(full_path), pl_load(incremental_path)
+        assert incremental_ckpt.keys() == full_ckpt.keys()
+        for k, v in full_ckpt["state_dict"].items():
+            assert torch.equal(v, incremental_ckpt["state_dict"][k])
+        for k, v in full_ckpt["optimizer_states"][0]["state"].items():
+            assert torch.equal(v["exp_avg"], incremental_ckpt["optimizer_states"][0]["state"][k]["exp_avg"])
@@ -19,10 +19,12 @@ from unittest.mock import call, PropertyMock
 
 import pytest
 import torch
+from torch.utils.data import TensorDataset
 
 from pytorch_lightning import LightningDataModule, Trainer
 from pytorch_lightning.callbacks import ModelCheckpoint
 from pytorch_lightning.utilities.model_helpers import is_overridden
+from pytorch_lightning.utilities.data_cache import CachedDataset
 from tests.helpers import BoringDataModule, BoringModel
 from tests.helpers.datamodules import ClassifDataModule
 from tests.helpers.runif import RunIf
@@ -551,3 +553,68 @@ def test_dm_init_from_datasets_dataloaders(iterable):
             call(test_dss[0], batch_size=4, shuffle=False, num_workers=0, pin_memory=True),
             call(test_dss[1], batch_size=4, shuffle=False, num_workers=0, pin_memory=True)
         ])
+
+
+def test_dm_init_from_datasets_cache(tmpdir):
+    ds = DummyDS()
+    dm = LightningDataModule.from_datasets(ds, val_dataset=DummyIDS(), cache_dir=tmpdir, cache_fingerprint="v1")
+    cached = dm.train_dataloader().dataset
+    assert isinstance(cached, CachedDataset)
+    assert cached.dataset is ds
+    assert cached.cache_dir == str(tmpdir)
+    # iterable datasets are not cached
+    assert isinstance(dm.val_dataloader().dataset, DummyIDS)
+
+    with pytest.warns(UserWarning, match="only keyed by its type and length"):
+        LightningDataModule.from_datasets(ds, cache_dir=tmpdir).train_dataloader()
+
+
+def test_dm_init_from_datasets_cache_equal_lengths(tmpdir):
+    """Test that the datasets of the same type and length do not share their cache"""
+    train_ds = TensorDataset(torch.zeros(4, 2))
+    val_dss = [TensorDataset(torch.ones(4, 2)), TensorDataset(torch.full((4, 2), 2.))]
+    dm = LightningDataModule.from_datasets(
+        train_ds, val_dataset=val_dss, batch_size=4, cache_dir=tmpdir, cache_fingerprint="v1"
+    )
+    for _ in range(2):
+        (train_batch, ) = next(iter(dm.train_dataloader()))
+        val_batches = [next(iter(loader))[0] for loader in dm.val_dataloader()]
+        assert torch.equal(train_batch, torch.zeros(4, 2))
+        assert torch.equal(val_batches[0], torch.ones(4, 2))
+        assert torch.equal(val_batches[1], torch.full((4, 2), 2.))
+
+
+def test_dm_shared_memory(tmpdir):
+    """Test that the data loaded in shared memory by `setup` is reused until the `teardown` of its stage"""
+
+    class SharedMemoryDataModule(BoringDataModule):
+
+        def __init__(self):
+            super().__init__()
+            self.loads = []
+
+        def load(self, stage):
+            self.loads.append(stage)
+            return torch.randn(64, 32)
+
+        def setup(self, stage=None):
+            super().setup(stage)
+            data = self.shared_memory("random", lambda: self.load(stage))
+            assert data.is_shared()
+            self.random_train = data
+
+    dm = SharedMemoryDataModule()
+    trainer = Trainer(default_root_dir=tmpdir, fast_dev_run=1)
+    trainer.fit(BoringModel(), datamodule=dm)
+    # the teardown of the fit stage released the data
+    assert dm.loads == ["fit"]
+    assert not dm._shared_memory
+
+    dm.setup("test")
+    dm.setup("predict")
+    # the data of the test stage is reused
+    assert dm.loads == ["fit", "test"]
+    dm.teardown("predict")
+    assert "random" in dm._shared_memory
+    dm.teardown("test")
+    assert not dm._shared_memory
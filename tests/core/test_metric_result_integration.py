@@ -13,6 +13,7 @@
 # limitations under the License.
 import pickle
 from copy import deepcopy
+from unittest import mock
 
 import pytest
 import torch
@@ -23,7 +24,9 @@ from torchmetrics import Metric
 import tests.helpers.utils as tutils
 from pytorch_lightning import Trainer
 from pytorch_lightning.callbacks import ModelCheckpoint
+from pytorch_lightning.plugins import DataParallelPlugin, SingleDevicePlugin
 from pytorch_lightning.trainer.connectors.logger_connector.result import _Sync, MetricSource, ResultCollection
+from pytorch_lightning.utilities.distributed import sync_ddp
 from tests.helpers import BoringModel
 from tests.helpers.runif import RunIf
 
@@ -100,6 +103,56 @@ def test_result_reduce_ddp():
     mp.spawn(_ddp_test_fn, args=(worldsize, ), nprocs=worldsize)
 
 
+def _sync_on_epoch_end_fn(rank, worldsize):
+    _setup_ddp(rank, worldsize)
+    result = ResultCollection(True, torch.device("cpu"))
+
+    for _ in range(2):
+        for i in range(50):
+            result.log('h', f'mean_{i}', torch.tensor(float(rank + i)), sync_dist=True, sync_dist_fn=sync_ddp)
+        result.log('h', 'max', torch.tensor(float(rank)), reduce_fx='max', sync_dist=True, sync_dist_fn=sync_ddp)
+        result.log('h', 'local', torch.tensor(float(rank)))
+
+    with mock.patch("torch.distributed.all_reduce", wraps=dist.all_reduce) as all_reduce, \
+            mock.patch("torch.distributed.barrier", wraps=dist.barrier) as barrier:
+        epoch_log = result.metrics(False)[MetricSource.LOG]
+    # one collective per reduce op, instead of two per mean and one per max, launched asynchronously
+    assert all_reduce.call_count == 2
+    assert all(kwargs["async_op"] for _, kwargs in all_reduce.call_args_list)
+    barrier.assert_not_called()
+
+    assert epoch_log == {
+        **{f'mean_{i}': i + 0.5 for i in range(50)},
+        'max': 1,
+        'local': rank,
+    }
+
+
+@RunIf(skip_windows=True)
+def test_result_sync_on_epoch_end_ddp():
+    """Test that the values synced at the end of the epoch are bucketed by reduce op"""
+    tutils.set_random_master_port()
+
+    worldsize = 2
+    mp.spawn(_sync_on_epoch_end_fn, args=(worldsize, ), nprocs=worldsize)
+
+
+@pytest.mark.parametrize(
+    "plugin", [DataParallelPlugin([torch.device("cpu")] * 2),
+               SingleDevicePlugin(torch.device("cpu"))]
+)
+def test_result_sync_on_epoch_end_not_elementwise(plugin):
+    """Test that the values synced by a reduction which is not element-wise are computed one at a time"""
+    result = ResultCollection(True, torch.device("cpu"))
+    for _ in range(2):
+        result.log('h', 'a', torch.tensor(1.), sync_dist=True, sync_dist_fn=plugin.reduce)
+        result.log('h', 'b', torch.tensor([3.]), sync_dist=True, sync_dist_fn=plugin.reduce)
+        result.log('h', 'c', torch.tensor(5.), sync_dist_fn=plugin.reduce)
+
+    epoch_log = result.metrics(False)[MetricSource.LOG]
+    assert epoch_log == {'a': 1., 'b': 3., 'c': 5.}
+
+
 def test_result_metric_integration():
     metric_a = DummyMetric()
     metric_b = DummyMetric()
@@ -339,3 +392,16 @@ def test_lightning_module_logging_result_collection(tmpdir, device):
         gpus=1 if device == 'cuda' else 0,
     )
     trainer.fit(model)
+
+
+def test_result_collection_extract_batch_size():
+    """Test the batch size inferred for the metric weighting, with batches of variable sizes"""
+    result = ResultCollection(True, torch.device("cpu"))
+    result.extract_batch_size({"x": torch.zeros(3, 7), "y": torch.zeros(3)})
+    assert result.batch_size == 3
+
+    # packed sequences hold all the steps along their first dimension
+    sequences = [torch.zeros(5, 2), torch.zeros(3, 2), torch.zeros(1, 2)]
+    packed = torch.nn.utils.rnn.pack_sequence(sequences)
+    result.extract_batch_size((packed, torch.zeros(3)))
+    assert result.batch_size == 3
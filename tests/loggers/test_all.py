@@ -23,6 +23,7 @@ import torch
 import tests.helpers.utils as tutils
 from pytorch_lightning import Callback, Trainer
 from pytorch_lightning.loggers import (
+    ColumnarLogger,
     CometLogger,
     CSVLogger,
     MLFlowLogger,
@@ -234,6 +235,7 @@ def _test_loggers_save_dir_and_weights_save_path(tmpdir, logger_class):
     "logger_class",
     [
         CometLogger,
+        ColumnarLogger,
         CSVLogger,
         MLFlowLogger,
         NeptuneLogger,
@@ -327,6 +329,7 @@ class RankZeroLoggerCheck(Callback):
 @pytest.mark.parametrize(
     "logger_class", [
         CometLogger,
+        ColumnarLogger,
         CSVLogger,
         MLFlowLogger,
         NeptuneLogger,
@@ -0,0 +1,103 @@
+# Copyright The PyTorch Lightning team.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import os
+import pickle
+import threading
+from unittest import mock
+
+import pytest
+import torch
+
+from pytorch_lightning import Trainer
+from pytorch_lightning.loggers import AsyncLogger, CSVLogger, LoggerCollection
+from pytorch_lightning.loggers.csv_logs import ExperimentWriter
+from tests.helpers import BoringModel
+
+
+def test_async_logger_dispatch(tmpdir):
+    """Test that the calls reach the wrapped logger in order, from the worker thread, with scalars only."""
+    threads = []
+    wrapped = mock.MagicMock()
+    wrapped.log_metrics.side_effect = lambda *_: threads.append(threading.current_thread())
+    logger = AsyncLogger(wrapped)
+
+    logger.log_hyperparams({"lr": 0.1})
+    logger.log_metrics({"a": torch.tensor(1.5), "b": torch.tensor(2), "c": 3.0}, step=0)
+    logger.save()
+    logger.finalize("success")
+
+    assert [c[0] for c in wrapped.method_calls] == ["log_hyperparams", "log_metrics", "save", "finalize"]
+    wrapped.log_metrics.assert_called_once_with({"a": 1.5, "b": 2, "c": 3.0}, 0)
+    assert type(wrapped.log_metrics.call_args[0][0]["b"]) is int
+    assert threads[0] is not threading.current_thread()
+    # the attributes of the wrapped logger are accessible
+    assert logger.version is wrapped.version
+    assert logger.log_dir is wrapped.log_dir
+
+
+def test_async_logger_backpressure():
+    """Test that logging blocks once ``max_queue_size`` calls are pending."""
+    release = threading.Event()
+    wrapped = mock.MagicMock()
+    wrapped.log_metrics.side_effect = lambda *_: release.wait()
+    logger = AsyncLogger(wrapped, max_queue_size=1)
+    logger.log_metrics({"a": 1}, step=0)
+    logger.log_metrics({"a": 2}, step=1)
+
+    blocked = threading.Thread(target=logger.log_metrics, args=({"a": 3}, 2))
+    blocked.start()
+    blocked.join(timeout=0.2)
+    assert blocked.is_alive()
+
+    release.set()
+    blocked.join()
+    logger.flush()
+    assert wrapped.log_metrics.call_count == 3
+
+
+def test_async_logger_error():
+    wrapped = mock.MagicMock()
+    wrapped.log_metrics.side_effect = ValueError("offline")
+    logger = AsyncLogger(wrapped)
+    logger.log_metrics({"a": 1}, step=0)
+    with pytest.raises(RuntimeError, match="background logger failed"):
+        logger.flush()
+    # the error is only raised once
+    logger.flush()
+
+
+def test_async_logger_fit(tmpdir):
+    """Test that the metrics of a run end up in the wrapped loggers and that the logger can be pickled."""
+
+    class CustomModel(BoringModel):
+
+        def training_step(self, batch, batch_idx):
+            output = super().training_step(batch, batch_idx)
+            self.log("train_loss", output["loss"])
+            return output
+
+    csv_logger = CSVLogger(tmpdir)
+    logger = AsyncLogger(LoggerCollection([csv_logger]))
+    trainer = Trainer(default_root_dir=tmpdir, max_epochs=1, limit_train_batches=4, log_every_n_steps=1, logger=logger)
+    trainer.fit(CustomModel())
+
+    with open(os.path.join(csv_logger.log_dir, ExperimentWriter.NAME_METRICS_FILE)) as f:
+        lines = f.read().splitlines()
+    assert "train_loss" in lines[0]
+    assert len(lines) == 1 + 4
+
+    logger = pickle.loads(pickle.dumps(logger))
+    logger.log_metrics({"a": 1.0}, step=10)
+    logger.finalize("success")
+    assert logger[0].experiment.metrics == []
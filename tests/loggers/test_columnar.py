@@ -0,0 +1,110 @@
+# Copyright The PyTorch Lightning team.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import os
+
+import numpy as np
+import pytest
+import torch
+
+from pytorch_lightning import Trainer
+from pytorch_lightning.loggers import ColumnarLogger
+from pytorch_lightning.loggers.columnar_logs import _PYARROW_AVAILABLE, read_metrics
+from pytorch_lightning.utilities.exceptions import MisconfigurationException
+from tests.helpers import BoringModel
+
+
+@pytest.mark.parametrize(
+    "storage", ["numpy", pytest.param("arrow", marks=pytest.mark.skipif(not _PYARROW_AVAILABLE, reason="pyarrow"))]
+)
+def test_columnar_logger_log_metrics(tmpdir, storage):
+    logger = ColumnarLogger(tmpdir, chunk_size=3, storage=storage)
+    for i in range(4):
+        logger.log_metrics({"loss": torch.tensor(float(i)), "lr": 0.1})
+    # a full chunk was written, one row is still buffered
+    assert len(logger.experiment.metrics) == 1
+    logger.log_metrics({"val/acc": 0.5}, step=3)
+    logger.save()
+    assert logger.experiment.metrics == []
+
+    logger.log_metrics({"loss": 4.0})
+    logger.finalize("success")
+
+    metrics = read_metrics(logger.log_dir)
+    assert list(metrics) == ["loss", "lr", "step", "val/acc"]
+    np.testing.assert_array_equal(metrics["step"], [0, 1, 2, 3, 3, 5])
+    np.testing.assert_array_equal(metrics["loss"], [0, 1, 2, 3, np.nan, 4])
+    np.testing.assert_array_equal(metrics["lr"], [0.1, 0.1, 0.1, 0.1, np.nan, np.nan])
+    np.testing.assert_array_equal(metrics["val/acc"], [np.nan] * 4 + [0.5, np.nan])
+    assert os.path.isfile(os.path.join(logger.log_dir, "hparams.yaml"))
+
+
+def test_columnar_logger_non_numeric_values(tmpdir):
+    logger = ColumnarLogger(tmpdir, storage="numpy")
+    logger.log_metrics({"a": True, "b": np.float32(0.5), "c": torch.tensor([2])})
+    for value in ("high", torch.ones(2), None):
+        with pytest.raises(ValueError, match="only stores numbers"):
+            logger.log_metrics({"d": value})
+    logger.save()
+
+    metrics = read_metrics(logger.log_dir)
+    assert list(metrics) == ["a", "b", "c", "step"]
+    np.testing.assert_array_equal(np.stack(list(metrics.values())), [[1], [0.5], [2], [0]])
+
+
+def test_columnar_logger_replaces_previous_run(tmpdir):
+    logger = ColumnarLogger(tmpdir, version=0, storage="numpy")
+    logger.log_metrics({"a": 1.0, "b": 2.0})
+    logger.save()
+
+    logger = ColumnarLogger(tmpdir, version=0, storage="numpy")
+    with pytest.warns(UserWarning, match="exists and is not empty"):
+        logger.log_metrics({"c": 3.0})
+    logger.save()
+    metrics = read_metrics(logger.log_dir)
+    assert list(metrics) == ["c", "step"]
+    assert len(os.listdir(os.path.join(logger.log_dir, "metrics"))) == 3
+
+
+@pytest.mark.skipif(_PYARROW_AVAILABLE, reason="pyarrow is installed")
+def test_columnar_logger_arrow_unavailable(tmpdir):
+    logger = ColumnarLogger(tmpdir, storage="arrow")
+    with pytest.raises(MisconfigurationException, match="requires `pyarrow`"):
+        logger.experiment
+    assert ColumnarLogger(tmpdir).experiment.storage == "numpy"
+
+
+def test_columnar_logger_fit(tmpdir):
+
+    class CustomModel(BoringModel):
+
+        def training_step(self, batch, batch_idx):
+            output = super().training_step(batch, batch_idx)
+            self.log("train_loss", output["loss"])
+            return output
+
+    logger = ColumnarLogger(tmpdir)
+    trainer = Trainer(
+        default_root_dir=tmpdir,
+        max_epochs=2,
+        limit_train_batches=5,
+        limit_val_batches=2,
+        log_every_n_steps=1,
+        logger=logger,
+    )
+    trainer.fit(CustomModel())
+
+    metrics = read_metrics(logger.log_dir)
+    train_loss = metrics["train_loss"][~np.isnan(metrics["train_loss"])]
+    assert len(train_loss) == 10
+    assert metrics["epoch"].shape == metrics["train_loss"].shape
@@ -13,6 +13,7 @@
 # limitations under the License.
 import os
 from argparse import Namespace
+from unittest import mock
 
 import pytest
 import torch
@@ -90,6 +91,29 @@ def test_file_logger_log_metrics(tmpdir, step_idx):
     assert all([n in lines[0] for n in metrics])
 
 
+def test_file_logger_appends_metrics(tmpdir):
+    """Test that saving appends the new rows and extends the header only when new keys appear."""
+    logger = CSVLogger(tmpdir)
+    path_csv = os.path.join(logger.log_dir, ExperimentWriter.NAME_METRICS_FILE)
+    logger.log_metrics({"a": 1})
+    logger.log_metrics({"a": 2})
+    logger.save()
+    # the saved rows are released
+    assert logger.experiment.metrics == []
+
+    logger.log_metrics({"a": 3})
+    with mock.patch.object(ExperimentWriter, "_rewrite_header") as rewrite_header:
+        logger.save()
+    rewrite_header.assert_not_called()
+
+    logger.log_metrics({"b": 4}, step=10)
+    logger.save()
+    with open(path_csv, 'r') as fp:
+        lines = fp.read().splitlines()
+    assert lines == ["a,step,b", "1,0,", "2,1,", "3,2,", ",10,4"]
+    assert not os.path.exists(path_csv + '.tmp')
+
+
 def test_file_logger_log_hyperparams(tmpdir):
     logger = CSVLogger(tmpdir)
     hparams = {
@@ -45,7 +45,9 @@ def test_loops_state_dict_structure():
             'epoch_loop': {
                 'batch_loop': {},
                 'val_loop': {},
-            }
+                'dataloader_state_dict': {},
+            },
+            'progress': trainer.fit_loop.progress.state_dict(),
         },
         "validate_loop": {},
         "test_loop": {},
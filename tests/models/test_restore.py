@@ -345,8 +345,9 @@ def test_running_test_pretrained_model_cpu(tmpdir):
     tutils.assert_ok_model_acc(new_trainer, key='test_acc', thr=0.45)
 
 
+@pytest.mark.parametrize('mmap', [False, True])
 @pytest.mark.parametrize('model_template', [ValTestLossBoringModel, GenericValTestLossBoringModel])
-def test_load_model_from_checkpoint(tmpdir, model_template):
+def test_load_model_from_checkpoint(tmpdir, model_template, mmap):
     """Verify test() on pretrained model."""
     tutils.reset_seed()
     model = model_template()
@@ -377,7 +378,7 @@ def test_load_model_from_checkpoint(tmpdir, model_template):
     assert model_template.CHECKPOINT_HYPER_PARAMS_KEY in ckpt.keys(), 'hyper_parameters missing from checkpoints'
 
     # Ensure that model can be correctly restored from checkpoint
-    pretrained_model = model_template.load_from_checkpoint(last_checkpoint)
+    pretrained_model = model_template.load_from_checkpoint(last_checkpoint, mmap=mmap)
 
     # test that hparams loaded correctly
     for k, v in model.hparams.items():
@@ -11,13 +11,22 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import json
 from collections.abc import Iterable
 
+import numpy as np
 import pytest
-from torch.utils.data import BatchSampler, SequentialSampler
+import torch
+from torch.utils.data import BatchSampler, DistributedSampler, RandomSampler, SequentialSampler
 
 from pytorch_lightning import seed_everything
-from pytorch_lightning.overrides.distributed import IndexBatchSamplerWrapper, UnrepeatedDistributedSampler
+from pytorch_lightning.overrides.distributed import (
+    BatchIndices,
+    BucketBatchSampler,
+    DynamicBatchSampler,
+    IndexBatchSamplerWrapper,
+    UnrepeatedDistributedSampler,
+)
 from pytorch_lightning.utilities.data import has_len
 
 
@@ -67,3 +76,161 @@ def test_index_batch_sampler_methods():
 
     assert isinstance(index_batch_sampler, Iterable)
     assert has_len(index_batch_sampler)
+
+
+@pytest.mark.parametrize(
+    "batches", [
+        [[0, 1, 2], [3, 4, 5], [6]],
+        [[1, 5, 9], [13, 17, 21], [25, 29]],
+        [[7], [6], [5]],
+        [[3]],
+        [[4, 2, 9], [1, 0, 3]],
+        [[0, 1, 2], [3, 4], [5, 6]],
+        [[0, 1], [2, 3, 4]],
+        [[0, 2], [3, 5]],
+        [[1], [1]],
+    ]
+)
+def test_batch_indices(batches):
+    """Test that `BatchIndices` returns the batches appended to it."""
+    batch_indices = BatchIndices(batches)
+    assert len(batch_indices) == len(batches)
+    assert list(batch_indices) == batches
+    assert batch_indices[-1] == batches[-1]
+    assert batch_indices[1:] == batches[1:]
+    assert all(isinstance(i, int) for batch in batch_indices for i in batch)
+    assert list(batch_indices.flatten()) == [i for batch in batches for i in batch]
+    with pytest.raises(IndexError):
+        batch_indices[len(batches)]
+
+
+def test_batch_indices_compact():
+    """Test that strided batches are stored as a progression and the others as arrays."""
+    sampler = UnrepeatedDistributedSampler(range(10_000), rank=1, num_replicas=4, shuffle=False)
+    batch_indices = BatchIndices(BatchSampler(sampler, 32, False))
+    assert batch_indices._values is None
+    assert batch_indices[1] == list(range(129, 257, 4))
+    assert batch_indices.flatten() == range(1, 10_000, 4)
+
+    sampler = UnrepeatedDistributedSampler(range(10_000), rank=1, num_replicas=4, shuffle=True)
+    batch_indices = BatchIndices(BatchSampler(sampler, 32, False))
+    assert batch_indices._values.dtype == np.int64
+    assert list(batch_indices.flatten()) == list(sampler)
+    assert not batch_indices.flatten().flags.writeable
+    # the batches are copies which can be modified and serialized
+    batch = batch_indices[0]
+    batch[0] = -1
+    assert batch_indices[0][0] == list(sampler)[0]
+    assert json.loads(json.dumps(batch_indices[0])) == batch_indices[0]
+
+
+@pytest.mark.parametrize("drop_last", [False, True])
+def test_bucket_batch_sampler(drop_last):
+    """Test that the `BucketBatchSampler` batches samples of similar lengths and splits them evenly between ranks."""
+    world_size = 3
+    lengths = torch.randint(1, 100, (103, ), generator=torch.Generator().manual_seed(1)).tolist()
+    samplers = [
+        BucketBatchSampler(
+            lengths, batch_size=4, batches_per_bucket=5, drop_last=drop_last, num_replicas=world_size, rank=rank
+        ) for rank in range(world_size)
+    ]
+    batches = [list(s) for s in samplers]
+
+    # 26 batches, the last one of 3 samples
+    num_steps = 8 if drop_last else 9
+    assert all(len(b) == len(s) == num_steps for b, s in zip(batches, samplers))
+    indices = [i for rank_batches in batches for batch in rank_batches for i in batch]
+    if drop_last:
+        assert len(indices) == len(set(indices)) == num_steps * world_size * 4
+    else:
+        assert set(indices) == set(range(103))
+
+    # the batches are sorted slices of the buckets, far less padded than random batches
+    padding = sum(max(lengths[i] for i in batch) * len(batch) for b in batches for batch in b)
+    assert padding < 1.2 * sum(lengths[i] for i in indices)
+
+    # deterministic for a given epoch, different across epochs
+    assert [list(s) for s in samplers] == batches
+    for s in samplers:
+        s.set_epoch(1)
+    assert [list(s) for s in samplers] != batches
+
+
+def test_bucket_batch_sampler_no_shuffle():
+    lengths = [5, 1, 4, 2, 3, 6]
+    sampler = BucketBatchSampler(lengths, batch_size=2, batches_per_bucket=2, shuffle=False)
+    assert list(sampler) == [[1, 3], [2, 0], [4, 5]]
+
+    with pytest.raises(ValueError, match="Invalid rank 2"):
+        BucketBatchSampler(lengths, batch_size=2, num_replicas=2, rank=2)
+
+
+def test_bucket_batch_sampler_max_tokens():
+    """Test that the `BucketBatchSampler` packs batches up to a budget of tokens with the same number per rank."""
+    lengths = torch.randint(1, 50, (200, ), generator=torch.Generator().manual_seed(2)).tolist()
+    samplers = [BucketBatchSampler(lengths, max_tokens=120, num_replicas=2, rank=rank) for rank in range(2)]
+    batches = [list(s) for s in samplers]
+    assert len(batches[0]) == len(batches[1]) == len(samplers[0])
+    assert set(i for b in batches for batch in b for i in batch) == set(range(200))
+    sizes = set()
+    for batch in batches[0] + batches[1]:
+        assert max(lengths[i] for i in batch) * len(batch) <= 120
+        sizes.add(len(batch))
+    # the batches of short samples hold more samples
+    assert len(sizes) > 5
+
+    with pytest.raises(ValueError, match="Either `batch_size` or `max_tokens` should be set"):
+        BucketBatchSampler(lengths)
+
+
+@pytest.mark.parametrize("drop_last", [False, True])
+def test_dynamic_batch_sampler(drop_last):
+    """Test that the `DynamicBatchSampler` packs the indices of its sampler in order up to a budget of tokens."""
+    lengths = [2, 3, 3, 8, 1, 1, 1, 4, 2]
+    sampler = DynamicBatchSampler(
+        SequentialSampler(lengths), lengths, max_tokens=8, max_batch_size=3, drop_last=drop_last
+    )
+    expected = [[0, 1], [2], [3], [4, 5, 6], [7, 8]]
+    if drop_last:
+        expected = expected[:-1]
+    assert list(sampler) == expected
+    assert len(sampler) == len(expected)
+    # a sample longer than the budget makes a batch on its own
+    sampler = DynamicBatchSampler(SequentialSampler(lengths), lengths, max_tokens=4)
+    assert list(sampler) == [[0], [1], [2], [3], [4, 5, 6], [7], [8]]
+
+
+def test_dynamic_batch_sampler_len_random_sampler():
+    """Test that the length of a `DynamicBatchSampler` is the one of its next pass, drawn once from the sampler."""
+    lengths = [1, 8, 2, 7, 3, 6, 4, 5] * 4
+    sampler = DynamicBatchSampler(RandomSampler(lengths), lengths, max_tokens=16)
+    seed_everything(1)
+    num_batches = len(sampler)
+    assert len(sampler) == num_batches
+    # the global random state was drawn from once, by the pass
+    state = torch.get_rng_state()
+    batches = list(sampler)
+    assert torch.equal(torch.get_rng_state(), state)
+    assert len(batches) == num_batches
+    assert sorted(i for batch in batches for i in batch) == list(range(len(lengths)))
+    # the next pass is drawn again
+    assert list(sampler) != batches
+
+    # a new epoch draws a new pass of the distributed sampler
+    sampler = DynamicBatchSampler(DistributedSampler(lengths, num_replicas=2, rank=0), lengths, max_tokens=16)
+    len(sampler)
+    sampler.set_epoch(1)
+    assert sampler.sampler.epoch == 1
+    expected = list(DynamicBatchSampler(sampler.sampler, lengths, max_tokens=16))
+    assert list(sampler) == expected
+
+
+def test_dynamic_batch_sampler_unrepeated_distributed_sampler():
+    """Test that the `DynamicBatchSampler` packs the indices of the rank of an `UnrepeatedDistributedSampler`."""
+    lengths = list(range(1, 12))
+    batches = []
+    for rank in range(2):
+        sampler = UnrepeatedDistributedSampler(lengths, num_replicas=2, rank=rank, shuffle=False)
+        batches.append(list(DynamicBatchSampler(sampler, lengths, max_tokens=20)))
+    assert batches[0] == [[0, 2, 4], [6, 8], [10]]
+    assert batches[1] == [[1, 3, 5], [7, 9]]
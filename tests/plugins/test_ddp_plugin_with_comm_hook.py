@@ -11,11 +11,13 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import pytest
 import torch
 
 from pytorch_lightning import Trainer
 from pytorch_lightning.plugins import DDPPlugin, DDPSpawnPlugin
 from pytorch_lightning.utilities import _TORCH_GREATER_EQUAL_1_8
+from pytorch_lightning.utilities.exceptions import MisconfigurationException
 from tests.helpers import BoringModel
 from tests.helpers.runif import RunIf
 
@@ -114,3 +116,46 @@ def test_ddp_spawn_fp16_compress_comm_hook(tmpdir):
     )
     trainer.fit(model)
     assert trainer.state.finished, f"Training failed with {trainer.state}"
+
+
+@RunIf(skip_windows=True, min_torch="1.9.0")
+def test_ddp_spawn_gradient_compression_checkpoint(tmpdir):
+    """Test that the gradient compression runs on CPU and its state is saved with the checkpoints."""
+    model = BoringModel()
+    trainer = Trainer(
+        default_root_dir=tmpdir,
+        accelerator="ddp_cpu",
+        num_processes=2,
+        plugins="ddp_spawn_topk",
+        max_steps=3,
+        limit_val_batches=0,
+    )
+    trainer.fit(model)
+    assert trainer.state.finished, f"Training failed with {trainer.state}"
+
+    checkpoint = torch.load(trainer.checkpoint_callback.best_model_path)
+    assert checkpoint["gradient_compression"]["rank"] == 0
+    assert checkpoint["gradient_compression"]["world_size"] == 2
+    assert checkpoint["gradient_compression"]["state"]["iteration"] == 3
+    assert checkpoint["gradient_compression"]["state"]["buckets"]
+
+    # the state is restored when resuming
+    trainer = Trainer(
+        default_root_dir=tmpdir,
+        accelerator="ddp_cpu",
+        num_processes=2,
+        plugins=DDPSpawnPlugin(gradient_compression="topk"),
+        max_steps=5,
+        limit_val_batches=0,
+        resume_from_checkpoint=trainer.checkpoint_callback.best_model_path,
+    )
+    trainer.fit(model)
+    assert trainer.state.finished, f"Training failed with {trainer.state}"
+    checkpoint = torch.load(trainer.checkpoint_callback.best_model_path)
+    assert checkpoint["gradient_compression"]["state"]["iteration"] == 5
+
+
+@pytest.mark.parametrize("plugin_cls", [DDPPlugin, DDPSpawnPlugin])
+def test_gradient_compression_with_comm_hook(plugin_cls):
+    with pytest.raises(MisconfigurationException, match="cannot be set together"):
+        plugin_cls(gradient_compression="fp16", ddp_comm_hook=lambda state, bucket: None)
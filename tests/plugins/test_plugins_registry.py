@@ -14,7 +14,13 @@
 import pytest
 
 from pytorch_lightning import Trainer
-from pytorch_lightning.plugins import DDPPlugin, DeepSpeedPlugin, TPUSpawnPlugin, TrainingTypePluginsRegistry
+from pytorch_lightning.plugins import (
+    DDPPlugin,
+    DDPSpawnPlugin,
+    DeepSpeedPlugin,
+    TPUSpawnPlugin,
+    TrainingTypePluginsRegistry,
+)
 from tests.helpers.runif import RunIf
 
 
@@ -96,6 +102,15 @@ def test_ddp_training_type_plugins_registry_with_trainer(tmpdir):
     assert isinstance(trainer.training_type_plugin, DDPPlugin)
 
 
+@pytest.mark.parametrize("preset", ["fp16", "powersgd", "topk"])
+@pytest.mark.parametrize("prefix, plugin_cls", [("ddp", DDPPlugin), ("ddp_spawn", DDPSpawnPlugin)])
+def test_gradient_compression_plugins_registry(preset, prefix, plugin_cls):
+    plugin = f"{prefix}_{preset}"
+    assert plugin in TrainingTypePluginsRegistry
+    assert TrainingTypePluginsRegistry[plugin]["init_params"] == {"gradient_compression": preset}
+    assert TrainingTypePluginsRegistry[plugin]["plugin"] == plugin_cls
+
+
 def test_tpu_spawn_debug_plugins_registry(tmpdir):
 
     plugin = "tpu_spawn_debug"
@@ -14,9 +14,11 @@
 import os
 from unittest.mock import Mock
 
+import pytest
 import torch
+from torch.utils.data import DataLoader, Dataset
 
-from pytorch_lightning import Trainer
+from pytorch_lightning import Callback, seed_everything, Trainer
 from tests.helpers import BoringModel
 
 
@@ -153,3 +155,97 @@ def test_hpc_max_ckpt_version(tmpdir):
     assert trainer.checkpoint_connector.hpc_resume_path == str(tmpdir / "hpc_ckpt_33.ckpt")
     assert trainer.checkpoint_connector.max_ckpt_version_in_folder(tmpdir) == 33
     assert trainer.checkpoint_connector.max_ckpt_version_in_folder(tmpdir / "not" / "existing") is None
+
+
+class IndexDataset(Dataset):
+    """Returns the index of each sample and records the samples which were loaded"""
+
+    def __init__(self, size: int, offset: int = 0):
+        self.size = size
+        self.offset = offset
+        self.loaded = []
+
+    def __getitem__(self, index):
+        self.loaded.append(index)
+        return torch.full((32, ), float(index + self.offset))
+
+    def __len__(self):
+        return self.size
+
+
+class MidEpochResumeModel(BoringModel):
+
+    def __init__(self, loaders: str):
+        super().__init__()
+        self.loaders = loaders
+        self.datasets = [IndexDataset(40), IndexDataset(12, offset=1000)]
+        self.seen = []
+
+    def train_dataloader(self):
+        if self.loaders == "single":
+            return DataLoader(self.datasets[0], batch_size=4, shuffle=True)
+        return {
+            "a": DataLoader(self.datasets[0], batch_size=4, shuffle=True),
+            "b": DataLoader(self.datasets[1], batch_size=4, shuffle=True),
+        }
+
+    def training_step(self, batch, batch_idx):
+        batches = [batch] if torch.is_tensor(batch) else [b for b in batch.values() if b is not None]
+        self.seen.append(sorted(int(v) for b in batches for v in b[:, 0]))
+        return super().training_step(batches[0], batch_idx)
+
+
+class SaveAtBatch(Callback):
+
+    def __init__(self, path, epoch, batch_idx):
+        self.path = path
+        self.epoch = epoch
+        self.batch_idx = batch_idx
+
+    def on_train_batch_end(self, trainer, pl_module, outputs, batch, batch_idx, dataloader_idx):
+        if trainer.current_epoch == self.epoch and batch_idx == self.batch_idx:
+            trainer.save_checkpoint(self.path)
+
+
+@pytest.mark.parametrize(["loaders", "mode", "batches_per_epoch"], [
+    ("single", "max_size_cycle", 10),
+    ("multiple", "max_size_cycle", 10),
+    ("multiple", "round_robin", 13),
+])
+def test_resume_mid_epoch(tmpdir, loaders, mode, batches_per_epoch):
+    """Test that resuming from a mid-epoch checkpoint continues the epoch with the same batches, without loading
+    the ones which were already processed"""
+    path = os.path.join(tmpdir, "mid_epoch.ckpt")
+    trainer_kwargs = dict(
+        default_root_dir=tmpdir,
+        max_epochs=2,
+        limit_val_batches=0,
+        multiple_trainloader_mode=mode,
+        logger=False,
+        checkpoint_callback=False,
+        weights_summary=None,
+        progress_bar_refresh_rate=0,
+    )
+    seed_everything(1)
+    model = MidEpochResumeModel(loaders)
+    trainer = Trainer(callbacks=SaveAtBatch(path, epoch=1, batch_idx=4), **trainer_kwargs)
+    trainer.fit(model)
+    assert len(model.seen) == 2 * batches_per_epoch
+
+    checkpoint = torch.load(path)
+    dataloader_state_dict = checkpoint["loops"]["fit_loop"]["epoch_loop"]["dataloader_state_dict"]
+    assert dataloader_state_dict["epoch"] == 1
+    assert dataloader_state_dict["num_batches"] == 5
+
+    seed_everything(2)
+    resumed_model = MidEpochResumeModel(loaders)
+    resumed_trainer = Trainer(resume_from_checkpoint=path, **trainer_kwargs)
+    resumed_trainer.fit(resumed_model)
+
+    # the epoch continues with the batches of the original run
+    assert resumed_model.seen == model.seen[batches_per_epoch + 5:]
+    assert resumed_trainer.global_step == trainer.global_step
+    assert resumed_trainer.current_epoch == trainer.current_epoch
+    # only the samples of the remaining batches were loaded
+    loaded = sorted(i + d.offset for d in resumed_model.datasets for i in d.loaded)
+    assert loaded == sorted(v for batch in resumed_model.seen for v in batch)
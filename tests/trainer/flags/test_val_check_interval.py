@@ -37,6 +37,7 @@ def test_val_check_interval(tmpdir, max_epochs, denominator):
 
     model = TestModel()
     trainer = Trainer(
+        default_root_dir=tmpdir,
         max_epochs=max_epochs,
         val_check_interval=1 / denominator,
         logger=False,
@@ -24,6 +24,7 @@ from pytorch_lightning.trainer import Trainer
 from pytorch_lightning.trainer.connectors.logger_connector.fx_validator import FxValidator
 from pytorch_lightning.trainer.connectors.logger_connector.result import MetricSource, ResultCollection
 from pytorch_lightning.utilities.exceptions import MisconfigurationException
+from pytorch_lightning.utilities.metrics import _to_scalars, metrics_to_scalars
 from tests.helpers.boring_model import BoringModel, RandomDataset
 from tests.helpers.runif import RunIf
 
@@ -501,3 +502,47 @@ def test_logged_metrics_has_logged_epoch_value(tmpdir):
 
     # should not get overridden if logged manually
     assert trainer.logged_metrics == {'epoch': -1}
+
+
+def test_result_collection_progress_bar_metrics_single_transfer():
+    """Test that the progress bar metrics are copied to the host together, keeping the types and precision of the
+    values."""
+    result_collection = ResultCollection(True, torch.device("cpu"))
+    result_collection.log("training_step", "a", torch.tensor(1.5), prog_bar=True, on_step=True)
+    result_collection.log("training_step", "b", torch.tensor(2.0), prog_bar=True, on_step=True)
+    result_collection.log("training_step", "c", {"d": torch.tensor(3.0)}, prog_bar=True, on_step=True)
+
+    with mock.patch("pytorch_lightning.utilities.metrics._to_scalars", wraps=_to_scalars) as to_scalars:
+        metrics = result_collection.metrics(on_step=True)
+    to_scalars.assert_called_once()
+    assert metrics[MetricSource.PBAR] == {"a_step": 1.5, "b_step": 2.0, "c_step": {"d": 3.0}}
+
+    scalars = metrics_to_scalars({"a": torch.tensor(1.5), "b": torch.tensor(2), "c": [torch.tensor(True)]})
+    assert scalars == {"a": 1.5, "b": 2, "c": [True]}
+    assert [type(scalars["a"]), type(scalars["b"]), type(scalars["c"][0])] == [float, int, bool]
+    scalars = metrics_to_scalars({"n": torch.tensor(2**53 + 1), "loss": torch.tensor(0.5)})
+    assert scalars == {"n": 2**53 + 1, "loss": 0.5}
+
+
+def test_result_collection_log_reuses_metadata():
+    result_collection = ResultCollection(True, torch.device("cpu"))
+    result_collection.log("training_step", "a", torch.tensor(1.0), on_step=True, dataloader_idx=0)
+    meta = result_collection["training_step.a.0"].meta
+
+    with mock.patch("pytorch_lightning.trainer.connectors.logger_connector.result._Metadata") as metadata:
+        for i in range(2, 5):
+            result_collection.log("training_step", "a", torch.tensor(float(i)), on_step=True, dataloader_idx=0)
+    metadata.assert_not_called()
+    assert result_collection["training_step.a.0"].meta is meta
+    assert result_collection["training_step.a.0"].compute() == 2.5
+
+    # the arguments are still validated
+    with pytest.raises(MisconfigurationException, match="with different arguments"):
+        result_collection.log("training_step", "a", torch.tensor(1.0), on_step=False, dataloader_idx=0)
+
+    # restoring the state replaces the metadata
+    state_dict = result_collection.state_dict()
+    result_collection.load_state_dict(state_dict)
+    assert result_collection._log_cache == {}
+    result_collection.log("training_step", "a", torch.tensor(5.0), on_step=True, dataloader_idx=0)
+    assert result_collection._log_cache[("training_step", "a", 0)][1] is result_collection["training_step.a.0"].meta
@@ -1,9 +1,12 @@
+import contextlib
 from unittest.mock import patch
 
 import pytest
 
 from pytorch_lightning import Trainer
+from pytorch_lightning.plugins import SingleDevicePlugin
 from tests.base import EvalModelTemplate
+from tests.helpers import BoringModel
 
 
 @pytest.mark.parametrize("num_steps", [1, 2, 3])
@@ -50,3 +53,19 @@ def test_backward_count_with_closure(torch_backward):
     trainer = Trainer(max_steps=5, accumulate_grad_batches=2)
     trainer.fit(model)
     assert torch_backward.call_count == 10
+
+
+@pytest.mark.parametrize("accumulate_grad_batches", [1, 3])
+@patch.object(SingleDevicePlugin, "block_backward_sync", side_effect=contextlib.nullcontext)
+def test_block_backward_sync_with_grad_accumulation(block_backward_sync, tmpdir, accumulate_grad_batches):
+    """ Test that the gradient sync of any training type plugin is blocked for the accumulated batches. """
+    model = BoringModel()
+    trainer = Trainer(
+        default_root_dir=tmpdir,
+        max_epochs=1,
+        limit_train_batches=6,
+        limit_val_batches=0,
+        accumulate_grad_batches=accumulate_grad_batches,
+    )
+    trainer.fit(model)
+    assert block_backward_sync.call_count == 6 - 6 // accumulate_grad_batches
@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import collections
+import contextlib
 import os
 from copy import deepcopy
 from unittest import mock
@@ -429,6 +430,35 @@ def test_manual_optimization_and_accumulated_gradient(tmpdir):
     trainer.fit(model)
 
 
+@patch("pytorch_lightning.plugins.SingleDevicePlugin.block_backward_sync", side_effect=contextlib.nullcontext)
+def test_manual_optimization_block_backward_sync(block_backward_sync, tmpdir):
+    """ Test that `LightningModule.block_backward_sync` blocks the gradient sync of the training type plugin. """
+
+    class TestModel(BoringModel):
+
+        def __init__(self):
+            super().__init__()
+            self.automatic_optimization = False
+
+        def training_step(self, batch, batch_idx):
+            opt = self.optimizers()
+            loss = self.step(batch)
+            if batch_idx % 2 == 0:
+                with self.block_backward_sync():
+                    self.manual_backward(loss)
+            else:
+                self.manual_backward(loss)
+                opt.step()
+                opt.zero_grad()
+
+        def training_epoch_end(self, outputs) -> None:
+            pass
+
+    trainer = Trainer(default_root_dir=tmpdir, max_epochs=1, limit_train_batches=6, limit_val_batches=0)
+    trainer.fit(TestModel())
+    assert block_backward_sync.call_count == 3
+
+
 @mock.patch.dict(os.environ, {"PL_DEV_DEBUG": "1"})
 @RunIf(min_gpus=1)
 def test_multiple_optimizers_step(tmpdir):
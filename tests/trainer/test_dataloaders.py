@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import os
+import threading
 from unittest import mock
 from unittest.mock import Mock, patch
 
@@ -26,6 +27,12 @@ from torch.utils.data.sampler import SequentialSampler
 import tests.helpers.pipelines as tpipes
 from pytorch_lightning import Callback, seed_everything, Trainer
 from pytorch_lightning.callbacks import ModelCheckpoint
+from pytorch_lightning.overrides.distributed import (
+    DynamicBatchSampler,
+    IndexBatchSamplerWrapper,
+    UnrepeatedDistributedSampler,
+)
+from pytorch_lightning.trainer.states import RunningStage
 from pytorch_lightning.utilities import _TORCH_GREATER_EQUAL_1_6
 from pytorch_lightning.utilities.data import has_iterable_dataset, has_len
 from pytorch_lightning.utilities.exceptions import MisconfigurationException
@@ -1198,6 +1205,170 @@ def test_fit_multiple_train_loaders(tmpdir, multiple_trainloader_mode, num_train
     assert num_training_batches == trainer.num_training_batches
 
 
+@pytest.mark.parametrize("multiple_trainloader_mode", ["sequential", "round_robin", "weighted_random"])
+def test_fit_multiple_train_loaders_alternating(tmpdir, multiple_trainloader_mode):
+    """Integration test for the modes which fetch a batch from a single train loader at each step"""
+
+    class TestModel(BoringModel):
+
+        def __init__(self):
+            super().__init__()
+            self.fetched = []
+
+        def train_dataloader(self):
+            return {
+                "a": DataLoader(RandomDataset(32, 64), batch_size=8),
+                "b": DataLoader(RandomDataset(32, 16), batch_size=4),
+            }
+
+        def training_step(self, batch, batch_idx):
+            key = next(k for k, v in batch.items() if v is not None)
+            assert sum(v is None for v in batch.values()) == 1
+            self.fetched.append(key)
+            self.log("size", float(batch[key].shape[0]), on_step=False, on_epoch=True)
+            return super().training_step(batch[key], batch_idx)
+
+    model = TestModel()
+    trainer = Trainer(
+        max_epochs=1,
+        default_root_dir=tmpdir,
+        limit_val_batches=0,
+        multiple_trainloader_mode=multiple_trainloader_mode,
+    )
+    trainer.fit(model)
+    assert trainer.num_training_batches == 8 + 4
+    assert sorted(model.fetched) == ["a"] * 8 + ["b"] * 4
+    if multiple_trainloader_mode == "round_robin":
+        assert model.fetched[:8] == ["a", "b"] * 4
+    # the epoch value is weighted by the batch size of the fetched loader
+    assert trainer.callback_metrics["size"] == (8 * 8 * 8 + 4 * 4 * 4) / (8 * 8 + 4 * 4)
+
+
+class VariableLengthDataset(Dataset):
+
+    def __init__(self, size: int):
+        self.lengths = torch.randint(1, 32, (size, ), generator=torch.Generator().manual_seed(0))
+
+    def __getitem__(self, index):
+        return {"x": torch.ones(self.lengths[index], 32)}
+
+    def __len__(self):
+        return len(self.lengths)
+
+
+@pytest.mark.parametrize("bucket_length_key", ["x", lambda sample: sample["x"].shape[0]])
+def test_fit_bucket_length_key(tmpdir, bucket_length_key):
+    """Test that `Trainer(bucket_length_key)` batches together the train samples of similar lengths"""
+
+    class TestModel(BoringModel):
+
+        def __init__(self):
+            super().__init__()
+            self.padding = 0
+            self.epochs = []
+
+        def train_dataloader(self):
+            return DataLoader(VariableLengthDataset(64), batch_size=4, shuffle=True, collate_fn=self.collate)
+
+        def collate(self, samples):
+            lengths = [len(s["x"]) for s in samples]
+            self.padding += max(lengths) * len(lengths) - sum(lengths)
+            return torch.nn.utils.rnn.pad_sequence([s["x"] for s in samples], batch_first=True)
+
+        def on_train_epoch_start(self):
+            batch_sampler = self.trainer.train_dataloader.loaders.batch_sampler
+            self.epochs.append(list(batch_sampler))
+
+        def training_step(self, batch, batch_idx):
+            return super().training_step(batch.sum(1), batch_idx)
+
+    model = TestModel()
+    trainer = Trainer(default_root_dir=tmpdir, max_epochs=2, limit_val_batches=0, bucket_length_key=bucket_length_key)
+    trainer.fit(model)
+    assert trainer.num_training_batches == 16
+    # a bucket of 100 batches covers the whole dataset, the batches are sorted slices of it: less than one padded
+    # step per sample over the 2 epochs, where random batches of lengths from 1 to 31 pad about 10 steps per sample
+    assert model.padding < 2 * 64
+    # the batches are shuffled across epochs
+    assert model.epochs[0] != model.epochs[1]
+
+
+def test_bucket_length_key_lengths():
+    """Test that `Trainer(bucket_length_key)` reads the lengths from the samples once, or takes them as they are"""
+
+    class CountingDataset(VariableLengthDataset):
+
+        def __init__(self, size: int):
+            super().__init__(size)
+            self.calls = 0
+
+        def __getitem__(self, index):
+            self.calls += 1
+            return super().__getitem__(index)
+
+    dataset = CountingDataset(64)
+    trainer = Trainer(bucket_length_key="x")
+    for _ in range(2):
+        dataloader = trainer.auto_add_sampler(DataLoader(dataset, batch_size=4, shuffle=True), shuffle=True)
+        assert dataloader.batch_sampler.lengths == dataset.lengths.tolist()
+        assert dataloader.batch_sampler.shuffle
+    assert dataset.calls == 64
+
+    dataset = CountingDataset(64)
+    trainer = Trainer(bucket_length_key=dataset.lengths.tolist())
+    dataloader = trainer.auto_add_sampler(DataLoader(dataset, batch_size=4), shuffle=True)
+    assert dataset.calls == 0
+    # the order of a dataloader which does not shuffle is kept
+    assert not dataloader.batch_sampler.shuffle
+
+    trainer = Trainer(bucket_length_key=[1, 2])
+    with pytest.raises(MisconfigurationException, match="holds 2 lengths but the train dataset has 64 samples"):
+        trainer.auto_add_sampler(DataLoader(dataset, batch_size=4), shuffle=True)
+
+
+def test_bucket_length_key_custom_sampler(tmpdir):
+    """Test that `Trainer(bucket_length_key)` does not replace a custom sampler"""
+    model = BoringModel()
+    model.train_dataloader = lambda: DataLoader(
+        RandomDataset(32, 64), sampler=DistributedSampler(RandomDataset(32, 64), num_replicas=1, rank=0)
+    )
+    trainer = Trainer(default_root_dir=tmpdir, fast_dev_run=1, bucket_length_key=len)
+    with pytest.raises(MisconfigurationException, match="since `bucket_length_key` is set"):
+        trainer.fit(model)
+
+    with pytest.raises(MisconfigurationException, match="should be a key of the samples, a callable or the lengths"):
+        Trainer(bucket_length_key=1)
+
+
+def test_dynamic_batch_sampler_predict(tmpdir):
+    """Test that the prediction packs the samples of its distributed sampler up to a budget of tokens"""
+    dataset = VariableLengthDataset(32)
+    lengths = dataset.lengths.tolist()
+    dataloader = DataLoader(
+        dataset,
+        batch_sampler=DynamicBatchSampler(SequentialSampler(dataset), lengths, max_tokens=64),
+        collate_fn=lambda samples: torch.nn.utils.rnn.pad_sequence([s["x"] for s in samples], batch_first=True),
+    )
+
+    trainer = Trainer(default_root_dir=tmpdir)
+    sampler = UnrepeatedDistributedSampler(dataset, num_replicas=2, rank=1, shuffle=False)
+    new_dataloader = trainer.replace_sampler(dataloader, sampler, mode=RunningStage.PREDICTING)
+    batch_sampler = new_dataloader.batch_sampler
+    assert isinstance(batch_sampler, IndexBatchSamplerWrapper)
+    assert batch_sampler.sampler is sampler
+    assert list(batch_sampler) == list(DynamicBatchSampler(sampler, lengths, max_tokens=64))
+
+    class TestModel(BoringModel):
+
+        def predict_step(self, batch, batch_idx, dataloader_idx=None):
+            assert batch.shape[0] * batch.shape[1] <= 64
+            return batch.shape[0]
+
+    predictions = trainer.predict(TestModel(), dataloaders=dataloader)
+    assert sum(predictions) == 32
+    assert len(predictions) == len(dataloader.batch_sampler)
+
+
 @pytest.mark.parametrize('check_interval', [1.0])
 def test_val_dataloader_not_implemented_error(tmpdir, check_interval):
     """Test not_implemented_error data loader (e.g. IterableDataset)"""
@@ -1686,3 +1857,59 @@ def test_request_dataloader(tmpdir):
     assert model.on_train_batch_start_called
     assert model.on_val_dataloader_called
     assert model.on_val_batch_start_called
+
+
+@pytest.mark.parametrize("device", ["cpu", pytest.param("cuda", marks=RunIf(min_gpus=1))])
+def test_prefetch_batches(tmpdir, device):
+    """Test that the batches are transferred ahead of time, in a background thread, when `prefetch_batches` is set."""
+
+    class TestModel(BoringModel):
+
+        def __init__(self):
+            super().__init__()
+            self.transfer_threads = []
+            self.batch_devices = []
+
+        def on_after_batch_transfer(self, batch, dataloader_idx):
+            self.transfer_threads.append((threading.current_thread(), dataloader_idx))
+            return batch
+
+        def training_step(self, batch, batch_idx):
+            self.batch_devices.append(batch.device)
+            return super().training_step(batch, batch_idx)
+
+        def validation_step(self, batch, batch_idx, dataloader_idx=None):
+            self.batch_devices.append(batch.device)
+            return super().validation_step(batch, batch_idx)
+
+        def validation_epoch_end(self, outputs):
+            pass
+
+        def val_dataloader(self):
+            return [super().val_dataloader(), super().val_dataloader()]
+
+    model = TestModel()
+    trainer = Trainer(
+        default_root_dir=tmpdir,
+        max_epochs=2,
+        limit_train_batches=5,
+        limit_val_batches=2,
+        num_sanity_val_steps=0,
+        prefetch_batches=2,
+        gpus=int(device == "cuda"),
+    )
+    trainer.fit(model)
+
+    # the batches fetched ahead of the limit are transferred too
+    assert trainer.global_step == 10
+    assert len(model.transfer_threads) >= 10 + 2 * 2 * 2
+    assert all(thread is not threading.main_thread() for thread, _ in model.transfer_threads)
+    assert {idx for _, idx in model.transfer_threads} == {0, 1}
+    assert len(model.batch_devices) == 10 + 2 * 2 * 2
+    assert all(d.type == device for d in model.batch_devices)
+    assert not any(t.name == "BatchPrefetcher" for t in threading.enumerate())
+
+
+def test_prefetch_batches_error(tmpdir):
+    with pytest.raises(MisconfigurationException, match="`prefetch_batches` should be an int >= 0"):
+        Trainer(prefetch_batches=-1)
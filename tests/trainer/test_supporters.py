@@ -12,6 +12,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import os
+import threading
+import time
 from collections import Sequence
 from unittest import mock
 
@@ -20,7 +22,7 @@ import torch
 from torch.utils.data import DataLoader, TensorDataset
 from torch.utils.data.dataset import Dataset, IterableDataset
 from torch.utils.data.distributed import DistributedSampler
-from torch.utils.data.sampler import Sampler
+from torch.utils.data.sampler import BatchSampler, RandomSampler, Sampler, SequentialSampler
 
 from pytorch_lightning import Trainer
 from pytorch_lightning.trainer.supporters import (
@@ -29,8 +31,10 @@ from pytorch_lightning.trainer.supporters import (
     CombinedLoader,
     CombinedLoaderIterator,
     CycleIterator,
+    FastForwardSampler,
     prefetch_iterator,
     TensorRunningAccum,
+    transfer_prefetch_iterator,
 )
 from pytorch_lightning.utilities.apply_func import apply_to_collection
 from pytorch_lightning.utilities.exceptions import MisconfigurationException
@@ -103,6 +107,49 @@ def test_prefetch_iterator():
     assert list(iterator) == []
 
 
+def test_transfer_prefetch_iterator():
+    """Test that the items are transferred ahead of time in a background thread, at most `prefetch_batches` ahead."""
+    fetched, threads = [], []
+
+    def generate():
+        for i in range(5):
+            fetched.append(i)
+            yield i
+
+    def transfer(item):
+        threads.append(threading.current_thread())
+        return item * 10
+
+    iterator = transfer_prefetch_iterator(generate(), transfer, prefetch_batches=2, device=torch.device("cpu"))
+    assert next(iterator) == (0, False)
+    time.sleep(0.1)
+    # one host-side item is looked ahead to find the last one
+    assert len(fetched) <= 1 + 2 + 1
+    assert list(iterator) == [(10, False), (20, False), (30, False), (40, True)]
+    assert all(t is threads[0] for t in threads)
+    assert threads[0] is not threading.current_thread()
+    assert not threads[0].is_alive()
+
+    # stopping early ends the thread
+    iterator = transfer_prefetch_iterator(generate(), transfer, prefetch_batches=2, device=torch.device("cpu"))
+    next(iterator)
+    iterator.close()
+    assert not threads[-1].is_alive()
+
+    # errors are raised in the calling thread
+    def fail(item):
+        raise ValueError("transfer failed")
+
+    iterator = transfer_prefetch_iterator(generate(), fail, prefetch_batches=1, device=torch.device("cpu"))
+    with pytest.raises(ValueError, match="transfer failed"):
+        next(iterator)
+
+    # other devices are transferred in the calling thread
+    iterator = transfer_prefetch_iterator(generate(), transfer, prefetch_batches=1, device=torch.device("meta"))
+    assert list(iterator)[-1] == (40, True)
+    assert threads[-1] is threading.current_thread()
+
+
 @pytest.mark.parametrize(
     ["dataset_1", "dataset_2"],
     [
@@ -237,6 +284,135 @@ def test_combined_loader_sequence_max_size_cycle():
     assert idx == len(combined_loader) - 1
 
 
+def _fetched_keys(combined_loader):
+    return [next(k for k, v in batch.items() if v is not None) for batch in combined_loader]
+
+
+def test_combined_loader_sequential_round_robin():
+    """Test `CombinedLoader` in the modes which fetch a batch from a single loader at each step"""
+    loaders = {
+        "a": DataLoader(range(6), batch_size=4),
+        "b": DataLoader(range(15), batch_size=5),
+        "c": {
+            "x": DataLoader(range(4), batch_size=2),
+            "y": DataLoader(range(12), batch_size=2)
+        },
+    }
+
+    combined_loader = CombinedLoader(loaders, "sequential")
+    assert len(combined_loader) == 2 + 3 + 2
+    assert _fetched_keys(combined_loader) == ["a"] * 2 + ["b"] * 3 + ["c"] * 2
+
+    combined_loader = CombinedLoader(loaders, "round_robin")
+    assert len(combined_loader) == 2 + 3 + 2
+    batches = list(combined_loader)
+    assert [next(k for k, v in b.items() if v is not None) for b in batches] == ["a", "b", "c", "a", "b", "c", "b"]
+    assert batches[0] == {"a": batches[0]["a"], "b": None, "c": None}
+    # the nested loaders are fetched from together
+    assert torch.equal(batches[5]["c"]["x"], torch.tensor([2, 3]))
+    assert torch.equal(batches[5]["c"]["y"], torch.tensor([2, 3]))
+
+    # sequences of loaders keep their positions
+    batches = list(CombinedLoader([loaders["a"], loaders["b"]], "round_robin"))
+    assert len(batches) == 5
+    assert batches[0][1] is None and torch.equal(batches[1][1], torch.tensor([0, 1, 2, 3, 4]))
+
+
+def test_combined_loader_weighted_random():
+    """Test that the 'weighted_random' mode draws the loaders with the given weights and exhausts all of them"""
+    loaders = {"a": DataLoader(range(100)), "b": DataLoader(range(300)), "c": DataLoader(range(2))}
+    combined_loader = CombinedLoader(loaders, "weighted_random", weights={"a": 1, "b": 3, "c": 0}, seed=1)
+    assert len(combined_loader) == 402
+    assert combined_loader._sampling_probabilities() == [0.25, 0.75, 0.0]
+
+    keys = _fetched_keys(combined_loader)
+    assert keys.count("a") == 100 and keys.count("b") == 300
+    # "b" is drawn three times as often while both are left, "c" is only fetched once the others are exhausted
+    assert 30 < keys[:200].count("a") < 70
+    assert keys[-2:] == ["c", "c"]
+    # the same seed draws the same sequence, but every epoch draws a different one
+    assert _fetched_keys(CombinedLoader(loaders, "weighted_random", weights={"a": 1, "b": 3, "c": 0}, seed=1)) == keys
+    assert _fetched_keys(combined_loader) != keys
+
+    # by default, the weights are the numbers of batches
+    assert CombinedLoader(loaders, "weighted_random")._sampling_probabilities() == [100 / 402, 300 / 402, 2 / 402]
+
+    combined_loader = CombinedLoader(loaders, "weighted_random", weights={"a": 1, "b": 4, "c": 1}, temperature=2.0)
+    assert combined_loader._sampling_probabilities() == [0.25, 0.5, 0.25]
+
+    with pytest.raises(MisconfigurationException, match="one entry per loader"):
+        iter(CombinedLoader(loaders, "weighted_random", weights=[1, 2]))
+    with pytest.raises(MisconfigurationException, match="only supported in the 'weighted_random' mode"):
+        CombinedLoader(loaders, "round_robin", weights=[1, 2, 3])
+    with pytest.raises(MisconfigurationException, match="`temperature` should be > 0"):
+        CombinedLoader(loaders, "weighted_random", temperature=0)
+
+
+@pytest.mark.parametrize("mode", ["sequential", "round_robin", "weighted_random"])
+def test_combined_loader_alternating_state_dict(mode):
+    """Test that an alternating `CombinedLoader` continues its sequence of loaders from its state"""
+    loaders = [DataLoader(range(5)), DataLoader(range(3)), DataLoader(range(8))]
+    combined_loader = CombinedLoader(loaders, mode)
+    expected = [[i for i, v in enumerate(batch) if v is not None][0] for batch in combined_loader]
+
+    combined_loader = CombinedLoader(loaders, mode)
+    iterator = iter(combined_loader)
+    fetched = [[i for i, v in enumerate(next(iterator)) if v is not None][0] for _ in range(7)]
+    state_dict = combined_loader.state_dict()
+    assert state_dict["fetched"] == [fetched.count(i) for i in range(3)]
+
+    combined_loader = CombinedLoader(loaders, mode)
+    combined_loader.load_state_dict(state_dict)
+    fetched += [[i for i, v in enumerate(batch) if v is not None][0] for batch in combined_loader]
+    assert fetched == expected
+
+    # the following epoch starts over
+    assert len(list(combined_loader)) == len(combined_loader) == 16
+
+
+def test_fast_forward_sampler():
+    """Test that the `FastForwardSampler` continues a pass over a random sampler from its state"""
+    assert FastForwardSampler.supports(RandomSampler(range(10)))
+    assert FastForwardSampler.supports(SequentialSampler(range(10)))
+    assert not FastForwardSampler.supports(list(range(10)))
+
+    sampler = FastForwardSampler(RandomSampler(range(10)), batch_size=3)
+    batch_sampler = BatchSampler(sampler, batch_size=3, drop_last=False)
+    sampler.reset()
+    expected = [list(batch_sampler) for _ in range(3)]
+    # the seed of the sampler is not changed
+    assert sampler.sampler.generator is None
+
+    # continue the second pass after two batches
+    state_dict = sampler.state_dict(pass_idx=1, num_batches=2)
+    assert state_dict["pass"] == 1
+    assert state_dict["num_batches"] == 2
+
+    torch.manual_seed(123)
+    sampler = FastForwardSampler(RandomSampler(range(10)), batch_size=3)
+    batch_sampler = BatchSampler(sampler, batch_size=3, drop_last=False)
+    sampler.load_state_dict(state_dict)
+    assert list(batch_sampler) == expected[1][2:]
+    assert sampler.sampler.generator is None
+
+
+def test_fast_forward_sampler_keeps_order():
+    """Test that wrapping a sampler in a `FastForwardSampler` does not change the indices it draws"""
+    torch.manual_seed(1)
+    batch_sampler = BatchSampler(RandomSampler(range(10)), batch_size=3, drop_last=False)
+    expected = [list(batch_sampler) for _ in range(4)]
+
+    torch.manual_seed(1)
+    sampler = FastForwardSampler(RandomSampler(range(10)), batch_size=3)
+    batch_sampler = BatchSampler(sampler, batch_size=3, drop_last=False)
+    passes = []
+    for _ in range(2):
+        # an epoch of two passes
+        sampler.reset()
+        passes += [list(batch_sampler) for _ in range(2)]
+    assert passes == expected
+
+
 @pytest.mark.parametrize(
     ["input_data", "compute_func", "expected_length"],
     [
@@ -20,7 +20,14 @@ import numpy as np
 import pytest
 import torch
 
-from pytorch_lightning.utilities.apply_func import apply_to_collection, apply_to_collections
+from pytorch_lightning.utilities.apply_func import (
+    _apply_to_collection,
+    _transfer_coalesced,
+    apply_to_collection,
+    apply_to_collections,
+    move_data_to_device,
+)
+from tests.helpers.runif import RunIf
 
 
 def test_recursive_application_to_collection():
@@ -154,6 +161,115 @@ def test_apply_to_collection_include_none():
     assert reduced == [3.4, 5.6]
 
 
+def test_apply_to_collection_flattened():
+    """Test that the flattened collections are rebuilt the same as by the recursive implementation."""
+    ntc = namedtuple('Foo', ['bar', 'baz'])
+
+    @dataclasses.dataclass
+    class Feature:
+        input_ids: torch.Tensor
+        mask: List[bool]
+
+    class CustomList(list):
+        pass
+
+    def make_batch():
+        return {
+            'a': torch.tensor(1.),
+            'b': [torch.tensor(2.), 'str', None, []],
+            'c': (torch.tensor(3.), ),
+            'd': ntc(bar=torch.tensor(4.), baz=OrderedDict([(1, torch.tensor(5.)), ('x', 6)])),
+            'e': Feature(torch.tensor([7.]), [True]),
+            'f': CustomList([torch.tensor(8.)]),
+            'g': torch.Size([2, 3]),
+            ('h', 0): {},
+        }
+
+    def function(x, offset=0):
+        return x * 2 + offset
+
+    expected = _apply_to_collection(make_batch(), torch.Tensor, function, offset=1)
+    for _ in range(3):
+        result = apply_to_collection(make_batch(), torch.Tensor, function, offset=1)
+        assert repr(result) == repr(expected)
+        assert type(result['d']) is ntc and type(result['f']) is CustomList and type(result['g']) is torch.Size
+
+    # the keys of the rebuilt mappings are the ones of the collection, not equal keys of a previous call
+    tensor = torch.tensor(1.)
+    for key in (True, 1.0, 1):
+        (result_key, ) = apply_to_collection({key: tensor}, torch.Tensor, function)
+        assert type(result_key) is type(key)
+
+    nested = torch.tensor(1.)
+    for _ in range(300):
+        nested = [nested]
+    result = apply_to_collection(nested, torch.Tensor, function)
+    for _ in range(300):
+        result = result[0]
+    assert result == 2
+
+
+def test_transfer_coalesced():
+    tensors = [torch.arange(6.).view(2, 3), torch.tensor(7.), torch.empty(0, 2), torch.ones(2, 1, 2)]
+    moved = _transfer_coalesced(tensors, torch.device("cpu"))
+    assert len(moved) == len(tensors)
+    for tensor, result in zip(tensors, moved):
+        assert torch.equal(tensor, result)
+        assert result.shape == tensor.shape
+    # all the results are views of a single buffer
+    assert all(result._base is moved[0]._base is not None for result in moved)
+
+
+def test_move_data_to_device_coalesced():
+    """Test that tensors with the same dtype are copied with a single transfer, using the meta device as a fake
+    device."""
+    device = torch.device("meta")
+    batch = {
+        "x": torch.rand(2, 3),
+        "y": [torch.rand(4), torch.tensor([1, 2, 3])],
+        "mask": torch.tensor([True, False]),
+        "z": (torch.rand(5, requires_grad=True), torch.zeros(1, 1)),
+        "id": "a",
+        "lengths": torch.tensor([4, 5]),
+    }
+    result = move_data_to_device(batch, device, coalesce=True)
+
+    assert result["id"] == "a"
+    flat_batch, flat_result = [], []
+    apply_to_collection(batch, torch.Tensor, flat_batch.append)
+    apply_to_collection(result, torch.Tensor, flat_result.append)
+    for tensor, moved in zip(flat_batch, flat_result):
+        assert moved.device == device
+        assert moved.shape == tensor.shape
+        assert moved.dtype == tensor.dtype
+
+    # the float tensors share a buffer, except the one that requires grad
+    assert result["x"]._base is result["y"][0]._base is result["z"][1]._base is not None
+    assert result["z"][0]._base is None
+    # the integer tensors share a buffer as well
+    assert result["lengths"]._base is result["y"][1]._base is not None
+    # a single tensor of its dtype is moved on its own
+    assert result["mask"]._base is None
+
+    # tensors already on the device are left untouched
+    on_device = [torch.empty(2, device=device), torch.empty(3, device=device)]
+    result = move_data_to_device(on_device, device, coalesce=True)
+    assert result[0] is on_device[0] and result[1] is on_device[1]
+
+
+@RunIf(min_gpus=1)
+def test_move_data_to_device_coalesced_gpu():
+    device = torch.device("cuda", 0)
+    batch = [torch.rand(3, 2) for _ in range(4)] + [torch.arange(5)]
+    for _ in range(3):
+        # the pinned buffer is reused across calls
+        result = move_data_to_device(batch, device, coalesce=True)
+        torch.cuda.synchronize()
+        for tensor, moved in zip(batch, result):
+            assert moved.device == device
+            assert torch.equal(tensor, moved.cpu())
+
+
 def test_apply_to_collections():
     to_reduce_1 = {'a': {'b': [1, 2]}, 'c': 5}
     to_reduce_2 = {'a': {'b': [3, 4]}, 'c': 6}
@@ -0,0 +1,175 @@
+# Copyright The PyTorch Lightning team.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import os
+from unittest import mock
+
+import fsspec
+import pytest
+import torch
+
+from pytorch_lightning.plugins import SingleDevicePlugin
+from pytorch_lightning.utilities.cloud_io import _load_memory_mapped, atomic_save
+from pytorch_lightning.utilities.cloud_io import load as pl_load
+from pytorch_lightning.utilities.incremental_checkpoint import IncrementalCheckpointer
+
+
+@pytest.mark.parametrize("protocol", ["", "file://", "memory://"])
+def test_atomic_save(tmpdir, protocol):
+    if protocol == "memory://":
+        filepath = f"memory://{tmpdir.basename}/model.ckpt"
+    else:
+        filepath = protocol + os.path.join(tmpdir, "model.ckpt")
+    checkpoint = {"state_dict": {"weight": torch.rand(4, 4)}, "epoch": 3}
+
+    atomic_save(checkpoint, filepath)
+    loaded = pl_load(filepath)
+
+    assert loaded["epoch"] == 3
+    assert torch.equal(loaded["state_dict"]["weight"], checkpoint["state_dict"]["weight"])
+    fs = fsspec.open(filepath).fs
+    # no temporary files are left behind
+    assert [os.path.basename(f) for f in fs.ls(os.path.dirname(fs._strip_protocol(filepath)))] == ["model.ckpt"]
+
+
+def test_atomic_save_keeps_previous_file_on_failure(tmpdir):
+    filepath = os.path.join(tmpdir, "model.ckpt")
+    atomic_save({"epoch": 0}, filepath)
+
+    def partial_save(obj, f, **kwargs):
+        f.write(b"incomplete")
+        raise RuntimeError("interrupted")
+
+    with mock.patch("torch.save", side_effect=partial_save), pytest.raises(RuntimeError, match="interrupted"):
+        atomic_save({"epoch": 1}, filepath)
+
+    assert pl_load(filepath)["epoch"] == 0
+    assert os.listdir(tmpdir) == ["model.ckpt"]
+
+
+def test_atomic_save_concurrent_writers(tmpdir):
+    """ Test that concurrent writers of the same file do not write into the same temporary file. """
+    filepath = os.path.join(tmpdir, "model.ckpt")
+    save = torch.save
+
+    def interleaved_save(obj, f, **kwargs):
+        save(obj, f, **kwargs)
+        if obj["epoch"] == 0:
+            # another writer saves the same file before this one is renamed
+            atomic_save({"epoch": 1}, filepath)
+
+    with mock.patch("torch.save", side_effect=interleaved_save):
+        atomic_save({"epoch": 0}, filepath)
+
+    assert pl_load(filepath)["epoch"] == 0
+    assert os.listdir(tmpdir) == ["model.ckpt"]
+
+
+@pytest.mark.skipif(os.name == "nt", reason="checkpoints are not memory-mapped on Windows")
+def test_load_memory_mapped(tmpdir):
+    weight = torch.rand(8, 8)
+    checkpoint = {
+        "state_dict": {"weight": weight, "row": weight[2], "half": torch.rand(3).bfloat16(), "empty": torch.empty(0)},
+        "optimizer_states": [{"state": {0: {"step": 3, "exp_avg": torch.rand(16)}}}],
+        "epoch": 3,
+    }
+    filepath = os.path.join(tmpdir, "model.ckpt")
+    atomic_save(checkpoint, filepath)
+
+    with mock.patch("torch.load") as torch_load:
+        loaded = pl_load(filepath, map_location=lambda storage, loc: storage, mmap=True)
+    torch_load.assert_not_called()
+
+    assert loaded["epoch"] == 3
+    for key, tensor in checkpoint["state_dict"].items():
+        assert loaded["state_dict"][key].dtype == tensor.dtype
+        assert torch.equal(loaded["state_dict"][key], tensor)
+    # views keep sharing their storage
+    assert loaded["state_dict"]["row"].storage().data_ptr() == loaded["state_dict"]["weight"].storage().data_ptr()
+    exp_avg = checkpoint["optimizer_states"][0]["state"][0]["exp_avg"]
+    assert torch.equal(loaded["optimizer_states"][0]["state"][0]["exp_avg"], exp_avg)
+
+    # the mapping is copy-on-write, the file is left untouched
+    loaded["state_dict"]["weight"].add_(1)
+    assert torch.equal(pl_load(filepath, mmap=True)["state_dict"]["weight"], weight)
+
+
+def test_load_memory_mapped_legacy_format(tmpdir):
+    """ Test that checkpoints which cannot be memory-mapped are loaded regularly. """
+    filepath = os.path.join(tmpdir, "model.ckpt")
+    torch.save({"weight": torch.ones(2)}, filepath, _use_new_zipfile_serialization=False)
+
+    assert torch.equal(pl_load(filepath, mmap=True)["weight"], torch.ones(2))
+
+
+@pytest.mark.skipif(os.name == "nt", reason="checkpoints are not memory-mapped on Windows")
+def test_load_memory_mapped_quantized(tmpdir):
+    """ Test that checkpoints with storages which cannot be memory-mapped are loaded regularly. """
+    quantized = torch.quantize_per_tensor(torch.rand(4), scale=0.1, zero_point=0, dtype=torch.qint8)
+    filepath = os.path.join(tmpdir, "model.ckpt")
+    atomic_save({"state_dict": {"weight": torch.ones(2), "quantized": quantized}}, filepath)
+
+    with pytest.warns(UserWarning, match="Could not memory-map"):
+        loaded = pl_load(filepath, map_location=lambda storage, loc: storage, mmap=True)
+    assert torch.equal(loaded["state_dict"]["weight"], torch.ones(2))
+    assert torch.equal(loaded["state_dict"]["quantized"].int_repr(), quantized.int_repr())
+    assert loaded["state_dict"]["quantized"].q_scale() == quantized.q_scale()
+
+    # other errors are not hidden behind the fallback
+    with mock.patch("pytorch_lightning.utilities.cloud_io._load_memory_mapped", side_effect=OSError("disk")):
+        with pytest.raises(OSError, match="disk"):
+            pl_load(filepath, mmap=True)
+
+
+@pytest.mark.skipif(os.name == "nt", reason="checkpoints are not memory-mapped on Windows")
+def test_load_checkpoint_file_mmap_opt_in(tmpdir):
+    """ Test that the training type plugins only memory-map the checkpoints they restore when asked to. """
+    filepath = os.path.join(tmpdir, "model.ckpt")
+    atomic_save({"state_dict": {"weight": torch.ones(2)}}, filepath)
+    plugin = SingleDevicePlugin(torch.device("cpu"))
+    assert not plugin.mmap_checkpoint
+
+    with mock.patch("pytorch_lightning.utilities.cloud_io._load_memory_mapped", wraps=_load_memory_mapped) as load:
+        assert torch.equal(plugin.load_checkpoint_file(filepath)["state_dict"]["weight"], torch.ones(2))
+        load.assert_not_called()
+        plugin.mmap_checkpoint = True
+        assert torch.equal(plugin.load_checkpoint_file(filepath)["state_dict"]["weight"], torch.ones(2))
+        load.assert_called_once()
+
+
+@pytest.mark.parametrize("mmap", [False, True])
+def test_load_incremental(tmpdir, mmap):
+    model = torch.nn.Sequential(torch.nn.Linear(4, 4), torch.nn.BatchNorm1d(4))
+    checkpoint = {"state_dict": model.state_dict(), "half": torch.ones(2, dtype=torch.bfloat16), "epoch": 0}
+    checkpointer = IncrementalCheckpointer()
+    base_path = checkpointer.set_base(checkpoint, str(tmpdir))
+    atomic_save(checkpoint, base_path)
+
+    with torch.no_grad():
+        model[0].bias.add_(1)
+    checkpoint = {"state_dict": model.state_dict(), "half": torch.ones(2, dtype=torch.bfloat16), "epoch": 1}
+    filepath = str(tmpdir / "sub" / "epoch=1.ckpt")
+    os.makedirs(os.path.dirname(filepath))
+    incremental = checkpointer.to_incremental(checkpoint, filepath)
+    # only the changed tensor is stored
+    assert [k for k, v in incremental["state_dict"].items() if isinstance(v, torch.Tensor)] == ["0.bias"]
+    assert not isinstance(incremental["half"], torch.Tensor)
+    atomic_save(incremental, filepath)
+
+    loaded = pl_load(filepath, mmap=mmap)
+    assert loaded.keys() == checkpoint.keys()
+    assert loaded["epoch"] == 1
+    assert loaded["state_dict"]._metadata == checkpoint["state_dict"]._metadata
+    for k, v in checkpoint["state_dict"].items():
+        assert torch.equal(loaded["state_dict"][k], v)
+    assert torch.equal(loaded["half"], checkpoint["half"])
@@ -0,0 +1,132 @@
+# Copyright The PyTorch Lightning team.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import os
+from unittest import mock
+
+import pytest
+import torch
+from torch.utils.data import DataLoader, Dataset
+
+from pytorch_lightning.utilities.data_cache import _cached_files, CachedDataset, dataset_fingerprint
+from tests.helpers.boring_model import RandomIterableDataset
+
+
+class CountingDataset(Dataset):
+
+    def __init__(self, length=8, size=16):
+        self.length = length
+        self.size = size
+        self.calls = []
+
+    def __getitem__(self, index):
+        self.calls.append(index)
+        return {"x": torch.full((self.size, ), float(index)), "index": index}
+
+    def __len__(self):
+        return self.length
+
+
+def test_cached_dataset(tmpdir):
+    """Test that the samples are computed once and served from the cache afterwards, across instances"""
+    dataset = CountingDataset()
+    cached = CachedDataset(dataset, tmpdir, config={"size": 16}, fingerprint="v1")
+    assert len(cached) == 8
+
+    for _ in range(2):
+        for batch in DataLoader(cached, batch_size=4, shuffle=True):
+            assert torch.equal(batch["x"][:, 0], batch["index"].float())
+    assert sorted(dataset.calls) == list(range(8))
+    assert len(os.listdir(os.path.join(tmpdir, cached.fingerprint))) == 8
+
+    # a later run reuses the cache
+    dataset = CountingDataset()
+    cached = CachedDataset(dataset, tmpdir, config={"size": 16}, fingerprint="v1")
+    assert torch.equal(cached[3]["x"], torch.full((16, ), 3.))
+    assert dataset.calls == []
+
+    # a different preprocessing does not
+    cached = CachedDataset(dataset, tmpdir, config={"size": 32}, fingerprint="v1")
+    cached[3]
+    assert dataset.calls == [3]
+
+
+@pytest.mark.parametrize("content", [b"", b"not a checkpoint"])
+def test_cached_dataset_corrupted_file(tmpdir, content):
+    """Test that a truncated or corrupted file of the cache is recomputed"""
+    dataset = CountingDataset()
+    cached = CachedDataset(dataset, tmpdir, fingerprint="v1", max_bytes=2**20)
+    cached[3]
+    path = os.path.join(tmpdir, cached.fingerprint, "3.pt")
+    with open(path, "wb") as f:
+        f.write(content)
+
+    assert torch.equal(cached[3]["x"], torch.full((16, ), 3.))
+    assert dataset.calls == [3, 3]
+    # the recomputed sample is cached again
+    assert torch.equal(cached[3]["x"], torch.full((16, ), 3.))
+    assert dataset.calls == [3, 3]
+
+
+def test_cached_dataset_evicted_after_write(tmpdir):
+    """Test that a file evicted by another process right after it was written is a miss"""
+    dataset = CountingDataset()
+    cached = CachedDataset(dataset, tmpdir, fingerprint="v1", max_bytes=2**20)
+    with mock.patch("os.path.getsize", side_effect=FileNotFoundError):
+        assert torch.equal(cached[3]["x"], torch.full((16, ), 3.))
+    assert cached._size == 0
+
+
+def test_cached_dataset_without_fingerprint(tmpdir):
+    """Test that caching a dataset identified by its type and length only warns"""
+    with pytest.warns(UserWarning, match="only keyed by its type and length"):
+        CachedDataset(CountingDataset(), tmpdir)
+
+
+def test_dataset_fingerprint():
+    dataset = CountingDataset()
+    assert dataset_fingerprint(dataset) == dataset_fingerprint(CountingDataset())
+    assert dataset_fingerprint(dataset) != dataset_fingerprint(CountingDataset(length=4))
+    assert dataset_fingerprint(dataset) != dataset_fingerprint(dataset, config={"size": 16})
+    assert dataset_fingerprint(dataset) != dataset_fingerprint(dataset, fingerprint="abc")
+
+
+def test_cached_dataset_lru(tmpdir):
+    """Test that the least recently used samples are evicted to fit in the budget"""
+    dataset = CountingDataset(size=1024)
+    cached = CachedDataset(dataset, tmpdir, fingerprint="v1")
+    cached[0]
+    sample_bytes = os.path.getsize(os.path.join(tmpdir, cached.fingerprint, "0.pt"))
+
+    cached = CachedDataset(dataset, tmpdir, fingerprint="v1", max_bytes=int(3.5 * sample_bytes))
+    for index, mtime in ((1, 1), (2, 2)):
+        cached[index]
+        os.utime(os.path.join(tmpdir, cached.fingerprint, f"{index}.pt"), (mtime, mtime))
+    os.utime(os.path.join(tmpdir, cached.fingerprint, "0.pt"), (3, 3))
+    # reading a sample marks it as the most recently used
+    cached[1]
+    cached[3]
+
+    cached_indices = {int(os.path.basename(path)[:-3]) for _, _, path in _cached_files(str(tmpdir))}
+    assert cached_indices == {0, 1, 3}
+    assert cached._size <= cached.max_bytes
+
+    # the evicted sample is computed again
+    dataset.calls.clear()
+    assert cached[2]["index"] == 2
+    assert dataset.calls == [2]
+
+
+def test_cached_dataset_iterable(tmpdir):
+    with pytest.raises(ValueError, match="only supports map-style datasets"):
+        CachedDataset(RandomIterableDataset(32, 4), tmpdir)
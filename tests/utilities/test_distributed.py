@@ -16,6 +16,23 @@ from typing import Mapping
 from unittest import mock
 
 import pytest
+import torch
+from torch.nn.parallel import DistributedDataParallel
+
+from pytorch_lightning.plugins import DDPPlugin
+from pytorch_lightning.plugins.environments.lightning_environment import find_free_network_port
+from pytorch_lightning.utilities.distributed import (
+    all_gather_ddp_if_available,
+    CollectiveHandle,
+    gather_all_tensors,
+    hierarchical_allreduce_hook,
+    HierarchicalGroups,
+    ReduceOp,
+    sync_ddp,
+    sync_ddp_if_available,
+)
+from pytorch_lightning.utilities.exceptions import MisconfigurationException
+from tests.helpers.runif import RunIf
 
 
 @pytest.mark.parametrize("env_vars", [{"RANK": "0"}, {"SLURM_PROCID": "0"}])
@@ -54,3 +71,109 @@ def test_rank_zero_none_set(rank_key, rank):
 
         x = foo()
         assert x is None
+
+
+def _collectives_ddp(rank, world_size, port):
+    os.environ["MASTER_ADDR"] = "localhost"
+    os.environ["MASTER_PORT"] = str(port)
+    torch.distributed.init_process_group("gloo", rank=rank, world_size=world_size)
+
+    with mock.patch("torch.distributed.barrier") as barrier:
+        # variable-size gather
+        gathered = gather_all_tensors(torch.full((rank + 1, 2), float(rank)))
+        assert [t.shape for t in gathered] == [(1, 2), (2, 2)]
+        assert all(torch.equal(t, torch.full_like(t, float(i))) for i, t in enumerate(gathered))
+
+        handle = gather_all_tensors(torch.arange(rank + 2), async_op=True)
+        assert isinstance(handle, CollectiveHandle)
+        assert [t.tolist() for t in handle.wait()] == [[0, 1], [0, 1, 2]]
+
+        # same shapes
+        gathered = gather_all_tensors(torch.tensor(float(rank)))
+        assert gathered == [torch.tensor(0.), torch.tensor(1.)]
+
+        handle = sync_ddp(torch.tensor(float(rank)), reduce_op="mean", async_op=True)
+        assert handle.wait() == 0.5
+        assert handle.is_completed()
+
+        assert sync_ddp_if_available(torch.tensor(float(rank)), reduce_op=ReduceOp.MAX) == 1
+        assert torch.equal(all_gather_ddp_if_available(torch.tensor([rank])), torch.tensor([[0], [1]]))
+    barrier.assert_not_called()
+
+    torch.distributed.destroy_process_group()
+
+
+@RunIf(skip_windows=True)
+def test_collectives_ddp():
+    """Test the collectives without barriers, asynchronous and of tensors of different shapes"""
+    torch.multiprocessing.spawn(_collectives_ddp, args=(2, find_free_network_port()), nprocs=2)
+
+
+def test_collectives_not_distributed():
+    handle = sync_ddp_if_available(torch.tensor(1.), async_op=True)
+    assert handle.is_completed()
+    assert handle.wait() == 1
+
+
+def _hierarchical_all_reduce_ddp(rank, world_size, port, num_nodes):
+    os.environ["MASTER_ADDR"] = "localhost"
+    os.environ["MASTER_PORT"] = str(port)
+    torch.distributed.init_process_group("gloo", rank=rank, world_size=world_size)
+    # the processes pretend to be on `num_nodes` nodes
+    processes_per_node = world_size // num_nodes
+    node_rank, local_rank = divmod(rank, processes_per_node)
+    groups = HierarchicalGroups(num_nodes, processes_per_node, node_rank, local_rank)
+
+    with mock.patch("torch.distributed.all_reduce", wraps=torch.distributed.all_reduce) as all_reduce:
+        tensor = torch.arange(4.) * (rank + 1)
+        groups.all_reduce(tensor)
+        assert torch.equal(tensor, torch.arange(4.) * sum(range(1, world_size + 1)))
+        # only the local ranks 0 communicate across the nodes
+        assert all_reduce.call_count == (1 if local_rank == 0 else 0)
+
+    assert sync_ddp(torch.tensor(float(rank)), group=groups, reduce_op=ReduceOp.MAX) == world_size - 1
+    handle = sync_ddp(torch.tensor(float(rank)), group=groups, reduce_op="mean", async_op=True)
+    assert handle.wait() == (world_size - 1) / 2
+    assert handle.is_completed()
+
+    # the asynchronous reductions are pipelined without blocking, each stage launched asynchronously
+    with mock.patch("torch.distributed.reduce", wraps=torch.distributed.reduce) as reduce:
+        tensors = [torch.full((size, ), float(rank)) for size in range(1, 9)]
+        futures = [groups.all_reduce(tensor, async_op=True) for tensor in tensors]
+        assert all(call.kwargs["async_op"] for call in reduce.call_args_list)
+    torch.futures.wait_all(futures)
+    for size, tensor in enumerate(tensors, 1):
+        assert torch.equal(tensor, torch.full((size, ), float(sum(range(world_size)))))
+
+    # the plugin reduces hierarchically by default
+    plugin = DDPPlugin(hierarchical_all_reduce=True)
+    plugin._hierarchical_groups = groups
+    with mock.patch("torch.distributed.all_reduce", wraps=torch.distributed.all_reduce) as all_reduce:
+        assert plugin.reduce(torch.tensor(float(rank)), reduce_op="sum") == sum(range(world_size))
+        assert all_reduce.call_count == (1 if local_rank == 0 else 0)
+
+    # the gradients are the same as with the flat all-reduce
+    torch.manual_seed(0)
+    reference = DistributedDataParallel(torch.nn.Linear(8, 4))
+    torch.manual_seed(0)
+    model = DistributedDataParallel(torch.nn.Linear(8, 4))
+    model.register_comm_hook(groups, hierarchical_allreduce_hook)
+    for ddp_model in (reference, model):
+        ddp_model(torch.full((2, 8), float(rank))).sum().backward()
+    assert torch.allclose(model.module.weight.grad, reference.module.weight.grad)
+
+    torch.distributed.destroy_process_group()
+
+
+@RunIf(skip_windows=True, min_torch="1.9.0")
+@pytest.mark.parametrize("num_nodes", [1, 2, 4])
+def test_hierarchical_all_reduce_ddp(num_nodes):
+    """Test the hierarchical all-reduce with processes pretending to be on several nodes"""
+    torch.multiprocessing.spawn(
+        _hierarchical_all_reduce_ddp, args=(4, find_free_network_port(), num_nodes), nprocs=4
+    )
+
+
+def test_hierarchical_all_reduce_with_comm_hook():
+    with pytest.raises(MisconfigurationException, match="cannot be set together"):
+        DDPPlugin(hierarchical_all_reduce=True, gradient_compression="fp16")
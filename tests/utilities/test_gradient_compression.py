@@ -0,0 +1,158 @@
+# Copyright The PyTorch Lightning team.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import gc
+import os
+import pickle
+
+import pytest
+import torch
+import torch.distributed
+import torch.multiprocessing as mp
+from torch.nn.parallel import DistributedDataParallel
+
+from pytorch_lightning.plugins.environments.lightning_environment import find_free_network_port
+from pytorch_lightning.utilities.exceptions import MisconfigurationException
+from pytorch_lightning.utilities.gradient_compression import (
+    FP16Compression,
+    get_gradient_compression,
+    PowerSGDCompression,
+    TopKCompression,
+)
+from tests.helpers.runif import RunIf
+
+
+def test_get_gradient_compression():
+    assert get_gradient_compression(None) is None
+    assert isinstance(get_gradient_compression("fp16"), FP16Compression)
+    assert isinstance(get_gradient_compression("powersgd"), PowerSGDCompression)
+    compression = TopKCompression(ratio=0.5)
+    assert get_gradient_compression(compression) is compression
+
+    with pytest.raises(MisconfigurationException, match="is not supported"):
+        get_gradient_compression("int8")
+    with pytest.raises(MisconfigurationException, match="`ratio` should be"):
+        TopKCompression(ratio=0)
+
+
+def test_gradient_compression_state_dict():
+    """Test that the error feedback is only restored in the process which saved it"""
+    compression = TopKCompression()
+    compression.iteration = 5
+    compression._error_dict = {0: torch.ones(3)}
+    state_dict = compression.state_dict()
+    assert state_dict["iteration"] == 5
+    assert torch.equal(state_dict["buckets"][0]["error"], torch.ones(3))
+    assert compression.state_dict(error_feedback=False) == {"iteration": 5}
+
+    restored = TopKCompression()
+    restored.restore_checkpoint(compression.dump_checkpoint(rank=1, world_size=2), rank=1, world_size=2)
+    assert restored.iteration == 5
+    assert torch.equal(restored._pending_bucket_states[0]["error"], torch.ones(3))
+
+    restored = TopKCompression()
+    restored.restore_checkpoint(compression.dump_checkpoint(rank=0, world_size=2), rank=1, world_size=2)
+    assert restored.iteration == 5
+    assert not restored._pending_bucket_states
+
+    # the processes of `ddp_spawn` receive the compression without its process group
+    compression.process_group = object()
+    assert pickle.loads(pickle.dumps(compression)).process_group is None
+
+
+def _train(model, steps, rank):
+    optimizer = torch.optim.SGD(model.parameters(), lr=0.1)
+    for _ in range(steps):
+        # different data on every rank
+        x = torch.full((4, 32), float(rank + 1))
+        model(x).sum().backward()
+        optimizer.step()
+        optimizer.zero_grad()
+
+
+def _destroy_process_group():
+    # the DDP reducers and the PowerSGD states left to the interpreter exit sometimes abort the process
+    torch.distributed.barrier()
+    gc.collect()
+    torch.distributed.destroy_process_group()
+
+
+def _gradient_compression_ddp(rank, world_size, port):
+    os.environ["MASTER_ADDR"] = "localhost"
+    os.environ["MASTER_PORT"] = str(port)
+    torch.distributed.init_process_group("gloo", rank=rank, world_size=world_size)
+
+    for compression in (
+        FP16Compression(),
+        PowerSGDCompression(start_iter=2),
+        TopKCompression(ratio=0.1),
+    ):
+        torch.manual_seed(0)
+        model = DistributedDataParallel(torch.nn.Linear(32, 32))
+        compression.register(model)
+        _train(model, steps=4, rank=rank)
+        assert compression.iteration == 4
+
+        # the replicas stay in sync
+        weight = model.module.weight.detach().clone()
+        gathered = [torch.empty_like(weight) for _ in range(world_size)]
+        torch.distributed.all_gather(gathered, weight)
+        assert all(torch.equal(weight, other) for other in gathered)
+
+        state_dict = compression.state_dict()
+        if not isinstance(compression, FP16Compression):
+            # the error feedback is kept per bucket
+            assert state_dict["buckets"][0]["error"].device.type == "cpu"
+
+        restored = type(compression)(**({"start_iter": 2} if isinstance(compression, PowerSGDCompression) else {}))
+        restored.load_state_dict(state_dict)
+        model = DistributedDataParallel(torch.nn.Linear(32, 32))
+        restored.register(model)
+        # the first iteration all-reduces the full gradients, the states are loaded on the next one
+        _train(model, steps=2, rank=rank)
+        assert restored.iteration == 6
+        assert not restored._pending_bucket_states
+
+    del model, compression, restored
+    _destroy_process_group()
+
+
+@RunIf(skip_windows=True, min_torch="1.9.0")
+def test_gradient_compression_ddp():
+    """Test the gradient compressions with gloo and the restore of their states"""
+    mp.spawn(_gradient_compression_ddp, args=(2, find_free_network_port()), nprocs=2)
+
+
+def _top_k_exact_ddp(rank, world_size, port):
+    os.environ["MASTER_ADDR"] = "localhost"
+    os.environ["MASTER_PORT"] = str(port)
+    torch.distributed.init_process_group("gloo", rank=rank, world_size=world_size)
+
+    torch.manual_seed(0)
+    reference = DistributedDataParallel(torch.nn.Linear(32, 32))
+    torch.manual_seed(0)
+    model = DistributedDataParallel(torch.nn.Linear(32, 32))
+    TopKCompression(ratio=1).register(model)
+    _train(reference, steps=3, rank=rank)
+    _train(model, steps=3, rank=rank)
+    # sending all the gradients is an all-reduce
+    assert torch.allclose(model.module.weight, reference.module.weight)
+
+    del model, reference
+    _destroy_process_group()
+
+
+@RunIf(skip_windows=True, min_torch="1.9.0")
+def test_top_k_compression_exact_ddp():
+    """Test that the top-k compression of all the gradients averages them"""
+    mp.spawn(_top_k_exact_ddp, args=(2, find_free_network_port()), nprocs=2)
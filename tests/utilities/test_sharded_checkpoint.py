@@ -0,0 +1,150 @@
+# Copyright The PyTorch Lightning team.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import os
+
+import pytest
+import torch
+import torch.distributed
+import torch.multiprocessing as mp
+
+from pytorch_lightning.plugins import DDPPlugin
+from pytorch_lightning.plugins.environments import LightningEnvironment
+from pytorch_lightning.plugins.environments.lightning_environment import find_free_network_port
+from pytorch_lightning.utilities.cloud_io import load as pl_load
+from pytorch_lightning.utilities.exceptions import MisconfigurationException
+from pytorch_lightning.utilities.sharded_checkpoint import (
+    _collect_tensors,
+    is_sharded_checkpoint,
+    load_sharded_checkpoint,
+    save_sharded_checkpoint,
+)
+from tests.helpers.runif import RunIf
+
+
+def _checkpoint(rank: int = 0):
+    torch.manual_seed(0)
+    model = torch.nn.Sequential(torch.nn.Linear(32, 64), torch.nn.BatchNorm1d(64), torch.nn.Linear(64, 2))
+    optimizer = torch.optim.Adam(model.parameters())
+    model(torch.rand(4, 32)).sum().backward()
+    optimizer.step()
+    return {
+        "epoch": 1,
+        "global_step": 10,
+        "state_dict": model.state_dict(),
+        "optimizer_states": [optimizer.state_dict()],
+        "callbacks": {"rank": torch.tensor(rank)},
+    }
+
+
+def _assert_checkpoint_equal(actual, expected):
+    assert actual.keys() == expected.keys()
+    assert actual["epoch"] == expected["epoch"]
+    assert actual["state_dict"]._metadata == expected["state_dict"]._metadata
+    for k, v in expected["state_dict"].items():
+        assert torch.equal(actual["state_dict"][k], v)
+    actual_state = actual["optimizer_states"][0]["state"]
+    for i, state in expected["optimizer_states"][0]["state"].items():
+        assert torch.equal(actual_state[i]["exp_avg"], state["exp_avg"])
+    assert actual["callbacks"]["rank"] == expected["callbacks"]["rank"]
+
+
+def _setup_ddp(rank, world_size, port):
+    os.environ["MASTER_ADDR"] = "localhost"
+    os.environ["MASTER_PORT"] = str(port)
+    torch.distributed.init_process_group("gloo", rank=rank, world_size=world_size)
+
+
+def _teardown_ddp():
+    # no rank may exit while the others still communicate
+    torch.distributed.barrier()
+    torch.distributed.destroy_process_group()
+
+
+def _save_with_ddp_plugin(rank, world_size, port, path):
+    _setup_ddp(rank, world_size, port)
+    environment = LightningEnvironment()
+    plugin = DDPPlugin(
+        parallel_devices=[torch.device("cpu")] * world_size,
+        cluster_environment=environment,
+        sharded_checkpoint=True,
+    )
+    environment.set_global_rank(rank)
+    environment.set_world_size(world_size)
+
+    plugin.save_checkpoint(_checkpoint(), path)
+    shard = pl_load(os.path.join(path, f"shard-{rank:05d}-of-{world_size:05d}.pt"))
+    # each rank wrote about half of the tensor bytes
+    shard_size = sum(t.numel() * t.element_size() for t in shard["tensors"])
+    total_size = sum(t.numel() * t.element_size() for t in _collect_tensors(_checkpoint()))
+    assert 0.4 * total_size < shard_size < 0.6 * total_size
+
+    _assert_checkpoint_equal(plugin.load_checkpoint_file(path), _checkpoint())
+    _teardown_ddp()
+
+
+def _load_with_other_world_size(rank, world_size, port, path):
+    _setup_ddp(rank, world_size, port)
+    checkpoint = load_sharded_checkpoint(path, rank=rank, world_size=world_size)
+    _assert_checkpoint_equal(checkpoint, _checkpoint())
+    _teardown_ddp()
+
+
+@RunIf(skip_windows=True)
+def test_sharded_checkpoint_ddp(tmpdir):
+    """Test that all ranks save a shard of the checkpoint and that it can be restored with any number of processes."""
+    path = os.path.join(tmpdir, "epoch=0.ckpt")
+    mp.spawn(_save_with_ddp_plugin, args=(2, find_free_network_port(), path), nprocs=2)
+    assert is_sharded_checkpoint(path)
+    assert sorted(os.listdir(path)) == ["manifest.pt", "shard-00000-of-00002.pt", "shard-00001-of-00002.pt"]
+
+    mp.spawn(_load_with_other_world_size, args=(3, find_free_network_port(), path), nprocs=3)
+    # a single process reads all shards
+    _assert_checkpoint_equal(pl_load(path), _checkpoint())
+
+    # the stale shards are removed when the checkpoint is overwritten
+    save_sharded_checkpoint(_checkpoint(), path, rank=0, world_size=1)
+    assert sorted(os.listdir(path)) == ["manifest.pt", "shard-00000-of-00001.pt"]
+    _assert_checkpoint_equal(pl_load(path, map_location="cpu"), _checkpoint())
+
+
+def _save_local_keys(rank, world_size, port, path):
+    _setup_ddp(rank, world_size, port)
+    save_sharded_checkpoint(_checkpoint(rank), path, rank=rank, world_size=world_size, local_keys=("callbacks", ))
+    # every rank restores its own version of the entries saved per rank
+    _assert_checkpoint_equal(load_sharded_checkpoint(path, rank, world_size), _checkpoint(rank))
+    _teardown_ddp()
+
+
+def _load_local_keys_with_other_world_size(rank, world_size, port, path):
+    _setup_ddp(rank, world_size, port)
+    with pytest.raises(MisconfigurationException, match="saved per rank with 2 processes"):
+        load_sharded_checkpoint(path, rank, world_size)
+    _teardown_ddp()
+
+
+@RunIf(skip_windows=True)
+def test_sharded_checkpoint_local_keys(tmpdir):
+    path = os.path.join(tmpdir, "epoch=0.ckpt")
+    mp.spawn(_save_local_keys, args=(2, find_free_network_port(), path), nprocs=2)
+    mp.spawn(_load_local_keys_with_other_world_size, args=(3, find_free_network_port(), path), nprocs=3)
+
+
+def test_is_sharded_checkpoint(tmpdir):
+    path = os.path.join(tmpdir, "epoch=0.ckpt")
+    assert not is_sharded_checkpoint(path)
+    os.makedirs(path)
+    # the manifest is missing
+    assert not is_sharded_checkpoint(path)
+    save_sharded_checkpoint(_checkpoint(), path, rank=0, world_size=1)
+    assert is_sharded_checkpoint(path)
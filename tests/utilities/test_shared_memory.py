@@ -0,0 +1,93 @@
+# Copyright The PyTorch Lightning team.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import io
+import os
+import pickle
+from multiprocessing.reduction import ForkingPickler
+
+import numpy as np
+import torch
+import torch.distributed
+import torch.multiprocessing as mp
+
+from pytorch_lightning.plugins.environments.lightning_environment import find_free_network_port
+from pytorch_lightning.utilities.shared_memory import load_shared, shared_memory_dir
+from tests.helpers.runif import RunIf
+
+
+def _data():
+    return {
+        "x": torch.arange(12, dtype=torch.float32).view(3, 4),
+        "y": np.arange(5, dtype=np.int64),
+        "empty": torch.empty(0, 2),
+        "names": ["a", "b"],
+    }
+
+
+def _assert_data_equal(actual, expected):
+    assert torch.equal(actual["x"], expected["x"])
+    np.testing.assert_array_equal(actual["y"], expected["y"])
+    assert actual["empty"].shape == expected["empty"].shape
+    assert actual["names"] == expected["names"]
+
+
+def test_load_shared_single_process():
+    """Test that a single process moves the data to shared memory, which is pickled without a copy"""
+    data = load_shared(_data, "data", local_rank=0, barrier=None)
+    _assert_data_equal(data, _data())
+    assert data["x"].is_shared()
+
+    # the processes spawned with torch multiprocessing receive handles to the shared memory
+    large = load_shared(lambda: {"x": torch.zeros(100_000), "y": np.zeros(100_000)}, "large", 0, None)
+    buffer = io.BytesIO()
+    ForkingPickler(buffer, pickle.HIGHEST_PROTOCOL).dump(large)
+    assert len(buffer.getvalue()) < 10_000
+
+
+def _load_shared_ddp(rank, world_size, port, root):
+    os.environ["MASTER_ADDR"] = "localhost"
+    os.environ["MASTER_PORT"] = str(port)
+    torch.distributed.init_process_group("gloo", rank=rank, world_size=world_size)
+
+    calls = []
+
+    def fn():
+        calls.append(rank)
+        return _data()
+
+    data = load_shared(fn, "data", local_rank=rank, barrier=torch.distributed.barrier, root=root)
+    # only the local rank 0 loads the data
+    assert calls == ([0] if rank == 0 else [])
+    _assert_data_equal(data, _data())
+
+    torch.distributed.barrier()
+    # the files are removed once all the processes mapped them
+    assert not os.path.exists(shared_memory_dir("data", root=root))
+
+    # the processes share the same memory
+    if rank == 0:
+        data["x"][0, 0] = 42
+        data["y"][0] = 42
+    torch.distributed.barrier()
+    assert data["x"][0, 0] == 42
+    assert data["y"][0] == 42
+
+    torch.distributed.barrier()
+    torch.distributed.destroy_process_group()
+
+
+@RunIf(skip_windows=True)
+def test_load_shared_ddp(tmpdir):
+    """Test that the processes of a node map the data loaded by the local rank 0"""
+    mp.spawn(_load_shared_ddp, args=(2, find_free_network_port(), str(tmpdir)), nprocs=2)